@@ -1,7 +1,9 @@
 # app.py
 import sys
 sys.dont_write_bytecode = True
+import argparse
 import logging
+import os
 import tkinter as tk
 from controllers.main_controller import MainController
 
@@ -12,7 +14,32 @@ logging.basicConfig(
 )
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NurseFilter")
+    parser.add_argument("--profile", nargs="?", const="profiles", metavar="DIR",
+                        default=os.environ.get("NURSEFILTER_PROFILE"),
+                        help="Profile the main actions into DIR (default: profiles); "
+                             "also enabled by NURSEFILTER_PROFILE=DIR")
+    parser.add_argument("--latency", nargs="?", const="latency.json", metavar="PATH",
+                        default=os.environ.get("NURSEFILTER_LATENCY"),
+                        help="Measure UI stalls and write a report to PATH on exit (default: latency.json); "
+                             "also enabled by NURSEFILTER_LATENCY=PATH")
+    parser.add_argument("--latency-threshold", type=int, default=200, metavar="MS",
+                        help="Main-loop lag that counts as a stall (default: 200)")
+    args = parser.parse_args()
+    if args.profile:
+        from models.profiling import enable_profiling
+        enable_profiling(args.profile)
+
     root = tk.Tk()
+    monitor = None
+    if args.latency:
+        from models.latency import WATCHED, LatencyMonitor
+        from models.profiling import instrument
+        instrument(WATCHED)
+        monitor = LatencyMonitor(root, threshold_ms=args.latency_threshold, report_path=args.latency)
+        monitor.start()
     app = MainController(root)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
+    if monitor:
+        monitor.stop()
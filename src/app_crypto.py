@@ -43,6 +43,16 @@ class Crypto:
         with open(file_path, "wb") as file:
             file.write(decrypted_data)
 
+    @staticmethod
+    def encrypt_data(data, key):
+        """Encrypts bytes in memory using the provided Fernet key"""
+        return Fernet(key).encrypt(data)
+
+    @staticmethod
+    def decrypt_data(data, key):
+        """Decrypts bytes in memory using the provided Fernet key, leaving the file on disk untouched"""
+        return Fernet(key).decrypt(data)
+
     def is_encrypted(filepath, loggingFlag):
         """
         Checks if a file is encrypted with Fernet.
@@ -0,0 +1,239 @@
+# benchmark.py
+"""
+Benchmark the read -> combine -> save -> load -> assign -> search -> report
+pipeline on generated data, and keep a history of the results.
+
+    python benchmark.py                       # 10k, 100k and 1m rows
+    python benchmark.py --sizes 10k --repeat 3
+
+Each size runs in its own process, so the peak memory it reports is its
+own. Results are appended to benchmark_history.json. A stage that got
+slower than the previous run of the same size by more than --threshold is
+reported as a regression, and with --fail-on-regression the exit code is 1.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_HISTORY = "benchmark_history.json"
+DEFAULT_FIXTURES = os.path.join(tempfile.gettempdir(), "nursefilter-bench")
+# Noise added to the generated lists, as fractions of the rows
+FIXTURE_RATES = {"unmatched": 0.02, "duplicates": 0.01, "typos": 0.01}
+# Stages shorter than this are too noisy to call regressions
+MIN_SECONDS = 0.05
+
+
+def parse_size(text):
+    """'100k' -> 100000; plain numbers are accepted too."""
+    return SIZES.get(text.lower()) or int(text)
+
+
+def fixture(rows, seed, fixture_dir=DEFAULT_FIXTURES):
+    """
+    Return the (database, medicaid) workbook paths for rows, generating them the first time.
+    """
+    from sheetgenerator import generate_pair, write_xlsx
+
+    directory = os.path.join(fixture_dir, f"{rows}-{seed}")
+    paths = (os.path.join(directory, "database_data.xlsx"), os.path.join(directory, "medicaid_data.xlsx"))
+    if not all(os.path.exists(path) for path in paths):
+        os.makedirs(directory, exist_ok=True)
+        for df, path in zip(generate_pair(rows, seed, **FIXTURE_RATES), paths):
+            write_xlsx(df, path + ".tmp")
+            os.replace(path + ".tmp", path)
+    return paths
+
+
+def run_pipeline(rows, seed=0, fixture_dir=DEFAULT_FIXTURES):
+    """
+    Run every pipeline stage once on the fixture for rows.
+
+    Runs in a scratch directory with its own key, so the real data and
+    key.txt are never touched.
+
+    Returns:
+        dict: RunStats.as_dict() of the run
+    """
+    from app_crypto import Crypto
+    from cli import RunStats
+    from models.data_model import COMBINED_FILE, DataModel
+    from models.preload import CACHE_SUFFIX
+
+    database, medicaid = fixture(rows, seed, fixture_dir)
+    stats = RunStats(f"benchmark {rows}")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work:
+        os.chdir(work)
+        try:
+            Crypto.generateKey()
+            model = DataModel()
+            with stats.stage("read database"):
+                stats.rows["database"] = len(model.read_excel_file(database, file_type="Database"))
+            with stats.stage("read medicaid"):
+                stats.rows["medicaid"] = len(model.read_excel_file(medicaid, file_type="Medicaid"))
+            with stats.stage("combine"):
+                model.combine_data()
+            stats.rows["combined"] = len(model.combined_data)
+            with stats.stage("save"):
+                model.flush_writes()
+            with stats.stage("encrypt"):
+                model.encrypt_file(COMBINED_FILE)
+
+            with stats.stage("load"):
+                model = DataModel()
+                model.load_combined_data()
+            # The load above cached the parsed workbook; this one reads the cache
+            with stats.stage("load (cached)"):
+                model = DataModel()
+                model.load_combined_data()
+            stats.counts["cache_mb"] = round(os.path.getsize(COMBINED_FILE + CACHE_SUFFIX) / 2**20, 1)
+
+            city = model.combined_data["City"].mode().iloc[0]
+            with stats.stage("batch assign"):
+                stats.counts["batch_assigned"] = model.batch_update_nurses("Benchmark Nurse", city, "", "")
+            with stats.stage("save assignments"):
+                model.flush_writes()
+
+            sample = model.combined_data.iloc[len(model.combined_data) // 2]
+            queries = [sample["Mother_Last_Name"], str(sample["Child_First_Name"])[:3], city, "no such text"]
+            with stats.stage(f"search ({len(queries)} queries)"):
+                stats.counts["search_hits"] = sum(len(model.search(query)) for query in queries)
+
+            with stats.stage("report"):
+                model.statistics()
+        finally:
+            os.chdir(cwd)
+    return stats.as_dict()
+
+
+def run_in_subprocess(rows, seed, fixture_dir):
+    """Run one size in a fresh interpreter and return its stats."""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", str(rows), "--seed", str(seed),
+         "--fixtures", fixture_dir],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark of {rows} rows failed:\n{result.stderr}")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def fastest(runs):
+    """Combine repeated runs of one size, keeping the fastest time of each stage."""
+    best = dict(runs[0])
+    best["stages"] = [
+        min((run_stage for run in runs for run_stage in run["stages"] if run_stage["name"] == stage["name"]),
+            key=lambda s: s["seconds"])
+        for stage in runs[0]["stages"]
+    ]
+    best["total_seconds"] = min(run["total_seconds"] for run in runs)
+    best["peak_memory_mb"] = max(run["peak_memory_mb"] or 0 for run in runs) or None
+    return best
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def regressions(previous, current, threshold):
+    """
+    Stages of current that are more than threshold (0.2 = 20%) slower than in previous.
+
+    Returns:
+        list of (stage name, previous seconds, current seconds)
+    """
+    before = {stage["name"]: stage["seconds"] for stage in previous["stages"]}
+    slower = []
+    for stage in current["stages"] + [{"name": "total", "seconds": current["total_seconds"]}]:
+        old = previous["total_seconds"] if stage["name"] == "total" else before.get(stage["name"])
+        if old is not None and stage["seconds"] >= MIN_SECONDS and stage["seconds"] > old * (1 + threshold):
+            slower.append((stage["name"], old, stage["seconds"]))
+    return slower
+
+
+def previous_result(history, rows):
+    """The most recent result for rows in the history, or None."""
+    for entry in reversed(history):
+        for result in entry["results"]:
+            if result["rows_requested"] == rows:
+                return result
+    return None
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_result(result, previous, threshold, out=None):
+    out = out or sys.stdout
+    before = {stage["name"]: stage["seconds"] for stage in previous["stages"]} if previous else {}
+    print(f"\n{result['rows_requested']} rows (peak memory {result['peak_memory_mb']} MB)", file=out)
+    for stage in result["stages"]:
+        line = f"  {stage['name']:<24} {stage['seconds']:9.3f} s"
+        if stage["name"] in before and before[stage["name"]]:
+            change = stage["seconds"] / before[stage["name"]] - 1
+            line += f"  {change:+7.1%}"
+            if stage["seconds"] >= MIN_SECONDS and change > threshold:
+                line += "  REGRESSION"
+        print(line, file=out)
+    print(f"  {'total':<24} {result['total_seconds']:9.3f} s", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NurseFilter data pipeline.")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), help="Row counts to run, e.g. 10k 100k 1m")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated fixtures")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per size; the fastest time of each stage is kept")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help=f"JSON history file (default: {DEFAULT_HISTORY})")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Where generated fixtures are kept")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Slowdown that counts as a regression (default: 0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with code 1 on a regression")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        logging.disable(logging.CRITICAL)
+        print(json.dumps(run_pipeline(args.worker, args.seed, args.fixtures)))
+        return 0
+
+    history = load_history(args.history)
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    regressed = False
+    for size in args.sizes:
+        rows = parse_size(size)
+        result = fastest([run_in_subprocess(rows, args.seed, args.fixtures) for _ in range(args.repeat)])
+        result["rows_requested"] = rows
+        previous = previous_result(history, rows)
+        print_result(result, previous, args.threshold)
+        regressed |= bool(previous and regressions(previous, result, args.threshold))
+        entry["results"].append(result)
+
+    history.append(entry)
+    with open(args.history, "w") as f:
+        json.dump(history, f, indent=2)
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
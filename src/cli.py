@@ -0,0 +1,166 @@
+# cli.py
+"""
+Headless entry point for running the combine without the GUI, e.g. as a
+scheduled job on a server:
+
+    python cli.py combine db.xlsx medicaid.xlsx --out /data/nursefilter
+
+Problems the GUI would show in a dialog (DataModelError) are logged and turn
+into a non-zero exit code. Timing per stage and peak memory are printed at the end (and can
+be saved as JSON with --stats) so runs can be compared.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+from models.data_model import COMBINED_FILE, DUPLICATES_FILE, UNMATCHED_FILE, DataModel
+from models.errors import DataModelError
+from models.instrumentation import Instrumentation, peak_memory_mb
+
+
+class RunStats:
+    """Wall-clock time and peak memory after each stage of a run, plus row and other counts."""
+
+    def __init__(self, command, instrumentation=None):
+        self.command = command
+        # Finer-grained spans recorded by the DataModel during the run
+        self.instrumentation = instrumentation or Instrumentation()
+        self.stages = []
+        self.rows = {}
+        self.counts = {}
+        self.started = time.perf_counter()
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def as_dict(self):
+        peak = peak_memory_mb()
+        return {
+            "command": self.command,
+            "stages": [{"name": name, "seconds": round(seconds, 4),
+                        "peak_memory_mb": round(stage_peak, 1) if stage_peak is not None else None}
+                       for name, seconds, stage_peak in self.stages],
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "rows": self.rows,
+            "counts": self.counts,
+            "peak_memory_mb": round(peak, 1) if peak is not None else None,
+        }
+
+    def print_summary(self, out=None):
+        out = out or sys.stdout
+        stats = self.as_dict()
+        width = max([len(stage["name"]) for stage in stats["stages"]] + [len("total")])
+        for stage in stats["stages"]:
+            print(f"{stage['name']:<{width}}  {stage['seconds']:8.2f} s", file=out)
+        print(f"{'total':<{width}}  {stats['total_seconds']:8.2f} s", file=out)
+        for name, count in stats["rows"].items():
+            print(f"{name} rows: {count}", file=out)
+        for name, count in stats["counts"].items():
+            print(f"{name.replace('_', ' ')}: {count}", file=out)
+        if stats["peak_memory_mb"] is not None:
+            print(f"peak memory: {stats['peak_memory_mb']:.1f} MB", file=out)
+
+
+class _Stage:
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # Peak memory so far, so the stage that raised it stands out
+        self.stats.stages.append((self.name, time.perf_counter() - self.start, peak_memory_mb()))
+        return False
+
+
+def combine(args, stats):
+    """
+    Read both files, combine them and write the results to args.out.
+
+    Raises:
+        DataModelError: If any step fails
+    """
+    os.makedirs(args.out, exist_ok=True)
+    model = DataModel(output_dir=args.out, instrumentation=stats.instrumentation)
+
+    for label, path, file_type in (("database", args.database, "Database"), ("medicaid", args.medicaid, "Medicaid")):
+        with stats.stage(f"read {label}"):
+            stats.rows[label] = len(model.read_excel_file(path, file_type=file_type))
+
+    with stats.stage("combine"):
+        model.combine_data()
+    stats.rows["combined"] = len(model.combined_data)
+    stats.rows["unmatched"] = model.unmatched_count
+    stats.counts["duplicate_groups"] = model.duplicate_group_count()
+    if model.carry_forward_report:
+        stats.counts["carried_forward_assignments"] = model.carry_forward_report["carried"]
+
+    if args.side_files:
+        with stats.stage("build side files"):
+            # Building the deferred frames queues their workbooks on the writer
+            model.unmatched_data
+            model.duplicate_data
+    if args.csv:
+        with stats.stage("write csv"):
+            model.combined_data.to_csv(args.csv, index=False)
+
+    with stats.stage("write workbooks"):
+        model.flush_writes()
+
+    if args.encrypt:
+        with stats.stage("encrypt"):
+            for name in (COMBINED_FILE, UNMATCHED_FILE, DUPLICATES_FILE):
+                model.encrypt_file(model.output_path(name))
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-v", "--verbose", action="store_true", help="log progress to stderr")
+    common.add_argument("--stats", metavar="PATH", help="also write the timing and memory stats to PATH as JSON")
+    common.add_argument("--metrics", metavar="PATH", help="write per-stage metrics to PATH in Prometheus text format")
+    common.add_argument("--span-log", metavar="PATH", help="append every timed stage to PATH as JSON lines")
+
+    parser = argparse.ArgumentParser(prog="nursefilter", description="Run NurseFilter jobs without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    combine_parser = commands.add_parser("combine", parents=[common], help="combine a hospital and a Medicaid file")
+    combine_parser.add_argument("database", help="hospital (database) Excel file")
+    combine_parser.add_argument("medicaid", help="Medicaid Excel file")
+    combine_parser.add_argument("--out", default=".", help=f"directory for {COMBINED_FILE} and the side files (default: current directory)")
+    combine_parser.add_argument("--side-files", action="store_true", help=f"also write {UNMATCHED_FILE} and {DUPLICATES_FILE}")
+    combine_parser.add_argument("--csv", metavar="PATH", help="also export the combined data as CSV")
+    combine_parser.add_argument("--encrypt", action="store_true", help="encrypt the written workbooks with key.txt")
+    combine_parser.set_defaults(run=combine)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    stats = RunStats(args.command, Instrumentation(span_log=args.span_log))
+    try:
+        args.run(args, stats)
+        code = 0
+    except DataModelError as e:
+        logging.error(e.message)
+        code = 1
+    stats.print_summary()
+    if args.stats:
+        with open(args.stats, "w") as f:
+            json.dump(dict(stats.as_dict(), exit_code=code), f, indent=2)
+    if args.metrics:
+        stats.instrumentation.write_prometheus(args.metrics)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
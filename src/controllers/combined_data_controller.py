@@ -18,6 +18,8 @@ class CombinedDataController:
         self.main_controller = main_controller
         self.view = None
         self.unmatched_data_view = None
+        # Which side wins when added data repeats an existing record ("incoming" or "existing")
+        self.merge_prefer = "incoming"
         logging.info("CombinedDataController initialized.")
 
     def show_combined_data(self):
@@ -25,8 +27,8 @@ class CombinedDataController:
         if self.model.combined_data is not None and not self.model.combined_data.empty:
             logging.info(f"Combined data has {len(self.model.combined_data)} records.")
             # Calculate unmatched count
-            unmatched_count = len(self.model.unmatched_data) if self.model.unmatched_data is not None else 0
-            duplicate_count = len(self.model.duplicate_data) if self.model.duplicate_data is not None else 0
+            unmatched_count = self.model.unmatched_count
+            duplicate_count = self.model.duplicate_group_count()
             print (f"Unmatched Count: {unmatched_count}, Duplicate Count: {duplicate_count}")
             self.view = CombinedDataView(self.root, self, self.model.combined_data, unmatched_count, duplicate_count)
             frame = self.view.create_widgets()
@@ -40,12 +42,8 @@ class CombinedDataController:
     def search_combined_names(self, query):
         logging.info(f"Searching combined names for query: {query}")
         if self.model.combined_data is not None and not self.model.combined_data.empty:
-            # Convert everything to strings and search across all columns
-            results = self.model.combined_data[
-                self.model.combined_data.apply(
-                    lambda row: row.astype(str).str.contains(query, case=False, na=False).any(), axis=1
-                )
-            ]
+            # Case-insensitive substring search across all columns
+            results = self.model.search(query)
             if self.view:
                 self.view.update_table(results)
         else:
@@ -84,12 +82,15 @@ class CombinedDataController:
         """
         logging.info("Attempting to display unmatched data.")
 
-        if self.model.unmatched_data is None or self.model.unmatched_data.empty:
+        unmatched_data = self.model.unmatched_data
+        if unmatched_data is False:
+            return  # building it failed; the model has shown why
+        if unmatched_data is None or unmatched_data.empty:
             messagebox.showinfo("No Data", "No unmatched data available.")
             return
 
         # Open UnmatchedDataView instead of showing combined data
-        unmatched_window = UnmatchedDataView(self.root, self, self.model.unmatched_data)
+        unmatched_window = UnmatchedDataView(self.root, self, unmatched_data)
         self.unmatched_data_view = unmatched_window.create_widgets()
         self.main_controller.add_tab(self.unmatched_data_view, "Unmatched Data")
         return self.unmatched_data_view
@@ -137,29 +138,23 @@ class CombinedDataController:
         try:
             new_data = pd.read_excel(filepath)
 
-            # Standardize null nurse fields
-            if 'Assigned_Nurse' in new_data.columns:
-                new_data['Assigned_Nurse'] = new_data['Assigned_Nurse'].fillna('None')
-            else:
-                new_data['Assigned_Nurse'] = 'None'
-
-            # Combine with existing data
-            if self.model.combined_data is not None:
-                combined = pd.concat([self.model.combined_data, new_data], ignore_index=True)
-            else:
-                combined = new_data.copy()
-
-            self.model.combined_data = combined
+            # Upsert by record key so re-adding a session does not duplicate rows
+            report = self.model.upsert_combined_data(new_data, prefer=self.merge_prefer)
+            combined = self.model.combined_data
 
             # Refresh view
             if self.view:
                 self.view.update_treeview(combined)
 
-            # Save to file
-            combined.to_excel("combined_matched_data.xlsx", index=False)
-            logging.info("Previous combined data added and saved successfully.")
+            logging.info("Previous combined data merged and saved successfully.")
 
-            messagebox.showinfo("Success", "Data successfully loaded and added to combined dataset.")
+            messagebox.showinfo(
+                "Success",
+                f"Data merged into combined dataset.\n\n"
+                f"Inserted: {report['inserted']}\n"
+                f"Updated: {report['updated']}\n"
+                f"Unchanged: {report['unchanged']}"
+            )
 
         except Exception as e:
             logging.error(f"Error loading previous combined data: {e}")
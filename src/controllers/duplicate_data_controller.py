@@ -15,8 +15,11 @@ class DuplicateDataController:
         """
         Display the duplicate data view in a new tab.
         """
-        if self.model.duplicate_data is not None and not self.model.duplicate_data.empty:
-            self.view = DuplicateDataView(self.root, self, self.model.duplicate_data, self.main_controller)
+        duplicate_data = self.model.duplicate_data
+        if duplicate_data is False:
+            return None  # building it failed; the model has shown why
+        if duplicate_data is not None and not duplicate_data.empty:
+            self.view = DuplicateDataView(self.root, self, duplicate_data)
             frame = self.view.create_widgets()
             self.main_controller.add_tab(frame, "Duplicate Records")
             return frame
@@ -0,0 +1,61 @@
+import functools
+import threading
+from tkinter import messagebox
+
+from models.data_model import DataModel
+from models.errors import DataModelError
+
+
+def show_error(error):
+    """Show a DataModelError in a message box matching its severity."""
+    show = messagebox.showwarning if error.severity == "warning" else messagebox.showerror
+    show(error.title, error.message)
+
+
+def _reports_errors(failed):
+    """
+    Wrap a DataModel method so a DataModelError is shown in a dialog and the
+    method returns `failed` instead (the value the controllers check for).
+
+    Only the outermost wrapped call on a thread reports the error, so a
+    failure inside a nested operation (e.g. decrypting while reading) shows
+    a single dialog.
+    """
+    def wrap(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            state = self._dialogs
+            if getattr(state, "active", False):
+                return method(self, *args, **kwargs)
+            state.active = True
+            try:
+                return method(self, *args, **kwargs)
+            except DataModelError as e:
+                show_error(e)
+                return failed
+            finally:
+                state.active = False
+        return wrapper
+    return wrap
+
+
+class GuiDataModel(DataModel):
+    """
+    DataModel for the Tk application: failed operations show a dialog and
+    return False/None rather than raising.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._dialogs = threading.local()
+        super().__init__(*args, **kwargs)
+
+    decrypt_file = _reports_errors(False)(DataModel.decrypt_file)
+    encrypt_file = _reports_errors(False)(DataModel.encrypt_file)
+    read_excel_file = _reports_errors(None)(DataModel.read_excel_file)
+    combine_data = _reports_errors(False)(DataModel.combine_data)
+    load_combined_data = _reports_errors(False)(DataModel.load_combined_data)
+    updated_data = _reports_errors(None)(DataModel.updated_data)
+    batch_update_nurses = _reports_errors(None)(DataModel.batch_update_nurses)
+    # Deferred side datasets are built on first access; False means building failed
+    unmatched_data = property(_reports_errors(False)(DataModel.unmatched_data.fget), DataModel.unmatched_data.fset)
+    duplicate_data = property(_reports_errors(False)(DataModel.duplicate_data.fget), DataModel.duplicate_data.fset)
@@ -97,35 +97,26 @@ class InitialController:
                 messagebox.showerror("Error", "Please load both database and Medicaid files before combining.")
                 return False
                 
-            # Start progress
-            progress_callback("Preparing to combine data", 10)
-            progress_callback("Normalizing column names", 20)
-            progress_callback("Processing dates and IDs", 30)
-            progress_callback("Merging database and Medicaid data", 50)
-            
-            # Combine data
-            success = self.model.combine_data()
+            # The model reports each stage as it starts; its 0-100% maps onto 0-80% here
+            success = self.model.combine_data(
+                progress_callback=lambda message, percent: progress_callback(message, percent * 0.8))
             
             if success:
                 progress_callback("Data combined successfully", 80)
-                progress_callback("Checking for duplicates and unmatched records", 85)
-                progress_callback("Processing combined data", 90)
-                
-                # Load combined data
-                progress_callback("Loading combined data", 95)
-                loaded = self.model.load_combined_data()
-                
-                if loaded:
-                    # Show combined data view
-                    progress_callback("Preparing data view", 98)
-                    self.main_controller.show_combined_data()
-                    
-                    # Remove tab when done
-                    try:
-                        self.main_controller.remove_tab(self.view)
-                    except Exception as e:
-                        logging.error(f"Error removing tab: {e}")
-                    
+                report = self.model.carry_forward_report
+                if report and report["carried"]:
+                    progress_callback(f"Carried forward {report['carried']} nurse assignments", 82)
+
+                # The combined frame is already in memory; files are saved in the background
+                progress_callback("Preparing data view", 95)
+                self.main_controller.show_combined_data()
+
+                # Remove tab when done
+                try:
+                    self.main_controller.remove_tab(self.view)
+                except Exception as e:
+                    logging.error(f"Error removing tab: {e}")
+
                 progress_callback("Combination complete", 100)
                 
             return success
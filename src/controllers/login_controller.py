@@ -1,14 +1,22 @@
-import sqlite3
-import bcrypt
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
+from models import auth
+from models.store import get_store
 from views.login_view import LoginView
 
+# How often the Tk loop checks whether the password check has finished
+POLL_MS = 50
+
 
 class LoginController:
     def __init__(self, root, main_controller):
         self.root = root
         self.main_controller = main_controller
+        self.store = get_store()
+        # bcrypt runs here, off the Tk thread; one worker keeps one store connection
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="login")
+        self.pending = None
         self.initialize_db()
         self.view = self.show_login_view()
         self.upon_success = self.main_controller.show_initial_view
@@ -20,89 +28,75 @@ class LoginController:
 
 
     def initialize_db(self):
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT UNIQUE,
-                        password TEXT)''')
-        
-        c.execute("SELECT * FROM users WHERE username=?", ('admin',))
-        result = c.fetchone()
-
-        if not result:
+        """Create the default admin account if it is missing (the store migrates the schema)."""
+        if self.store.password_hash('admin') is None:
             admin_username = 'admin'
             admin_password = 'admin123'
-            hashed_password = bcrypt.hashpw(admin_password.encode('utf-8'), bcrypt.gensalt())
-
-            c.execute("INSERT INTO users (username, password) VALUES (?, ?)", (admin_username, hashed_password))
-            conn.commit()
-
-        conn.close()
+            hashed_password = auth.hash_password(admin_password)
+            self.store.add_user(admin_username, hashed_password)
 
+    @staticmethod
     def register_user(username, password):
-
-        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-
-        try:
-            c.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, hashed_password))
-            conn.commit()
-            #registration success
-        except sqlite3.IntegrityError:
-            #username already exists
-            pass
-        
-        conn.close()
+        """Add a user; returns False if the username already exists."""
+        hashed_password = auth.hash_password(password)
+        return get_store().add_user(username, hashed_password)
 
     def _login_user(self, username, password):
-
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-
-        c.execute("SELECT password FROM users WHERE username=?", (username,))
-        result = c.fetchone()
-
-        if result:
-            stored_password = result[0]
-            if bcrypt.checkpw(password.encode('utf-8'), stored_password):
-                conn.close()
-                return True
-            else:
-                conn.close()
-                return False
-        else:
-            conn.close()
-            return None
+        """Verify the credentials (blocking; runs on the worker thread)."""
+        return auth.verify_login(self.store, username, password)
 
     def login(self, username, password):
         """
-        Handles login logic.
-        If the username and password are correct, it shows a success message.
+        Start checking the credentials on the worker thread; the result is
+        handled by _login_finished once it is ready. Ignored while a check is
+        already running.
+        """
+        if self.pending is not None:
+            return
+        self.pending = self.worker.submit(self._login_user, username, password)
+        self.root.after(POLL_MS, self._poll_login, username)
+
+    def _poll_login(self, username):
+        if not self.pending.done():
+            self.root.after(POLL_MS, self._poll_login, username)
+            return
+        future, self.pending = self.pending, None
+        try:
+            result = future.result()
+        except Exception as e:
+            logging.error(f"Login failed: {e}")
+            result = None
+        self._login_finished(username, result)
+
+    def _login_finished(self, username, result):
+        """
+        Handles the outcome of a login attempt.
+        If the username and password are correct, it moves on to the app.
         Otherwise, it shows an error.
         """
-        login_result = self._login_user(username, password)
+        status = result.status if result else None
 
-        if login_result is True:
+        if status == auth.OK:
             logging.info(f"Login Success: {username}")
+            self.worker.shutdown(wait=False)
+            self.main_controller.preload_combined_data()
             self.upon_success()
             self.main_controller.remove_tab(self.view)
             return True
-        elif login_result is False:
+        elif status == auth.BAD_PASSWORD:
             logging.error(f"Login failed: Invalid password for {username}")
             messagebox.showerror("Login Failed", "Invalid username or password")
             return False
-        elif login_result is None:
+        elif status == auth.UNKNOWN_USER:
             logging.error(f"Login failed: Username '{username}' not found")
             messagebox.showerror("Login Failed", "Username not found")
             return False
+        elif status == auth.THROTTLED:
+            logging.error(f"Login failed: Too many attempts for {username}")
+            messagebox.showerror("Login Failed",
+                                 f"Too many failed attempts. Try again in {result.retry_after} seconds.")
+            return False
         else:
             logging.error("Login failed: Unknown error")
             messagebox.showerror("Login Failed", "Unknown error occurred")
             return False
-            
-    
-
@@ -1,15 +1,67 @@
-from controllers.combined_data_controller import CombinedDataController
-from controllers.profile_controller import ProfileController
-from controllers.initial_controller import InitialController
-from controllers.nurse_controller import NurseController
 from controllers.login_controller import LoginController
 from controllers.tabs_controller import TabsController
-from models.data_model import DataModel
+from models.store import get_store
+import importlib
 import os
 from tkinter import messagebox
 import platform
 import logging
+import threading
+import time
 
+# Everything past the login screen is imported on first use, so starting the
+# app only loads tkinter, sqlite3 and bcrypt. The names stay module
+# attributes (resolved by __getattr__ below) so they can be patched in tests.
+LAZY_IMPORTS = {
+    'GuiDataModel': 'controllers.gui_data_model',
+    'InitialController': 'controllers.initial_controller',
+    'CombinedDataController': 'controllers.combined_data_controller',
+    'ProfileController': 'controllers.profile_controller',
+    'NurseController': 'controllers.nurse_controller',
+}
+
+
+def __getattr__(name):
+    module = LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name):
+    """Return a lazily imported name, honouring one already set (or patched)."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def warm_up(modules=None):
+    """
+    Import the deferred modules in a background thread.
+
+    Started once the login screen is up, so pandas, polars, reportlab and the
+    views are usually loaded by the time the user has signed in.
+
+    Args:
+        modules: Module names to import (default: those in LAZY_IMPORTS)
+
+    Returns:
+        threading.Thread: The started daemon thread
+    """
+    modules = list(modules or dict.fromkeys(LAZY_IMPORTS.values()))
+
+    def run():
+        start = time.perf_counter()
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                logging.warning(f"Warm-up import of {module} failed: {e}")
+        logging.info(f"Warmed up {len(modules)} modules in {time.perf_counter() - start:.2f}s")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
 
 
 class MainController:
@@ -18,8 +70,20 @@ class MainController:
         self.app_root = root  # The main Tkinter window
         self.tabs = self._get_tabs_controller(root)
         self.root = self.tabs.get_tabs_root()
-        self.model = DataModel()
+        self._model = None
         self.login()
+        self.root.after_idle(warm_up)
+
+    @property
+    def model(self):
+        """The application's GuiDataModel, created on first use."""
+        if self._model is None:
+            self._model = _lazy('GuiDataModel')(store=get_store())
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
 
     def login(self):
         self._get_login_controller()
@@ -28,16 +92,16 @@ class MainController:
         return LoginController(self.root, self)
     
     def _get_initial_controller(self):
-        return InitialController(self.root, self.model, self)
+        return _lazy('InitialController')(self.root, self.model, self)
 
     def _get_combined_data_controller(self):
-        return CombinedDataController(self.root, self.model, self)
+        return _lazy('CombinedDataController')(self.root, self.model, self)
     
     def _get_profile_controller(self, child_data, update_callback):
-        return ProfileController(self.root, child_data, self.model, self, update_callback)
+        return _lazy('ProfileController')(self.root, child_data, self.model, self, update_callback)
     
     def _get_nurse_controller(self):
-        return NurseController(self.root, self.model, self)
+        return _lazy('NurseController')(self.root, self.model, self)
     
     def _get_tabs_controller(self, root):
         return TabsController(root)
@@ -85,6 +149,10 @@ class MainController:
         controller = self._get_nurse_controller()
         return controller.generate_report()
     
+    def preload_combined_data(self):
+        '''Start reading the most recently used combined dataset in the background.'''
+        return self.model.preload_combined_data()
+
     def load_existing_combined_data(self):
         if self.model.load_combined_data():
             controller = self._get_combined_data_controller()
@@ -96,9 +164,14 @@ class MainController:
         '''
         Open the specified Excel file using the default application.
         '''
+        self.model.flush_writes()
         if not os.path.exists(filepath):
             messagebox.showerror("Error", f"{filepath} does not exist.")
             return
+        # Loaded data is decrypted in memory only; the spreadsheet app needs the file itself
+        # decrypted (on_closing encrypts it again)
+        if self.model.is_file_encrypted(filepath, logging=False) and not self.model.decrypt_file(filepath):
+            return
         try:
             if platform.system() == "Darwin":  # macOS
                 os.system(f"open {filepath}")
@@ -116,5 +189,9 @@ class MainController:
             """
             logging.info("Closing App")
             filepath = 'combined_matched_data.xlsx'
+            self.model.flush_writes()
             self.model.encrypt_file(filepath)
+            metrics = os.environ.get("NURSEFILTER_METRICS")
+            if metrics:
+                self.model.instrumentation.write_prometheus(metrics)
             self.app_root.destroy()
\ No newline at end of file
@@ -1,7 +1,9 @@
 import logging
-import pandas as pd
 from tkinter import messagebox
 from models.data_model import DataModel
+from models.auto_assign import read_roster
+from models.schema import format_date
+from models.statistics import compute_statistics
 from views.statistical_view import StatisticalView
 from views.nurse_statistics_view import NursesStatisticalView
 from views.batch_assign_view import BatchAssignView
@@ -32,14 +34,30 @@ class NurseController:
         
         return self._show_report()
     
+    def _report_statistics(self, df):
+        """Use the model's cached statistics for its own data; compute them for any other frame."""
+        if df is self.model.combined_data:
+            return self.model.statistics()
+        return compute_statistics(df)
+
     def _show_report(self):
         view = StatisticalView(self.root, self)
-        frame = view.create_widgets(self.model.combined_data)
+        df = self.model.combined_data
+        frame = view.create_widgets(df, self._report_statistics(df))
         self.main_controller.add_tab(frame, "Statistical Report")
         self.report_view = frame
         logging.info("StatisticalView displayed.")
         return frame
         
+    def show_child_profile(self, child_data):
+        """Open a child's profile from the report; changes made there rebuild the open report."""
+        return self.main_controller.show_profile(child_data, self.refresh_report)
+
+    def refresh_report(self):
+        if self.report_view:
+            self.close_report()
+            self._show_report()
+
     def export_report_to_pdf(self, df):
         try:
             from reportlab.lib.pagesizes import letter
@@ -60,34 +78,26 @@ class NurseController:
             c.drawString(100, 750, "Statistical Report")
             c.setFont("Helvetica", 12)
 
-            total_children = len(df)
-            assigned_count = len(df[df['Assigned_Nurse'] != 'None'])
-            unassigned_count = total_children - assigned_count
-            assigned_percentage = (assigned_count / total_children * 100) if total_children > 0 else 0
+            stats = self._report_statistics(df)
+            assigned_percentage = stats.assigned_percentage
             unassigned_percentage = 100 - assigned_percentage
 
-            c.drawString(100, 730, f"Total Children: {total_children}")
-            c.drawString(100, 710, f"Total Nurses Assigned: {df['Assigned_Nurse'].nunique()}")
-            c.drawString(100, 690, f"Children Assigned to Nurses: {assigned_count} ({assigned_percentage:.1f}%)")
-            c.drawString(100, 670, f"Unassigned Children: {unassigned_count} ({unassigned_percentage:.1f}%)")
-
-            df['dob_temp'] = pd.to_datetime(df['Child_Date_of_Birth'], errors='coerce')
-            valid_ages = df.dropna(subset=['dob_temp'])
-            if not valid_ages.empty:
-                today = pd.Timestamp.today()
-                avg_age_years = (today - valid_ages['dob_temp']).dt.days.mean() / 365
-                c.drawString(100, 650, f"Average Age: {avg_age_years:.1f} years")
-
-                youngest = valid_ages.loc[valid_ages['dob_temp'].idxmax()]
-                oldest = valid_ages.loc[valid_ages['dob_temp'].idxmin()]
-                c.drawString(100, 630, f"Youngest: {youngest['Child_First_Name']} {youngest['Child_Last_Name']} ({youngest['Child_Date_of_Birth']})")
-                c.drawString(100, 610, f"Oldest: {oldest['Child_First_Name']} {oldest['Child_Last_Name']} ({oldest['Child_Date_of_Birth']})")
-
-            if 'City' in df.columns:
-                town_counts = df['City'].value_counts().head(5)
+            c.drawString(100, 730, f"Total Children: {stats.total}")
+            c.drawString(100, 710, f"Total Nurses Assigned: {stats.nurse_total}")
+            c.drawString(100, 690, f"Children Assigned to Nurses: {stats.assigned} ({assigned_percentage:.1f}%)")
+            c.drawString(100, 670, f"Unassigned Children: {stats.unassigned} ({unassigned_percentage:.1f}%)")
+
+            if stats.mean_dob is not None:
+                c.drawString(100, 650, f"Average Age: {stats.average_age():.1f} years")
+
+                youngest, oldest = stats.youngest, stats.oldest
+                c.drawString(100, 630, f"Youngest: {youngest['Child_First_Name']} {youngest['Child_Last_Name']} ({format_date(youngest['Child_Date_of_Birth'])})")
+                c.drawString(100, 610, f"Oldest: {oldest['Child_First_Name']} {oldest['Child_Last_Name']} ({format_date(oldest['Child_Date_of_Birth'])})")
+
+            if not stats.town_counts.empty:
                 c.drawString(100, 590, "Children per Town:")
                 y_position = 570
-                for town, count in town_counts.items():
+                for town, count in stats.town_counts.head(5).items():
                     c.drawString(120, y_position, f"{town}: {count} children")
                     y_position -= 20
 
@@ -110,19 +120,19 @@ class NurseController:
             messagebox.showinfo("No Data", "No 'Assigned_Nurse' column in the data.")
             return
 
-        assigned = df[df['Assigned_Nurse'].notna() & (df['Assigned_Nurse'] != 'None')]
-        if assigned.empty:
+        caseload = self.model.caseload()
+        if caseload.empty or not (caseload['Active_Caseload'] > 0).any():
             messagebox.showinfo("No Data", "No nurse assignments found.")
             return
 
-        return self._show_nurse_stats(assigned)
+        return self._show_nurse_stats(caseload)
 
 
-    def _show_nurse_stats(self, assigned):
+    def _show_nurse_stats(self, caseload):
         """
         Show nurse statistics window
         """
-        frame = NursesStatisticalView(self.root, self).create_widgets(assigned)
+        frame = NursesStatisticalView(self.root, self).create_widgets(caseload)
         self.main_controller.add_tab(frame, "Nurse Statistics")
         self.nurse_stats_view = frame
         logging.info("NursesStatisticalView displayed.")
@@ -140,6 +150,41 @@ class NurseController:
         self.batch_assign_view = frame
         return frame
 
+    def auto_assign_from_roster(self, update_callback):
+        """Ask for a nurse roster file and distribute the unassigned children across it."""
+        from tkinter import filedialog
+        filepath = filedialog.askopenfilename(
+            title="Select Nurse Roster",
+            filetypes=[("Roster Files", "*.xlsx *.csv"), ("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")]
+        )
+        if not filepath:
+            return None
+        try:
+            roster = read_roster(filepath)
+            if roster.empty:
+                messagebox.showerror("Error", "The roster does not list any nurses.")
+                return None
+            report = self.model.auto_assign_nurses(roster)
+        except Exception as e:
+            logging.error(f"Auto-assignment failed: {e}")
+            messagebox.showerror("Error", f"Auto-assignment failed: {e}")
+            return None
+
+        if report["assigned"] == 0:
+            messagebox.showinfo("No Changes", "There were no unassigned children that could be placed.")
+            return report
+        local = report["by_tier"].get("zip", 0) + report["by_tier"].get("zip3", 0)
+        message = (f"Assigned {report['assigned']} children across {len(roster)} nurses.\n"
+                   f"{local} were placed with a nurse in their ZIP area.\n"
+                   f"Largest caseload is now {report['max_load']}.")
+        if report["unplaced"]:
+            message += f"\n{report['unplaced']} children could not be placed (all nurses at capacity)."
+        if "nearby" not in report["by_tier"]:
+            message += "\nNurses in nearby ZIP codes were not considered (no ZIP centroid table)."
+        messagebox.showinfo("Auto-Assign Complete", message)
+        update_callback()
+        return report
+
     def assign_nurse(self, child_data, update_callback):
         frame = AssignNurseView(self.root, self, child_data, update_callback).create_widgets()
         self.main_controller.add_tab(frame, "Assign Nurse")
@@ -148,16 +193,9 @@ class NurseController:
 
     def save_nurse(self, nurse_name, child_data, update_callback, close_callback):
         if nurse_name:
-            df = self.model.combined_data
-            idx = df[
-                (df['Mother_ID'].astype(str) == str(child_data['Mother_ID'])) &
-                (df['Child_First_Name'].str.lower() == child_data['Child_First_Name'].lower()) &
-                (df['Child_Last_Name'].str.lower() == child_data['Child_Last_Name'].lower()) &
-                (df['Child_Date_of_Birth'] == child_data['Child_Date_of_Birth'])
-            ].index
+            idx = self.model.locate_child(child_data)
             if not idx.empty:
-                df.at[idx[0], 'Assigned_Nurse'] = nurse_name
-                df.to_excel('combined_matched_data.xlsx', index=False)
+                self.model.assign_nurse(idx[:1], nurse_name)
                 logging.info(f"Assigned Nurse '{nurse_name}'")
                 
                 update_callback(f"Name: {nurse_name}")
@@ -10,6 +10,8 @@ from reportlab.lib.units import inch
 import pandas as pd
 from datetime import datetime
 from PIL import Image, ImageTk
+from models.child_keys import build_child_keys, match_child
+from models.store import get_store
 
 class ProfileController:
     def __init__(self, root, child_data, model, main_controller, update_callback):
@@ -20,6 +22,7 @@ class ProfileController:
         self.update_callback = update_callback
         self.view = None
         self.visit_log_path = "nurse_log.xlsx"
+        self.store = model.store or get_store()
         self.load_icons()
         logging.info("ProfileController initialized.")
 
@@ -130,17 +133,8 @@ class ProfileController:
                     y -= 12
 
             # Visit Log
-            path = "nurse_log.xlsx"
-            mother_id = str(self.child_data.get("Mother_ID", ""))
-            first = self.child_data.get("Child_First_Name", "").lower()
-            last = self.child_data.get("Child_Last_Name", "").lower()
-            if os.path.exists(path):
-                df = pd.read_excel(path)
-                filtered = df[
-                    (df["Mother_ID"].astype(str) == mother_id) &
-                    (df["Child_First_Name"].str.lower() == first) &
-                    (df["Child_Last_Name"].str.lower() == last)
-                ]
+            if os.path.exists(self.visit_log_path):
+                filtered = self.model.visit_log_for(self.child_data, self.visit_log_path)
 
                 if not filtered.empty:
                     y = draw_section_header("Nurse Assignment History", y - 10)
@@ -203,14 +197,19 @@ class ProfileController:
         if self.view:
             self.view.update_nurse_log()
 
+    def get_notes(self, child_data, legacy_path="notes.xlsx"):
+        """Return the notes saved for a child ('' if none), falling back to the old notes.xlsx."""
+        notes = self.store.note_for(child_data)
+        if notes is None and os.path.exists(legacy_path):
+            df = pd.read_excel(legacy_path)
+            matching = df[match_child(build_child_keys(df), child_data)]
+            if not matching.empty and pd.notna(matching.iloc[0]["Notes"]):
+                notes = str(matching.iloc[0]["Notes"])
+        return notes or ""
+
+    def save_notes(self, child_data, notes):
+        self.store.save_note(child_data, notes)
+        logging.info("Notes saved.")
+
     def get_nurse_log(self, child_data):
-        if not os.path.exists(self.visit_log_path):
-            return []
-
-        df = pd.read_excel(self.visit_log_path)
-        filtered = df[
-            (df['Mother_ID'] == child_data.get("Mother_ID")) &
-            (df['Child_First_Name'].str.lower() == str(child_data.get("Child_First_Name", "")).lower()) &
-            (df['Child_Last_Name'].str.lower() == str(child_data.get("Child_Last_Name", "")).lower())
-        ]
-        return filtered.to_dict(orient='records')
\ No newline at end of file
+        return self.model.visit_log_for(child_data, self.visit_log_path).to_dict(orient='records')
\ No newline at end of file
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from gui_data_model import GuiDataModel
+from models.deferred import DeferredFrame
+
+
+class TestGuiDataModel(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.model = GuiDataModel()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    @patch('gui_data_model.messagebox')
+    def test_errors_become_dialogs_and_return_values(self, mock_messagebox):
+        self.assertFalse(self.model.combine_data())
+        mock_messagebox.showerror.assert_called_once_with(
+            "Error", "Please load two Excel files before combining data.")
+        self.assertIsNone(self.model.read_excel_file('missing.xlsx'))
+        self.assertFalse(self.model.load_combined_data())
+
+    @patch('gui_data_model.messagebox')
+    def test_nested_failure_shows_one_dialog(self, mock_messagebox):
+        with open('data.xlsx', 'wb') as f:
+            f.write(b'not a workbook')
+        # An encrypted-looking file with no key: decrypting fails inside read_excel_file
+        with patch.object(GuiDataModel, 'is_file_encrypted', return_value=True):
+            self.assertIsNone(self.model.read_excel_file('data.xlsx'))
+        mock_messagebox.showwarning.assert_called_once_with("Error!", "Key does not exist")
+        mock_messagebox.showerror.assert_not_called()
+
+    @patch('gui_data_model.messagebox')
+    def test_failed_side_dataset_is_a_dialog_not_an_empty_frame(self, mock_messagebox):
+        self.model._unmatched = DeferredFrame(loader=lambda: 1 / 0, name="unmatched data")
+
+        self.assertIs(self.model.unmatched_data, False)
+        mock_messagebox.showerror.assert_called_once_with(
+            "Error", "Error building unmatched data: division by zero")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,11 +49,13 @@ class TestInitialController(unittest.TestCase):
     def test_combine_data(self):
         self.mock_model.combine_data.return_value = True
         self.controller.combine_data()
-        self.mock_model.load_combined_data.assert_called_once()
+        self.mock_main_controller.show_combined_data.assert_called_once()
+        # The combined frame is handed over in memory, not re-read from disk
+        self.mock_model.load_combined_data.assert_not_called()
 
         self.mock_model.combine_data.return_value = False
         self.controller.combine_data()
-        self.mock_model.load_combined_data.assert_not_called()
+        self.mock_main_controller.show_combined_data.assert_called_once()
 
     def test_load_combined_data(self):
         self.mock_model.load_combined_data.return_value = True
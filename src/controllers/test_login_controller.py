@@ -2,8 +2,8 @@ import unittest
 from unittest.mock import MagicMock, patch
 from login_controller import LoginController
 from tkinter import Tk, messagebox
-import sqlite3
-import bcrypt
+from models import auth
+from models.auth import LoginResult
 
 class TestLoginController(unittest.TestCase):
 
@@ -17,73 +17,48 @@ class TestLoginController(unittest.TestCase):
         MockLoginView.return_value = self.mock_view
         self.controller = LoginController(self.mock_root, self.mock_main_controller)
 
-    @patch('login_controller.sqlite3.connect')
-    def test_initialize_db(self, mock_connect):
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
+    @patch('login_controller.auth.hash_password', return_value='hashed_password')
+    def test_initialize_db(self, mock_hashpw):
+        self.controller.store = MagicMock()
+        self.controller.store.password_hash.return_value = None
 
         self.controller.initialize_db()
 
-        mock_cursor.execute.assert_called_with("SELECT * FROM users WHERE username=?", ('admin',))
-        mock_cursor.execute.assert_called_with("INSERT INTO users (username, password) VALUES (?, ?)", ('admin', 'hashed_password'))
+        self.controller.store.password_hash.assert_called_with('admin')
+        self.controller.store.add_user.assert_called_with('admin', 'hashed_password')
 
-    @patch('login_sqlite3.connect')
-    @patch('login_bcrypt.checkpw')
-    def test_login_success(self, mock_checkpw, mock_connect):
-        mock_checkpw.return_value = True
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
-        self.controller._login_user = MagicMock(return_value=True)
+    def test_login_checks_password_off_the_tk_thread(self):
+        self.controller.root = MagicMock()
+        self.controller._login_user = MagicMock(return_value=LoginResult(auth.OK))
 
-        result = self.controller.login('admin', 'admin123')
+        self.controller.login('admin', 'admin123')
+        self.controller.pending.result()
+        poll = self.controller.root.after.call_args[0]
+        poll[1](*poll[2:])
 
-        self.assertTrue(result)
+        self.controller._login_user.assert_called_once_with('admin', 'admin123')
         self.mock_main_controller.show_initial_view.assert_called_once()
 
-    @patch('login_sqlite3.connect')
-    @patch('login_controller.bcrypt.checkpw')
-    def test_login_invalid_password(self, mock_checkpw, mock_connect):
-        mock_checkpw.return_value = False
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
-        self.controller._login_user = MagicMock(return_value=False)
-
-        result = self.controller.login('admin', 'wrongpassword')
+    @patch('login_controller.messagebox')
+    def test_login_invalid_password(self, mock_messagebox):
+        result = self.controller._login_finished('admin', LoginResult(auth.BAD_PASSWORD))
 
         self.assertFalse(result)
         mock_messagebox.showerror.assert_called_with("Login Failed", "Invalid username or password")
 
-    @patch('login_controller.sqlite3.connect')
-    @patch('login_controller.bcrypt.checkpw')
-    def test_login_username_not_found(self, mock_checkpw, mock_connect):
-        mock_checkpw.return_value = False
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
-        self.controller._login_user = MagicMock(return_value=None)
-
-        result = self.controller.login('nonexistentuser', 'password')
+    @patch('login_controller.messagebox')
+    def test_login_username_not_found(self, mock_messagebox):
+        result = self.controller._login_finished('nonexistentuser', LoginResult(auth.UNKNOWN_USER))
 
         self.assertFalse(result)
         mock_messagebox.showerror.assert_called_with("Login Failed", "Username not found")
 
-    @patch('login_controller.sqlite3.connect')
-    def test_register_user(self, mock_connect):
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
-
+    @patch('login_controller.auth.hash_password', return_value='hashed_password')
+    @patch('login_controller.get_store')
+    def test_register_user(self, mock_get_store, mock_hashpw):
         self.controller.register_user('newuser', 'newpassword')
 
-        mock_cursor.execute.assert_called_with("INSERT INTO users (username, password) VALUES (?, ?)", ('newuser', 'hashed_password'))
+        mock_get_store.return_value.add_user.assert_called_with('newuser', 'hashed_password')
 
 if __name__ == '__main__':
     unittest.main()
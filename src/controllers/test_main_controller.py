@@ -7,7 +7,7 @@ import os
 class TestMainController(unittest.TestCase):
 
     @patch('main_controller.TabsController')
-    @patch('main_controller.DataModel')
+    @patch('main_controller.GuiDataModel')
     def setUp(self, MockDataModel, MockTabsController):
         self.mock_root = Tk()
         self.mock_tabs_controller = MagicMock()
@@ -4,6 +4,8 @@ import pandas as pd
 from tkinter import Tk, messagebox
 from nurse_controller import NurseController
 from models.data_model import DataModel
+from models.statistics import compute_statistics
+from models.caseload import compute_caseload
 from views.statistical_view import StatisticalView
 from views.nurse_statistics_view import NursesStatisticalView
 from views.batch_assign_view import BatchAssignView
@@ -34,6 +36,7 @@ class TestNurseController(unittest.TestCase):
             'Child_Last_Name': ['Doe', 'Doe', 'Smith'],
             'Child_Date_of_Birth': ['2010-01-01', '2011-01-01', '2012-01-01']
         })
+        self.model.statistics.return_value = compute_statistics(self.model.combined_data)
         frame = self.controller.generate_report()
         self.assertIsNotNone(frame)
 
@@ -64,6 +67,7 @@ class TestNurseController(unittest.TestCase):
             'Child_Last_Name': ['Doe', 'Doe'],
             'Child_Date_of_Birth': ['2010-01-01', '2011-01-01']
         })
+        self.model.caseload.return_value = compute_caseload(self.model.combined_data)
         frame = self.controller.show_nurse_statistics()
         self.assertIsNotNone(frame)
 
@@ -97,7 +101,9 @@ class TestNurseController(unittest.TestCase):
         })
         update_callback = MagicMock()
         close_callback = MagicMock()
+        self.model.locate_child.return_value = pd.Index([0])
         self.controller.save_nurse('Nurse A', {'Mother_ID': 1, 'Child_First_Name': 'John', 'Child_Last_Name': 'Doe', 'Child_Date_of_Birth': '2010-01-01'}, update_callback, close_callback)
+        self.model.assign_nurse.assert_called_once()
         update_callback.assert_called_once_with("Name: Nurse A")
         close_callback.assert_called_once()
 
@@ -111,6 +117,7 @@ class TestNurseController(unittest.TestCase):
         })
         update_callback = MagicMock()
         close_callback = MagicMock()
+        self.model.locate_child.return_value = pd.Index([])
         self.controller.save_nurse('Nurse A', {'Mother_ID': 2, 'Child_First_Name': 'John', 'Child_Last_Name': 'Doe', 'Child_Date_of_Birth': '2010-01-01'}, update_callback, close_callback)
         messagebox.showerror.assert_called_with("Error", "Failed to assign nurse.")
 
@@ -120,6 +127,21 @@ class TestNurseController(unittest.TestCase):
         self.controller.save_nurse('', {'Mother_ID': 1, 'Child_First_Name': 'John', 'Child_Last_Name': 'Doe', 'Child_Date_of_Birth': '2010-01-01'}, update_callback, close_callback)
         messagebox.showerror.assert_called_with("Error", "Nurse name cannot be empty.")
 
+    def test_report_drill_down_opens_profile(self):
+        children = pd.DataFrame({'Child_First_Name': ['Jane'], 'Child_Last_Name': ['Doe'], 'Mother_ID': [7]})
+
+        StatisticalView(self.root, self.controller).open_child_profile(children)
+
+        child_data, update_callback = self.main_controller.show_profile.call_args[0]
+        self.assertEqual(child_data['Mother_ID'], 7)
+        self.assertEqual(update_callback, self.controller.refresh_report)
+
+    def test_report_drill_down_without_selection(self):
+        result = StatisticalView(self.root, self.controller).open_child_profile(pd.DataFrame())
+
+        self.assertIsNone(result)
+        self.main_controller.show_profile.assert_not_called()
+
     def test_close_report(self):
         self.controller.report_view = MagicMock()
         self.controller.close_report()
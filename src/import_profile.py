@@ -0,0 +1,86 @@
+# import_profile.py
+"""
+Report what starting the app imports, to catch cold-start regressions.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter and
+prints the slowest imports. Exits with code 1 if any of the --forbid
+modules (the heavy ones that should load after login) were imported.
+
+    python src/import_profile.py --top 15 --json import_profile.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ["pandas", "polars", "numpy", "reportlab", "cryptography", "openpyxl"]
+
+
+def profile_imports(target="app"):
+    """
+    Import a module in a fresh interpreter and collect -X importtime output.
+
+    Args:
+        target: Module to import, relative to the src directory
+
+    Returns:
+        list: One dict per imported module with 'module', 'self_us',
+        'cumulative_us' and 'depth', in import order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return imports
+
+
+def loaded_packages(imports):
+    """Return the set of top-level package names that were imported."""
+    return {entry["module"].split(".")[0] for entry in imports}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the imports made when starting the app.")
+    parser.add_argument("--target", default="app", help="Module to import (default: app)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--forbid", nargs="*", default=HEAVY_MODULES,
+                        help="Packages that must not be imported at startup")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    imports = profile_imports(args.target)
+    total_us = sum(entry["cumulative_us"] for entry in imports if entry["depth"] == 0)
+    forbidden = sorted(loaded_packages(imports) & set(args.forbid))
+
+    print(f"import {args.target}: {len(imports)} modules, {total_us / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for entry in sorted(imports, key=lambda e: e["cumulative_us"], reverse=True)[:args.top]:
+        print(f"{entry['cumulative_us'] / 1000:14.1f} {entry['self_us'] / 1000:8.1f}  {entry['module']}")
+    if forbidden:
+        print(f"Heavy modules imported at startup: {', '.join(forbidden)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"target": args.target, "total_ms": total_us / 1000,
+                       "forbidden": forbidden, "imports": imports}, f, indent=2)
+    return 1 if forbidden else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
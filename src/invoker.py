@@ -1,15 +1,63 @@
 import pandas as pd
 from tkinter import filedialog, messagebox
+import io
+import itertools
 import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from cryptography.fernet import InvalidToken
 from app_crypto import *
+from models.data_model import COMBINED_FILE, FERNET_PREFIX, DataModel
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Job states, in the order a job goes through them
+PENDING = "pending"      # waiting for the jobs it depends on
+QUEUED = "queued"        # handed to the pool, waiting for a worker
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class CommandError(Exception):
+    """A command failed while running as a background job."""
+
+
+class Cancelled(Exception):
+    """A job was cancelled before or while it ran."""
+
+
+# What the command running on this thread (or worker process) may look at
+_job_context = threading.local()
+
+
+def _run_command(command, args, kwargs, cancel_event=None):
+    """
+    Run a command as a background job. Module-level so process pools can pickle it.
+    """
+    _job_context.active = True
+    _job_context.cancel_event = cancel_event
+    try:
+        return command.execute(*args, **kwargs)
+    finally:
+        _job_context.active = False
+        _job_context.cancel_event = None
+
+
 class Command:
     """
     Command Interface:
     Abstract Command inherited by other commands invoked by tkinter buttons.
+
+    Commands can also run as background jobs through the Invoker. There
+    they must not open dialogs: failures go through fail(), which raises
+    instead of showing a message box, and long commands call
+    check_cancelled() between steps so the job can be cancelled.
     """
     def execute(self):
         """
@@ -22,10 +70,38 @@ class Command:
         """
         raise NotImplementedError("Subclasses must implement the 'execute' method")
 
+    def in_job(self):
+        """True while the command runs as a background job."""
+        return getattr(_job_context, "active", False)
+
+    def check_cancelled(self):
+        """
+        Raise Cancelled if the job running this command has been cancelled.
+
+        Postconditions:
+            - Returns normally outside of jobs and in worker processes, which cannot be signalled.
+        """
+        event = getattr(_job_context, "cancel_event", None)
+        if event is not None and event.is_set():
+            raise Cancelled(f"{self.__class__.__name__} cancelled")
+
+    def fail(self, message, result=None, show=True):
+        """
+        Report a failure: raise CommandError in a background job, otherwise
+        show an error box (if show) and return result.
+        """
+        logging.error(message)
+        if self.in_job():
+            raise CommandError(message)
+        if show:
+            messagebox.showerror("Error", message)
+        return result
+
 class ReadExcelCommand(Command):
     """
     Command to read Excel files.
     This command prompts a file explorer for selecting Excel files.
+    Encrypted files are decrypted in memory with key.txt; the file on disk is not changed.
     
     Args:
         app: The application object that holds the application state.
@@ -56,135 +132,90 @@ class ReadExcelCommand(Command):
             DataFrame: A pandas DataFrame containing the file's data.
         """
         if not filepath:
-            logging.error("No file selected.")
-            messagebox.showerror("Error", "No file selected.")
-            return None
+            return self.fail("No file selected.")
 
+        self.check_cancelled()
         try:
+            with open(filepath, "rb") as file:
+                content = file.read()
+            if content.startswith(FERNET_PREFIX):
+                content = Crypto.decrypt_data(content, Crypto.loadKey())
             # Read the Excel file into a DataFrame and normalize column names
-            data = pd.read_excel(filepath)
+            data = pd.read_excel(io.BytesIO(content))
             data.columns = [column.replace(" ", "_") for column in data.columns]
             logging.info(f"Successfully read file: {filepath}")
             return (data)
         except Exception as e:
-            logging.error(f"Error reading file '{filepath}': {e}")
-            messagebox.showerror("Error", f"Error reading file '{filepath}': {e}")
-            return None
+            return self.fail(f"Error reading file '{filepath}': {e}")
 
 
 class CombineDataCommand(Command):
     """
     Command to combine two datasets (Excel files) based on Mother's Name and Child's Date of Birth.
+
+    Runs the same combine as the application (DataModel.combine_data): the
+    vectorized match, carrying nurse assignments forward and the typed schema.
+    The model is created when the command runs, so the command only holds
+    plain arguments and can run in a worker process.
     """
-    def __init__(self, app, data_frames):
+    def __init__(self, app, data_frames=None, output_dir=''):
         """
         Initialize the command with the application state and data frames to combine.
 
         Preconditions:
-            - `app` is a valid application object.
-            - `data_frames` is a list of pandas DataFrames containing the data to combine.
+            - `app` is a valid application object, or None.
+            - `data_frames` is a list of pandas DataFrames containing the data to combine,
+              or None when they are passed to execute().
         Postconditions:
             - The command is initialized with the application state and data frames.
+
+        Args:
+            output_dir (str, optional): Directory the combined workbook is written to.
         """
         self.app = app
         self.data_frames = data_frames
+        self.output_dir = output_dir
 
-    def execute(self):
+    def execute(self, data_frames=None):
         """
         Execute the combination of two DataFrames based on specified columns.
 
         Preconditions:
             - The data frames provided contain the required columns for merging.
         Postconditions:
-            - Combined matched data is saved to an Excel file.
-            - Unmatched data, if any, is saved to a separate Excel file.
+            - Combined matched data is saved to combined_matched_data.xlsx in the
+              output directory before this returns.
             - Returns the combined data as a pandas DataFrame.
 
+        Args:
+            data_frames (list, optional): The (database, medicaid) frames; defaults to
+                those given to the constructor.
         Returns:
             DataFrame: A pandas DataFrame containing the combined matched data.
         """
+        self.check_cancelled()
+        model = DataModel(output_dir=self.output_dir)
         try:
-            # Extract the two data frames
-            database_data = self.data_frames[0]
-            medicaid_data = self.data_frames[1]
-
-            # Standardize columns for merging
-            database_data.rename(columns={'DOB': 'Child_Date_of_Birth'}, inplace=True)
-            medicaid_data.rename(columns={'Child_DOB': 'Child_Date_of_Birth', 'Last_Name': 'Mother_Last_Name'}, inplace=True)
-
-            # Normalize the names for matching
-            for df in [database_data, medicaid_data]:
-                for col in ['Mother_First_Name', 'Mother_Last_Name']:
-                    df[col] = df[col].str.lower().str.replace(r'\W', '', regex=True)
-
-            # Convert DOB columns to consistent date format
-            database_data['Child_Date_of_Birth'] = pd.to_datetime(database_data['Child_Date_of_Birth'], errors='coerce').dt.strftime('%Y-%m-%d')
-            medicaid_data['Child_Date_of_Birth'] = pd.to_datetime(medicaid_data['Child_Date_of_Birth'], errors='coerce').dt.strftime('%Y-%m-%d')
-
-            # Merge to get combined data
-            combined_data = pd.merge(
-                database_data,
-                medicaid_data,
-                on=['Mother_First_Name', 'Mother_Last_Name', 'Child_Date_of_Birth'],
-                how='inner',
-                suffixes=('_db', '_medicaid')
-            )
-            logging.info("Matched data combined successfully.")
-
-            
-            # Identify unmatched data
-            unmatched_database = database_data[~database_data.apply(
-                lambda row: ((combined_data['Mother_First_Name'] == row['Mother_First_Name']) &
-                            (combined_data['Mother_Last_Name'] == row['Mother_Last_Name']) &
-                            (combined_data['Child_Date_of_Birth'] == row['Child_Date_of_Birth'])).any(), axis=1)].copy()
-            unmatched_database['Source'] = 'Database'
-
-            unmatched_medicaid = medicaid_data[~medicaid_data.apply(
-                lambda row: ((combined_data['Mother_First_Name'] == row['Mother_First_Name']) &
-                            (combined_data['Mother_Last_Name'] == row['Mother_Last_Name']) &
-                            (combined_data['Child_Date_of_Birth'] == row['Child_Date_of_Birth'])).any(), axis=1)].copy()
-            unmatched_medicaid['Source'] = 'Medicaid'
-
-
-            # Check if there are unmatched rows in either data frame
-            if not unmatched_database.empty or not unmatched_medicaid.empty:
-                # Standardize unmatched data columns to align with combined_data
-                unmatched_database = unmatched_database.reindex(columns=combined_data.columns.tolist() + ['Source'], fill_value='')
-                unmatched_medicaid = unmatched_medicaid.reindex(columns=combined_data.columns.tolist() + ['Source'], fill_value='')
-
-                # Concatenate unmatched records
-                unmatched_data = pd.concat([unmatched_database, unmatched_medicaid], ignore_index=True)
-
-                # Capitalize all names in unmatched data
-                for col in ['Mother_First_Name', 'Mother_Last_Name', 'Child_First_Name', 'Child_Last_Name']:
-                    if col in unmatched_data.columns:
-                        unmatched_data[col] = unmatched_data[col].str.capitalize()
-
-                # Save the unmatched data to an Excel file
-                unmatched_file_path = 'unmatched_data.xlsx'
-                unmatched_data.to_excel(unmatched_file_path, index=False)
-                logging.info(f"Unmatched data saved to {unmatched_file_path}")
-            else:
-                logging.info("No unmatched data found; skipping unmatched data file creation.")
-
-            # Capitalize all names in matched data
-            for col in ['Mother_First_Name', 'Mother_Last_Name', 'Child_First_Name', 'Child_Last_Name']:
-                if col in combined_data.columns:
-                    combined_data[col] = combined_data[col].str.capitalize()
-
-            # Save the matched data
-            matched_file_path = 'combined_matched_data.xlsx'
-            combined_data.to_excel(matched_file_path, index=False)
-            logging.info(f"Matched data saved to {matched_file_path}")
-
-            # Return matched data to the app for display
-            self.app.combined_data = combined_data
-            return combined_data
-
+            model.data_frames = list(data_frames if data_frames is not None else self.data_frames)
+            model.combine_data(progress_callback=self._progress)
+            model.flush_writes()
+        except Cancelled:
+            raise
         except Exception as e:
-            logging.error(f"Error combining data: {e}")
-            messagebox.showerror("Error", f"Error combining data: {e}")
-            return None
+            if isinstance(e.__cause__, Cancelled):
+                raise e.__cause__  # raised by _progress inside a combine stage
+            return self.fail(f"Error combining data: {e}")
+        logging.info("Matched data combined successfully.")
+
+        # Return matched data to the app for display
+        if self.app is not None:
+            self.app.combined_data = model.combined_data
+        return model.combined_data
+
+    def _progress(self, message, percent):
+        """Called as each combine stage starts; a cancelled job stops there."""
+        if percent < 100:
+            self.check_cancelled()
 
 
 class GenerateKeyCommand(Command):
@@ -277,16 +308,18 @@ class EncryptFileCommand(Command):
                 logging.info("Browsing file.")
                 filepath = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
             if not os.path.exists(filepath):
-                logging.warning(f"Filepath {filepath} does not exist, cannot encrypt")
-                return
+                return self.fail(f"Filepath {filepath} does not exist, cannot encrypt", show=False)
+            self.check_cancelled()
             key = Crypto.loadKey()
             Crypto.encrypt_file(filepath, key)
             logging.info("Files encrypted")
             return True
+        except (Cancelled, CommandError):
+            raise
         except Exception as e:
             logging.info("Files could not be encrypted")
             logging.info(e)
-            return False
+            return self.fail(f"File '{filepath}' could not be encrypted: {e}", False, show=False)
 
 class DecryptFileCommand(Command):
     """
@@ -303,7 +336,7 @@ class DecryptFileCommand(Command):
         """
         self.app = app
     
-    def execute(self, filepath):
+    def execute(self, filepath, skip_plain=False):
         """
         Decrypt the specified file.
 
@@ -314,25 +347,146 @@ class DecryptFileCommand(Command):
 
         Args:
             filepath (str): The path of the file to decrypt.
+            skip_plain (bool, optional): Count a file that is not encrypted as a success.
         Returns:
             bool: True if decryption is successful, False otherwise.
         """
+        self.check_cancelled()
         try:
             key = Crypto.loadKey()
             Crypto.decrypt_file(filepath, key)
             return True
-        except:
-            return False
+        except InvalidToken:
+            if skip_plain:
+                logging.info(f"File '{filepath}' is not encrypted; nothing to decrypt.")
+                return True
+            return self.fail(f"File '{filepath}' could not be decrypted", False, show=False)
+        except Exception as e:
+            return self.fail(f"File '{filepath}' could not be decrypted: {e}", False, show=False)
         
 
+def _job_refs(values):
+    """The Jobs among values, including those inside lists and tuples."""
+    refs = []
+    for value in values:
+        if isinstance(value, Job):
+            refs.append(value)
+        elif isinstance(value, (list, tuple)):
+            refs += _job_refs(value)
+    return refs
+
+
+def _resolve(value):
+    """Replace Jobs in value (also inside lists and tuples) with their results."""
+    if isinstance(value, Job):
+        return value.result
+    if isinstance(value, (list, tuple)):
+        return type(value)(_resolve(item) for item in value)
+    return value
+
+
+class Job:
+    """
+    A command submitted to the Invoker, with its state and outcome.
+
+    Attributes:
+        name (str): Label used in logs and status reports.
+        status (str): One of PENDING, QUEUED, RUNNING, DONE, FAILED, CANCELLED.
+        result: What the command returned, once DONE.
+        error (Exception): Why the job FAILED or was CANCELLED.
+        depends_on (list): Jobs that must be DONE before this one starts.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, invoker, command, args, kwargs, depends_on, name=None):
+        self.id = next(Job._ids)
+        self.invoker = invoker
+        self.command = command
+        self.args = args
+        self.kwargs = kwargs
+        self.depends_on = depends_on
+        self.dependents = []
+        self.name = name or command.__class__.__name__
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.cancel_event = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def seconds(self):
+        """Run time so far, or in total once finished; None before it starts."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self):
+        """Cancel the job and every job that depends on it. See Invoker.cancel()."""
+        return self.invoker.cancel(self)
+
+    def wait(self, timeout=None):
+        """
+        Wait for the job to finish and return its result.
+
+        Raises:
+            CommandError or the command's own exception if the job failed,
+            Cancelled if it was cancelled, TimeoutError if it is still running.
+        """
+        if not self._finished.wait(timeout):
+            raise TimeoutError(f"{self.name} still {self.status}")
+        if self.status != DONE:
+            raise self.error
+        return self.result
+
+    def as_dict(self):
+        seconds = self.seconds
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "seconds": round(seconds, 3) if seconds is not None else None,
+            "depends_on": [job.id for job in self.depends_on],
+            "error": str(self.error) if self.error else None,
+        }
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.name} {self.status}>"
+
+
 class Invoker:
     """
-    Invoker class to store and execute commands sequentially.
+    Invoker class that runs commands as background jobs.
+
+    Commands are submitted to a thread pool (or a process pool) and run as
+    soon as the jobs they depend on are done, so independent commands run
+    at the same time. A Job passed as an argument of submit() is a
+    dependency, and the command receives its result in its place. A failed
+    or cancelled job cancels everything that depends on it.
+
+    on_status(job) is called from worker threads whenever a job changes
+    state; a Tk app should hand it on with root.after().
+
+    With a process pool the commands and their arguments must be picklable
+    and their classes importable (workers are spawned, not forked), changes
+    a command makes to `app` stay in the worker process, and a running
+    command cannot be cancelled.
+
+    The original sequential interface, add_command() and execute_commands(),
+    still runs commands synchronously on the calling thread.
 
     Attributes:
         commands (list): A list of commands to execute.
+        jobs (list): Every job submitted, in order.
     """
-    def __init__(self):
+    def __init__(self, max_workers=None, executor="thread", on_status=None):
         """
         Initialize the invoker with an empty command list.
 
@@ -340,8 +494,167 @@ class Invoker:
             - No arguments are required.
         Postconditions:
             - An empty list of commands is initialized.
+
+        Args:
+            max_workers (int, optional): Pool size; defaults to the pool's own default.
+            executor (str or Executor, optional): "thread", "process", or an Executor to use.
+            on_status (callable, optional): Called with the Job on every state change.
         """
         self.commands = []
+        self.jobs = []
+        self.on_status = on_status
+        self._lock = threading.RLock()
+        if executor == "thread":
+            executor = ThreadPoolExecutor(max_workers, thread_name_prefix="invoker")
+        elif executor == "process":
+            # Forked workers inherit locks held by other threads (Polars' pool, the writer) and can hang
+            executor = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self.executor = executor
+        self.in_processes = isinstance(executor, ProcessPoolExecutor)
+
+    def submit(self, command, *args, after=(), name=None, **kwargs):
+        """
+        Submit a command to run in the background as command.execute(*args, **kwargs).
+
+        Args:
+            command (Command): The command to run.
+            after (iterable, optional): Jobs that must be done first, besides those in args.
+            name (str, optional): Label for logs and status; defaults to the command's class name.
+        Returns:
+            Job: The submitted job.
+        """
+        depends_on = list(dict.fromkeys(list(after) + _job_refs(args) + _job_refs(kwargs.values())))
+        job = Job(self, command, args, kwargs, depends_on, name)
+        with self._lock:
+            self.jobs.append(job)
+            for dependency in depends_on:
+                dependency.dependents.append(job)
+        logging.info(f"Job {job.id} submitted: {job.name}")
+        self._notify(job)
+        self._start_if_ready(job)
+        return job
+
+    def _start_if_ready(self, job):
+        with self._lock:
+            if job.status != PENDING:
+                return
+            blocked = next((dep for dep in job.depends_on if dep.status in (FAILED, CANCELLED)), None)
+            if blocked is None and not all(dep.status == DONE for dep in job.depends_on):
+                return
+            if blocked is None:
+                args, kwargs = _resolve(job.args), {key: _resolve(value) for key, value in job.kwargs.items()}
+                job.status = RUNNING if self.in_processes else QUEUED
+                if self.in_processes:
+                    job.started_at = time.time()
+                    job.future = self.executor.submit(_run_command, job.command, args, kwargs)
+                else:
+                    job.future = self.executor.submit(self._run, job, args, kwargs)
+        if blocked is not None:
+            self._finish(job, CANCELLED, error=Cancelled(f"{job.name} not run: {blocked.name} {blocked.status}"))
+            return
+        self._notify(job)
+        job.future.add_done_callback(lambda future: self._completed(job, future))
+
+    def _run(self, job, args, kwargs):
+        """Runs on a worker thread."""
+        if job.cancel_event.is_set():
+            raise Cancelled(f"{job.name} cancelled")
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+        self._notify(job)
+        return _run_command(job.command, args, kwargs, job.cancel_event)
+
+    def _completed(self, job, future):
+        if future.cancelled():
+            self._finish(job, CANCELLED, error=Cancelled(f"{job.name} cancelled"))
+            return
+        error = future.exception()
+        if error is None:
+            self._finish(job, DONE, result=future.result())
+        else:
+            self._finish(job, CANCELLED if isinstance(error, Cancelled) else FAILED, error=error)
+
+    def _finish(self, job, status, result=None, error=None):
+        with self._lock:
+            if job.done:
+                return
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            dependents = list(job.dependents)
+        seconds = f" in {job.seconds:.3f} s" if job.seconds is not None else ""
+        if status == FAILED:
+            logging.error(f"Job {job.id} {job.name} failed{seconds}: {error}")
+        else:
+            logging.info(f"Job {job.id} {job.name} {status}{seconds}")
+        job._finished.set()
+        self._notify(job)
+        for dependent in dependents:
+            self._start_if_ready(dependent)
+
+    def _notify(self, job):
+        if self.on_status is not None:
+            try:
+                self.on_status(job)
+            except Exception as e:
+                logging.error(f"Job status callback failed: {e}")
+
+    def cancel(self, job):
+        """
+        Cancel a job and the jobs that depend on it.
+
+        A job that has not started yet is dropped. A running job is asked to
+        stop and ends at its next check_cancelled(); a command that never
+        checks runs to completion, but its dependents are still cancelled.
+
+        Returns:
+            bool: False if the job had already finished.
+        """
+        with self._lock:
+            if job.done:
+                return False
+            job.cancel_event.set()
+            dependents = list(job.dependents)
+            pending = job.status == PENDING
+            if not pending:
+                job.future.cancel()
+        if pending:
+            self._finish(job, CANCELLED, error=Cancelled(f"{job.name} cancelled"))
+        for dependent in dependents:
+            self.cancel(dependent)
+        return True
+
+    def cancel_all(self):
+        """Cancel every job that has not finished."""
+        for job in list(self.jobs):
+            self.cancel(job)
+
+    def wait(self, jobs=None, timeout=None):
+        """
+        Wait until the given jobs (default: all submitted so far) have finished.
+
+        Returns:
+            bool: True if they all finished within timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in list(jobs if jobs is not None else self.jobs):
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            if not job._finished.wait(remaining):
+                return False
+        return True
+
+    def status(self):
+        """A snapshot of every job as a list of dicts (id, name, status, seconds, depends_on, error)."""
+        with self._lock:
+            return [job.as_dict() for job in self.jobs]
+
+    def shutdown(self, wait=True, cancel=False):
+        """Stop accepting jobs; with cancel, cancel those not finished first."""
+        if cancel:
+            self.cancel_all()
+        self.executor.shutdown(wait=wait)
 
     def add_command(self, command):
         """
@@ -370,3 +683,30 @@ class Invoker:
         for command in self.commands:
             command.execute()
             logging.info(f"Executed command: {command.__class__.__name__}")
+
+
+def submit_combine_pipeline(invoker, app, database_path, medicaid_path, output_dir='', encrypt=True):
+    """
+    Submit read -> combine -> encrypt for the two lists.
+
+    The two files are read at the same time, decrypted in memory if they
+    are encrypted, so the inputs stay encrypted on disk. The combine is
+    DataModel.combine_data, so the result is the same as in the application
+    and the command line, and the combined workbook is written to output_dir
+    as combined_matched_data.xlsx. Every command takes plain arguments, so
+    the pipeline also runs on a process pool.
+
+    Returns:
+        dict: The jobs by step: "read database", "read medicaid", "combine" and,
+        with encrypt, "encrypt". The combine job's result is the combined
+        DataFrame; the workbook is complete once it is done.
+    """
+    jobs = {}
+    for label, path in (("database", database_path), ("medicaid", medicaid_path)):
+        jobs[f"read {label}"] = invoker.submit(ReadExcelCommand(app), path, name=f"read {label}")
+    jobs["combine"] = invoker.submit(CombineDataCommand(app, output_dir=output_dir),
+                                     [jobs["read database"], jobs["read medicaid"]], name="combine")
+    if encrypt:
+        jobs["encrypt"] = invoker.submit(EncryptFileCommand(app), os.path.join(output_dir, COMBINED_FILE),
+                                         after=[jobs["combine"]], name="encrypt")
+    return jobs
@@ -0,0 +1,65 @@
+import logging
+import pandas as pd
+
+from models.record_key import has_record_key, record_key_codes
+
+UNASSIGNED = "None"
+
+
+def normalize_nurse(series):
+    """Map blank / NaN nurse values to 'None' so assigned rows are easy to tell apart."""
+    nurses = series.astype("object").where(series.notna(), UNASSIGNED).astype(str).str.strip()
+    return nurses.mask(nurses.isin(["", "nan", "NaN"]), UNASSIGNED)
+
+
+def carry_forward_assignments(combined, previous):
+    """
+    Re-attach nurse assignments from a previous combined dataset.
+
+    Prior assignments are joined back onto the freshly combined rows by record
+    key in a single hash lookup, so the cost is linear in the number of rows.
+    When the source files already carry a different nurse for a row, the prior
+    (manually made) assignment wins and the row is counted as a conflict.
+
+    Args:
+        combined: Freshly combined DataFrame
+        previous: Previous combined DataFrame, or None
+
+    Returns:
+        (combined, report) where report has 'carried', 'dropped' and 'conflicted' counts
+    """
+    report = {"carried": 0, "dropped": 0, "conflicted": 0}
+    if "Assigned_Nurse" in combined.columns:
+        combined["Assigned_Nurse"] = normalize_nurse(combined["Assigned_Nurse"])
+    else:
+        combined["Assigned_Nurse"] = UNASSIGNED
+
+    if previous is None or previous.empty or "Assigned_Nurse" not in previous.columns:
+        return combined, report
+    if not has_record_key(previous) or not has_record_key(combined):
+        logging.warning("Cannot carry assignments forward: record key columns missing.")
+        return combined, report
+
+    prior_nurses = normalize_nurse(previous["Assigned_Nurse"])
+    assigned = (prior_nurses != UNASSIGNED).to_numpy()
+    if not assigned.any():
+        return combined, report
+    prior_codes, keys = record_key_codes(previous[assigned], combined)
+    prior = pd.Series(prior_nurses[assigned].to_numpy(), index=prior_codes)
+    prior = prior[~prior.index.duplicated(keep="last")]
+
+    carried = pd.Series(keys, index=combined.index).map(prior)
+    found = carried.notna()
+    current = combined["Assigned_Nurse"]
+    conflicted = found & (current != UNASSIGNED) & (current != carried)
+
+    combined["Assigned_Nurse"] = carried.where(found, current)
+
+    report["carried"] = int((found & ~conflicted).sum())
+    report["conflicted"] = int(conflicted.sum())
+    report["dropped"] = int((~prior.index.isin(keys)).sum())
+    logging.info(
+        f"Assignments carried forward: {report['carried']} carried, "
+        f"{report['dropped']} dropped, {report['conflicted']} conflicted."
+    )
+    return combined, report
@@ -0,0 +1,97 @@
+import functools
+import logging
+import os
+import time
+from collections import namedtuple
+import bcrypt
+
+# bcrypt work factor for new and upgraded hashes. Raising it upgrades each
+# user's stored hash the next time they log in.
+BCRYPT_ROUNDS = int(os.environ.get("NURSEFILTER_BCRYPT_ROUNDS", 12))
+
+# After MAX_FAILURES failed attempts in a row, a user must wait before trying
+# again: THROTTLE_SECONDS, doubling with each further failure up to MAX_DELAY.
+MAX_FAILURES = 5
+THROTTLE_SECONDS = 30
+MAX_DELAY = 15 * 60
+
+OK = "ok"
+BAD_PASSWORD = "bad_password"
+UNKNOWN_USER = "unknown_user"
+THROTTLED = "throttled"
+
+LoginResult = namedtuple("LoginResult", ["status", "retry_after"], defaults=[0])
+
+
+@functools.lru_cache(maxsize=None)
+def _dummy_hash(rounds):
+    """
+    Hash checked against when the user does not exist, so that takes as long
+    as a wrong password. Made at the same cost as real hashes, on first use.
+    """
+    return bcrypt.hashpw(b"not a password", bcrypt.gensalt(rounds))
+
+
+def hash_password(password, rounds=None):
+    """Hash a password with bcrypt at the configured cost."""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds or BCRYPT_ROUNDS))
+
+
+def hash_rounds(stored_hash):
+    """The cost a bcrypt hash was made with (e.g. 12 for b'$2b$12$...')."""
+    if isinstance(stored_hash, str):
+        stored_hash = stored_hash.encode()
+    return int(stored_hash.split(b"$")[2])
+
+
+def throttle_delay(failures):
+    """Seconds a user must wait after this many consecutive failures (0 = no wait)."""
+    if failures < MAX_FAILURES:
+        return 0
+    return min(THROTTLE_SECONDS * 2 ** (failures - MAX_FAILURES), MAX_DELAY)
+
+
+def verify_login(store, username, password, now=None, rounds=None):
+    """
+    Check a username and password against the store.
+
+    This runs the bcrypt check, so call it off the UI thread. Failed
+    attempts are counted per existing user in the store (unknown names are
+    not recorded, so they cannot grow the table). A user over the limit is
+    refused without checking the password until the delay has passed. A
+    correct password stored at a lower cost than `rounds` is rehashed.
+
+    Args:
+        store: models.store.Store holding the users
+        now: Current time (default: time.time())
+        rounds: Cost to upgrade to (default: BCRYPT_ROUNDS)
+
+    Returns:
+        LoginResult with status OK, BAD_PASSWORD, UNKNOWN_USER or THROTTLED,
+        and for THROTTLED the seconds left to wait
+    """
+    now = time.time() if now is None else now
+    rounds = rounds or BCRYPT_ROUNDS
+
+    stored_hash = store.password_hash(username)
+    if stored_hash is None:
+        bcrypt.checkpw(password.encode('utf-8'), _dummy_hash(rounds))
+        return LoginResult(UNKNOWN_USER)
+
+    failures, last_failure = store.login_failures(username)
+    wait = throttle_delay(failures)
+    if wait and now < last_failure + wait:
+        return LoginResult(THROTTLED, int(last_failure + wait - now) + 1)
+
+    if isinstance(stored_hash, str):
+        stored_hash = stored_hash.encode()
+    if not bcrypt.checkpw(password.encode('utf-8'), stored_hash):
+        store.record_login_failure(username, now)
+        return LoginResult(BAD_PASSWORD)
+
+    if failures:
+        store.clear_login_failures(username)
+    if hash_rounds(stored_hash) < rounds:
+        store.set_password_hash(username, hash_password(password, rounds))
+        logging.info(f"Upgraded password hash for {username} to cost {rounds}.")
+    return LoginResult(OK)
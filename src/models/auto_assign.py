@@ -0,0 +1,198 @@
+import heapq
+import logging
+import numpy as np
+import pandas as pd
+
+from models.assignments import UNASSIGNED, normalize_nurse
+from models.geo import GeoIndex, locate_zips
+from models.record_key import normalize_zip
+
+# Accepted spellings of the roster columns (after spaces become underscores)
+ROSTER_ALIASES = {
+    "Nurse": ["Nurse", "Nurse_Name", "Name", "Assigned_Nurse"],
+    "Capacity": ["Capacity", "Max_Caseload", "Max_Children"],
+    "Home_ZIP": ["Home_ZIP", "Home_Zip", "ZIP", "Zip", "Zipcode"],
+}
+
+# Locality tiers tried in order: children are first offered to nurses living in
+# their ZIP, then in their 3-digit ZIP area, and only then to anyone.
+LOCALITY_TIERS = {
+    "zip": lambda zips: zips,
+    "zip3": lambda zips: zips.str[:3].where(zips != "", ""),
+}
+
+# With a ZIP centroid table, children still unplaced after the locality tiers
+# are offered to nurses living within this distance before anyone else.
+NEARBY_MILES = 25
+
+
+def normalize_roster(roster):
+    """
+    Bring a nurse roster to the columns Nurse, Capacity and Home_ZIP.
+
+    Blank capacities mean "no limit"; blank home ZIPs leave the nurse out of
+    the locality tiers. Repeated nurse names keep their first row.
+
+    Raises:
+        ValueError: If the roster has no nurse name column
+    """
+    roster = roster.rename(columns=lambda c: str(c).strip().replace(" ", "_"))
+    columns = {}
+    for target, aliases in ROSTER_ALIASES.items():
+        found = next((alias for alias in aliases if alias in roster.columns), None)
+        columns[target] = roster[found] if found else pd.Series(np.nan, index=roster.index)
+    if columns["Nurse"].isna().all():
+        raise ValueError("The roster needs a 'Nurse' (or 'Nurse Name') column.")
+
+    nurses = normalize_nurse(columns["Nurse"])
+    out = pd.DataFrame({
+        "Nurse": nurses,
+        "Capacity": pd.to_numeric(columns["Capacity"], errors="coerce"),
+        "Home_ZIP": normalize_zip(columns["Home_ZIP"]),
+    })
+    out = out[out["Nurse"] != UNASSIGNED]
+    return out.drop_duplicates("Nurse").reset_index(drop=True)
+
+
+def read_roster(filepath):
+    """Read a roster from an Excel or CSV file and normalize it."""
+    if str(filepath).lower().endswith(".csv"):
+        roster = pd.read_csv(filepath)
+    else:
+        roster = pd.read_excel(filepath)
+    return normalize_roster(roster)
+
+
+def _fill(children, candidates, load, weight, cap):
+    """
+    Hand children one at a time to the candidate with the lowest load/weight ratio.
+
+    Returns:
+        (nurse index per placed child, number of children placed)
+    """
+    heap = [(load[i] / weight[i], i) for i in candidates if load[i] < cap[i]]
+    heapq.heapify(heap)
+    chosen = np.full(len(children), -1)
+    for n in range(len(children)):
+        if not heap:
+            return chosen, n
+        _, i = heapq.heappop(heap)
+        chosen[n] = i
+        load[i] += 1
+        if load[i] < cap[i]:
+            heapq.heappush(heap, (load[i] / weight[i], i))
+    return chosen, len(children)
+
+
+def _nearby_candidates(child_zips, home_zips, usable, centroids, miles):
+    """
+    Group children by ZIP and find the usable nurses living within miles of each ZIP.
+
+    Returns:
+        (positions of each ZIP group in child_zips, nurse indexes within range) pairs
+    """
+    homes = np.flatnonzero(usable)
+    home_lat, home_lon = locate_zips(centroids, home_zips.to_numpy(dtype=object)[homes])
+    located = ~np.isnan(home_lat)
+    if not located.any():
+        return []
+    homes = homes[located]
+    index = GeoIndex(home_lat[located], home_lon[located])
+
+    groups = pd.Series(child_zips).groupby(child_zips, sort=False).indices
+    zips = list(groups)
+    # One batched radius query for every distinct child ZIP
+    lat, lon = locate_zips(centroids, zips)
+    return [(groups[z], homes[found]) for z, found in zip(zips, index.within(lat, lon, miles)) if len(found)]
+
+
+def auto_assign(combined, roster, tiers=None, centroids=None, nearby_miles=NEARBY_MILES):
+    """
+    Distribute unassigned children across a roster of nurses.
+
+    Each nurse's load is balanced relative to capacity: in the locality tiers
+    a nurse only takes children up to an equal share of the total workload
+    (so nearby nurses are preferred without being overloaded), and whatever
+    is left is placed globally up to the hard capacities. Within a tier every
+    child goes to the least-loaded eligible nurse, using a heap.
+
+    Args:
+        combined: Combined DataFrame with Assigned_Nurse (and ZIP for locality)
+        roster: Roster DataFrame (normalized with normalize_roster)
+        tiers: Mapping of tier name -> function turning 5-digit ZIPs into the
+            tier's grouping key (defaults to LOCALITY_TIERS)
+        centroids: Optional ZIP centroid table (see models/geo.py); adds a
+            'nearby' tier of nurses living within nearby_miles of the child
+        nearby_miles: Radius of the 'nearby' tier
+
+    Returns:
+        (assignments, report) where assignments is a Series of nurse names
+        indexed by the combined rows that were assigned, and report holds
+        'assigned', 'unplaced', 'by_tier' and 'max_load'
+    """
+    tiers = LOCALITY_TIERS if tiers is None else tiers
+    names = roster["Nurse"].to_numpy()
+    cap = roster["Capacity"].fillna(np.inf).to_numpy(dtype=float)
+    known = cap[np.isfinite(cap) & (cap > 0)]
+    weight = np.where(np.isfinite(cap), cap, np.median(known) if known.size else 1.0)
+    usable = weight > 0
+
+    current = normalize_nurse(combined["Assigned_Nurse"])
+    load = current.value_counts().reindex(names, fill_value=0).to_numpy(dtype=float)
+    unassigned = np.flatnonzero((current == UNASSIGNED).to_numpy())
+    report = {"assigned": 0, "unplaced": len(unassigned), "by_tier": {}, "max_load": 0}
+    if not len(unassigned) or not usable.any():
+        return pd.Series(dtype=object), report
+
+    # Equal share of the total workload relative to capacity, used as a soft cap
+    target = (load.sum() + len(unassigned)) / weight[usable].sum()
+    share = np.minimum(cap, np.ceil(target * weight))
+    chosen = np.full(len(unassigned), -1)
+
+    child_zips = normalize_zip(combined["ZIP"]).to_numpy()[unassigned] if "ZIP" in combined.columns else None
+    home_zips = roster["Home_ZIP"]
+    if child_zips is not None:
+        child_zips = pd.Series(child_zips, dtype=object)
+        for tier, key_of in tiers.items():
+            nurse_keys = key_of(home_zips).to_numpy()
+            local = (nurse_keys != "") & usable
+            nurses_by_key = pd.Series(np.flatnonzero(local)).groupby(nurse_keys[local]).agg(list).to_dict()
+            pending = np.flatnonzero(chosen < 0)
+            keys = key_of(child_zips.iloc[pending]).to_numpy()
+            placed = 0
+            for key, positions in pd.Series(keys).groupby(keys, sort=False).indices.items():
+                if key not in nurses_by_key:
+                    continue
+                rows = pending[positions]
+                picks, n = _fill(rows, nurses_by_key[key], load, weight, share)
+                chosen[rows[:n]] = picks[:n]
+                placed += n
+            report["by_tier"][tier] = placed
+
+        if centroids is not None and len(centroids):
+            pending = np.flatnonzero(chosen < 0)
+            placed = 0
+            for positions, nurses in _nearby_candidates(
+                    child_zips.to_numpy()[pending], home_zips, usable, centroids, nearby_miles):
+                rows = pending[positions]
+                picks, n = _fill(rows, nurses, load, weight, share)
+                chosen[rows[:n]] = picks[:n]
+                placed += n
+            report["by_tier"]["nearby"] = placed
+
+    # Everything left goes to the least-loaded nurse anywhere, up to hard capacity
+    pending = np.flatnonzero(chosen < 0)
+    picks, n = _fill(pending, np.flatnonzero(usable), load, weight, cap)
+    chosen[pending[:n]] = picks[:n]
+    report["by_tier"]["any"] = n
+
+    placed = chosen >= 0
+    assignments = pd.Series(names[chosen[placed]], index=combined.index[unassigned[placed]], dtype=object)
+    report["assigned"] = int(placed.sum())
+    report["unplaced"] = int((~placed).sum())
+    report["max_load"] = int(load.max()) if len(load) else 0
+    logging.info(
+        f"Auto-assigned {report['assigned']} children across {len(names)} nurses "
+        f"({report['by_tier']}); {report['unplaced']} could not be placed."
+    )
+    return assignments, report
@@ -0,0 +1,103 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from models.assignments import UNASSIGNED, normalize_nurse
+from models.child_keys import CHILD_KEY_COLUMNS, build_child_keys
+from models.schema import apply_schema
+
+# Age bands (in years) of the assigned children, as (lower bound, column name)
+AGE_BANDS = [(0, "Age_Under_1"), (1, "Age_1_to_2"), (2, "Age_2_Plus")]
+
+CASELOAD_COLUMNS = [
+    "Nurse", "Active_Caseload", "Recent_Visits", "Visits_Per_Week", "Children_Visited",
+    "Median_Age", *[name for _, name in AGE_BANDS], "Towns", "ZIPs", "Top_Town",
+]
+
+
+def _assigned_children(combined, today):
+    """Assigned rows of the combined data with the nurse name and child age attached."""
+    nurses = normalize_nurse(combined["Assigned_Nurse"])
+    assigned = (nurses != UNASSIGNED).to_numpy()
+    children = pd.DataFrame({"Nurse": nurses[assigned].to_numpy()}, index=combined.index[assigned])
+    if "Child_Date_of_Birth" in combined.columns:
+        dob = combined.loc[assigned, "Child_Date_of_Birth"]
+        children["Age"] = (today - dob).dt.days / 365.25
+    for col in ("City", "ZIP"):
+        if col in combined.columns:
+            children[col] = combined.loc[assigned, col].astype(object).to_numpy()
+    return children
+
+
+def _key_strings(keys):
+    return keys["mother_id"] + "|" + keys["first"] + "|" + keys["last"]
+
+
+def _visit_metrics(children, child_keys, visits, visit_keys, today, period_days):
+    """Per-nurse visit counts and how many of each nurse's current children were visited recently."""
+    visit_time = pd.to_datetime(visits["Visit_Time"], errors="coerce", format="mixed")
+    recent = (visit_time > today - pd.Timedelta(days=period_days)).to_numpy()
+    last_12_weeks = (visit_time > today - pd.Timedelta(weeks=12)).to_numpy()
+    nurse = normalize_nurse(visits["Nurse_Name"]).to_numpy()
+
+    metrics = pd.DataFrame({
+        "Recent_Visits": pd.Series(nurse[recent]).value_counts(),
+        "Visits_Per_Week": pd.Series(nurse[last_12_weeks]).value_counts() / 12,
+    })
+
+    # Join recent visits to the assigned children on the shared child key codes
+    codes = pd.factorize(pd.concat([_key_strings(child_keys),
+                                    _key_strings(visit_keys[recent])], ignore_index=True))[0]
+    child_codes, visit_codes = codes[:len(children)], codes[len(children):]
+    visited = np.isin(child_codes, visit_codes)
+    metrics["Children_Visited"] = pd.Series(children["Nurse"].to_numpy()[visited]).value_counts()
+    return metrics
+
+
+def compute_caseload(combined, visits=None, visit_keys=None, today=None, period_days=30):
+    """
+    Compute per-nurse caseload analytics in a few vectorized groupbys.
+
+    Args:
+        combined: Combined DataFrame with Assigned_Nurse
+        visits: Nurse visit log (Nurse_Name, Visit_Time and child key columns), or None
+        visit_keys: build_child_keys(visits), if already computed
+        today: Reference date for ages and visit periods (defaults to now)
+        period_days: Length of the "recent visits" period
+
+    Returns:
+        DataFrame with one row per nurse and CASELOAD_COLUMNS, sorted by caseload
+    """
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.today()
+    combined = apply_schema(combined)
+    children = _assigned_children(combined, today)
+    by_nurse = children.groupby("Nurse", sort=False)
+
+    table = pd.DataFrame({"Active_Caseload": by_nurse.size()})
+    if "Age" in children.columns:
+        table["Median_Age"] = by_nurse["Age"].median().round(1)
+        bounds = [lower for lower, _ in AGE_BANDS] + [np.inf]
+        bands = pd.cut(children["Age"], bounds, right=False, labels=[name for _, name in AGE_BANDS])
+        table = table.join(children.groupby(["Nurse", bands], observed=False).size().unstack())
+    if "City" in children.columns:
+        table["Towns"] = by_nurse["City"].nunique()
+        town_counts = children.groupby(["Nurse", "City"]).size().sort_values(ascending=False, kind="stable")
+        top = town_counts.index.to_frame(index=False).drop_duplicates("Nurse")
+        table["Top_Town"] = top.set_index("Nurse")["City"]
+    if "ZIP" in children.columns:
+        table["ZIPs"] = by_nurse["ZIP"].nunique()
+
+    if visits is not None and not visits.empty and {"Nurse_Name", "Visit_Time"} <= set(visits.columns):
+        if visit_keys is None:
+            visit_keys = build_child_keys(visits)
+        key_columns = [col for col in CHILD_KEY_COLUMNS.values() if col in combined.columns]
+        child_keys = build_child_keys(combined.loc[children.index, key_columns])
+        table = table.join(_visit_metrics(children, child_keys, visits, visit_keys, today, period_days), how="outer")
+
+    table = table.reindex(columns=CASELOAD_COLUMNS[1:])
+    counts = [col for col in CASELOAD_COLUMNS if col not in ("Nurse", "Median_Age", "Top_Town", "Visits_Per_Week")]
+    table[counts] = table[counts].fillna(0).astype(int)
+    table["Visits_Per_Week"] = table["Visits_Per_Week"].fillna(0).round(1)
+    table = table.rename_axis("Nurse").reset_index()
+    logging.info(f"Computed caseload analytics for {len(table)} nurses.")
+    return table.sort_values(["Active_Caseload", "Nurse"], ascending=[False, True], kind="stable", ignore_index=True)
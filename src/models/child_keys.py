@@ -0,0 +1,62 @@
+import pandas as pd
+
+from models.record_key import normalize_id
+
+# Normalized forms of the columns that identify a child in the combined data,
+# the nurse log and the notes file. They live in a frame aligned with the data
+# they describe, never as columns of it, so views and exports never see them.
+CHILD_KEY_COLUMNS = {
+    "mother_id": "Mother_ID",
+    "first": "Child_First_Name",
+    "last": "Child_Last_Name",
+}
+
+
+def fold(series):
+    """Case-fold a text column for case-insensitive comparisons."""
+    return series.fillna("").astype(str).str.strip().str.lower()
+
+
+def build_child_keys(df):
+    """
+    Compute the normalized child key columns for df in one pass.
+
+    Args:
+        df: DataFrame with Mother_ID and child first/last name columns
+
+    Returns:
+        DataFrame with 'mother_id', 'first' and 'last' columns, aligned with df's index
+    """
+    keys = {}
+    for key, col in CHILD_KEY_COLUMNS.items():
+        if col in df.columns:
+            keys[key] = normalize_id(df[col]) if key == "mother_id" else fold(df[col])
+        else:
+            keys[key] = pd.Series("", index=df.index)
+    return pd.DataFrame(keys, index=df.index)
+
+
+def child_key(child_data):
+    """Normalize a single child record (a dict or row) the same way as build_child_keys."""
+    values = pd.DataFrame([{col: child_data.get(col, "") for col in CHILD_KEY_COLUMNS.values()}])
+    return build_child_keys(values).iloc[0].to_dict()
+
+
+def match_child(keys, child_data, fields=("mother_id", "first", "last")):
+    """
+    Return a boolean mask over keys selecting rows that belong to child_data.
+
+    Args:
+        keys: Frame produced by build_child_keys
+        child_data: Dict or row with the child's Mother_ID and names
+        fields: Which key fields must match
+
+    Returns:
+        numpy bool array aligned with keys
+    """
+    wanted = child_key(child_data)
+    mask = None
+    for field in fields:
+        hit = (keys[field] == wanted[field]).to_numpy(dtype=bool, na_value=False)
+        mask = hit if mask is None else mask & hit
+    return mask
@@ -0,0 +1,78 @@
+import polars as pl
+from models.instrumentation import no_span
+
+
+def _normalize(df):
+    """Normalize the matching columns and add the Match_Key they form."""
+    return df.with_columns([
+        pl.col("Mother_First_Name").cast(pl.Utf8).str.to_lowercase().str.replace_all(r"\W", ""),
+        pl.col("Mother_Last_Name").cast(pl.Utf8).str.to_lowercase().str.replace_all(r"\W", ""),
+        pl.col("Child_Date_of_Birth").cast(pl.Utf8).str.strip_chars().str.strptime(pl.Date, "%Y-%m-%d", strict=False).cast(pl.Utf8),
+    ]).with_columns([
+        (pl.col("Mother_First_Name") + "_" +
+        pl.col("Mother_Last_Name") + "_" +
+        pl.col("Child_Date_of_Birth")).alias("Match_Key")
+    ])
+
+
+def match_frames(database, medicaid, span=no_span):
+    """
+    Match the hospital (database) records to the Medicaid records.
+
+    Records match on the mother's normalized first and last name plus the
+    child's date of birth. This is a pure function of its inputs (no files,
+    no UI), so it can run in a worker process.
+
+    Args:
+        database: Hospital DataFrame (pandas)
+        medicaid: Medicaid DataFrame (pandas)
+        span: Optional Instrumentation.span, to time the normalize, join and unmatched stages
+
+    Returns:
+        (combined, unmatched_db, unmatched_med) where combined is a pandas
+        DataFrame and the unmatched records are Polars frames
+    """
+    with span("normalize", rows_in=len(database) + len(medicaid)):
+        # Convert to Polars
+        db_df = pl.from_pandas(database.copy())
+        med_df = pl.from_pandas(medicaid.copy())
+
+        # Rename columns for consistency
+        if "DOB" in db_df.columns:
+            db_df = db_df.rename({"DOB": "Child_Date_of_Birth"})
+        if "Child_DOB" in med_df.columns:
+            med_df = med_df.rename({"Child_DOB": "Child_Date_of_Birth"})
+        if "Last_Name" in med_df.columns:
+            med_df = med_df.rename({"Last_Name": "Mother_Last_Name"})
+
+        db_df = _normalize(db_df)
+        med_df = _normalize(med_df)
+
+    with span("join", rows_in=db_df.height + med_df.height) as stage:
+        # Join on Match_Key using Polars
+        combined = db_df.join(med_df, on="Match_Key", how="inner", suffix="_medicaid")
+
+        # Drop duplicate `_medicaid` columns
+        for col in ["Mother_First_Name", "Mother_Last_Name", "Child_Date_of_Birth"]:
+            if f"{col}_medicaid" in combined.columns:
+                combined = combined.drop(f"{col}_medicaid")
+
+        # Add Assigned_Nurse if missing
+        if "Assigned_Nurse" not in combined.columns:
+            combined = combined.with_columns(pl.lit("None").alias("Assigned_Nurse"))
+
+        # Capitalize child names
+        for col in ["Mother_First_Name", "Mother_Last_Name", "Child_First_Name", "Child_Last_Name"]:
+            if col in combined.columns:
+                combined = combined.with_columns(pl.col(col).str.to_titlecase())
+
+        combined = combined.drop("Match_Key").to_pandas()
+        stage.rows_out = len(combined)
+
+    with span("unmatched", rows_in=db_df.height + med_df.height) as stage:
+        # Anti-join on Match_Key for the records without a partner
+        unmatched_db = db_df.join(med_df.select("Match_Key"), on="Match_Key", how="anti")
+        unmatched_med = med_df.join(db_df.select("Match_Key"), on="Match_Key", how="anti")
+        stage.rows_out = unmatched_db.height + unmatched_med.height
+
+    return combined, unmatched_db, unmatched_med
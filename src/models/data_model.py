@@ -1,60 +1,276 @@
+import io
 import logging
 import os
 import pandas as pd
-from tkinter import messagebox
+from cryptography.fernet import InvalidToken
 from app_crypto import Crypto
-import time
-import polars as pl
+from models.assignments import carry_forward_assignments
+from models.auto_assign import auto_assign, normalize_roster
+from models.caseload import compute_caseload
+from models.child_keys import build_child_keys, match_child
+from models.combine import match_frames
+from models.deferred import DeferredFrame
+from models.duplicate_clusters import assign_duplicate_groups, duplicate_group_count, duplicate_rows
+from models.errors import DataModelError
+from models.geo import ChildGeoIndex, load_zip_centroids
+from models.instrumentation import Instrumentation
+from models.persistence import BackgroundWriter
+from models.preload import RECENT_FILE, Preloader, read_combined_file, recent_combined_file, remember_recent
+from models.query import DOB_COLUMN, Contains, Near, QueryIndex, Range, Unassigned, combine, field_predicate
+from models.record_key import RECORD_KEY_COLUMNS
+from models.schema import apply_schema, set_category_value
+from models.statistics import compute_statistics
+from models.upsert import upsert_records
+
+# Files written next to each other in the model's output directory
+COMBINED_FILE = 'combined_matched_data.xlsx'
+UNMATCHED_FILE = 'unmatched_data.xlsx'
+DUPLICATES_FILE = 'duplicate_names.xlsx'
+# Every Fernet token starts with this (see is_file_encrypted)
+FERNET_PREFIX = b'gAAAAA'
+
+# Stages of combine_data as (span, progress message, relative cost) for the progress bar
+COMBINE_STAGES = [
+    ("normalize", "Normalizing names and dates", 20),
+    ("join", "Matching database and Medicaid records", 30),
+    ("unmatched", "Finding unmatched records", 10),
+    ("carry forward", "Carrying forward nurse assignments", 10),
+    ("dedupe", "Detecting duplicates", 25),
+    ("queue save", "Saving combined data", 5),
+]
+
 
 class DataModel:
     """
     Model for handling data logic: reading files, combining data, encryption, unmatched data, etc.
+
+    The model has no UI: operations that fail raise DataModelError with a
+    message for the user. The GUI uses controllers/gui_data_model.py, which
+    turns those errors into dialogs.
     """
 
-    def __init__(self):
+    def __init__(self, output_dir='', store=None, instrumentation=None):
+        """
+        Args:
+            output_dir: Directory for the combined file and its side files
+            store: Optional models.store.Store; nurse assignments are journaled to it
+            instrumentation: Instrumentation to record stage timings in (default: a new one
+                logging spans to $NURSEFILTER_SPAN_LOG if set)
+        """
+        self.output_dir = output_dir
+        self.store = store
         self.data_frames = []
+        # Times each stage of reading, combining and writing (see models/instrumentation.py)
+        self.instrumentation = instrumentation or Instrumentation(span_log=os.environ.get("NURSEFILTER_SPAN_LOG"))
+        self.writer = BackgroundWriter(self.instrumentation)
+        self.preloader = Preloader()
+        # Bumped on every change to combined_data; caches derived from it are keyed on it
+        self.version = 0
+        self._statistics = None
         self.combined_data = None
         self.unmatched_data = None
         self.duplicate_data = None
+        self.carry_forward_report = None
+        self._visit_log = None
+        self._caseload = None
         logging.info("DataModel initialized.")
 
+    # Every combined dataset is held in the canonical typed schema (see models/schema.py)
+    @property
+    def combined_data(self):
+        return self._combined
+
+    @combined_data.setter
+    def combined_data(self, df):
+        self._combined = apply_schema(df)
+        self._child_keys = None
+        self._geo_index = None
+        self._query_index = None
+        self.version += 1
+
+    @property
+    def child_keys(self):
+        """
+        Normalized Mother_ID / child name keys for the combined data, built once per dataset.
+        Kept outside combined_data so they never reach views or exported files.
+        """
+        if self._child_keys is None and self._combined is not None:
+            self._child_keys = build_child_keys(self._combined)
+        return self._child_keys
+
+    @property
+    def geo_index(self):
+        """
+        Spatial index of the combined data's children by ZIP centroid, built once per dataset
+        (assignments don't move children). None when no ZIP centroid table is available.
+        """
+        if self._geo_index is None and self._combined is not None:
+            centroids = load_zip_centroids()
+            if len(centroids):
+                self._geo_index = ChildGeoIndex(self._combined, centroids)
+        return self._geo_index
+
+    @property
+    def query_index(self):
+        """Cached per-column lookup structures for queries over the combined data (see models/query.py)."""
+        if self._query_index is None and self._combined is not None:
+            self._query_index = QueryIndex(self._combined, geo_index=lambda: self.geo_index)
+        return self._query_index
+
+    def query(self, predicate):
+        """
+        Return the combined rows matching a predicate, e.g.
+        model.query(Eq('City', 'Provo') & AgeRange(max_years=1) & Unassigned()).
+        """
+        if self.combined_data is None:
+            return None
+        return self.query_index.filter(predicate)
+
+    def search(self, text):
+        """Return the combined rows where any column contains text (case-insensitive)."""
+        if self.combined_data is None or not str(text).strip():
+            return self.combined_data
+        return self.query(Contains(str(text).strip()))
+
+    def children_near(self, zipcode, miles):
+        """
+        Return the combined rows of children living within miles of a ZIP code.
+
+        Returns:
+            DataFrame (empty when the ZIP or the centroid table is unknown)
+        """
+        index = self.geo_index
+        if index is None:
+            return self.combined_data.iloc[0:0] if self.combined_data is not None else None
+        return self.combined_data.iloc[index.within(zipcode, miles)[0]]
+
+    # Unmatched and duplicate data are built on first access (see combine_data)
+    @property
+    def unmatched_data(self):
+        """
+        Raises:
+            DataModelError: If building the unmatched dataset fails
+        """
+        return self._materialize(self._unmatched)
+
+    @unmatched_data.setter
+    def unmatched_data(self, df):
+        self._unmatched = DeferredFrame(value=df, name="unmatched data")
+
+    @property
+    def duplicate_data(self):
+        """
+        Raises:
+            DataModelError: If building the duplicate dataset fails
+        """
+        return self._materialize(self._duplicates)
+
+    @duplicate_data.setter
+    def duplicate_data(self, df):
+        self._duplicates = DeferredFrame(value=df, name="duplicate data")
+
+    @staticmethod
+    def _materialize(deferred):
+        try:
+            return deferred.get()
+        except DataModelError:
+            raise
+        except Exception as e:
+            raise DataModelError(f"Error building {deferred.name}: {e}") from e
+
+    @property
+    def unmatched_count(self):
+        """Number of unmatched records, without building the unmatched dataset if it is known."""
+        count = self._unmatched.count()
+        if count is None:
+            df = self.unmatched_data
+            count = len(df) if isinstance(df, pd.DataFrame) else 0
+        return count
+
+    def output_path(self, name):
+        return os.path.join(self.output_dir, name)
+
     # Encryption
     def is_file_encrypted(self, filepath, logging=True):
+        if self._key() is None:
+            # Without a key, tell Fernet tokens (base64 of version byte 0x80) by their prefix
+            with open(filepath, 'rb') as f:
+                return f.read(len(FERNET_PREFIX)) == FERNET_PREFIX
         return Crypto.is_encrypted(filepath, logging)
 
+    def _key(self):
+        """The Fernet key from key.txt, or None if there is no key."""
+        return Crypto.loadKey() if os.path.exists("key.txt") else None
+
+    def _decrypted_bytes(self, filepath):
+        """
+        Return the contents of a file, decrypted in memory if it is encrypted.
+        The file on disk is left as it is.
+
+        Raises:
+            DataModelError: If the file is encrypted and there is no key or it does not decrypt
+        """
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        key = self._key()
+        if key is None and self.is_file_encrypted(filepath, logging=False):
+            raise DataModelError("Key does not exist", title="Error!", severity="warning")
+        if key is None or not data.startswith(FERNET_PREFIX):
+            return data
+        try:
+            with self.instrumentation.span("decrypt"):
+                return Crypto.decrypt_data(data, key)
+        except InvalidToken as e:
+            raise DataModelError(
+                f"Error decrypting '{filepath}': it was encrypted with a different key or is damaged.") from e
+
     def decrypt_file(self, filepath):
+        """
+        Decrypt a file in place with key.txt.
+
+        Raises:
+            DataModelError: If there is no key or decryption fails
+        """
+        if not os.path.exists("key.txt"):
+            raise DataModelError("Key does not exist", title="Error!", severity="warning")
         try:
-            if not os.path.exists("key.txt"):
-                messagebox.showwarning("Error!", "Key does not exist")
-                return False
-            key = Crypto.loadKey()
-            Crypto.decrypt_file(filepath, key)
-            logging.info("File decrypted successfully.")
-            return True
+            with self.instrumentation.span("decrypt"):
+                key = Crypto.loadKey()
+                Crypto.decrypt_file(filepath, key)
         except Exception as e:
             logging.error(f"Error decrypting file: {e}")
-            messagebox.showerror("Error", f"Error decrypting file: {e}")
-            return False
+            raise DataModelError(f"Error decrypting file: {e}") from e
+        logging.info("File decrypted successfully.")
+        return True
 
     def encrypt_file(self, filepath):
+        """
+        Encrypt a file in place with key.txt once pending writes to it have landed.
+
+        Returns:
+            True if the file was encrypted, False if it is missing or already encrypted
+
+        Raises:
+            DataModelError: If there is no key or encryption fails
+        """
+        self.writer.flush()
+        if not os.path.exists("key.txt"):
+            raise DataModelError("Key does not exist", title="Error!", severity="warning")
+        if not os.path.exists(filepath):
+            logging.warning(f"Filepath '{filepath}' does not exist; cannot encrypt.")
+            return False
         try:
-            if not os.path.exists("key.txt"):
-                messagebox.showwarning("Error!", "Key does not exist")
-                return False
-            if not os.path.exists(filepath):
-                logging.warning(f"Filepath '{filepath}' does not exist; cannot encrypt.")
-                return False
             if self.is_file_encrypted(filepath, logging=False):
                 logging.warning(f"File '{filepath}' is already encrypted.")
                 return False
-            key = Crypto.loadKey()
-            Crypto.encrypt_file(filepath, key)
-            logging.info("File encrypted successfully.")
-            return True
+            with self.instrumentation.span("encrypt"):
+                key = Crypto.loadKey()
+                Crypto.encrypt_file(filepath, key)
         except Exception as e:
             logging.error(f"Error encrypting file: {e}")
-            messagebox.showerror("Error", f"Error encrypting file: {e}")
-            return False
+            raise DataModelError(f"Error encrypting file: {e}") from e
+        logging.info("File encrypted successfully.")
+        return True
 
     # Reading & Combining
     def read_excel_file(self, filepath, progress_callback=None, file_type=None):
@@ -67,7 +283,10 @@ class DataModel:
             file_type: Type of file being read ("Database" or "Medicaid")
             
         Returns:
-            The pandas DataFrame if successful, None otherwise
+            The pandas DataFrame
+
+        Raises:
+            DataModelError: If the file is missing or cannot be decrypted or read
         """
         try:
             # Report initial progress
@@ -78,7 +297,7 @@ class DataModel:
             if not os.path.exists(filepath):
                 if progress_callback:
                     progress_callback("File not found", 100)
-                return None
+                raise DataModelError(f"File not found: {filepath}")
                 
             # Check file size and handle large files
             file_size = os.path.getsize(filepath)
@@ -86,19 +305,19 @@ class DataModel:
                 if progress_callback:
                     progress_callback("Reading large file", 20)
                     
-            # Check and decrypt if needed
-            if self.is_file_encrypted(filepath, logging=False):
-                if progress_callback:
-                    progress_callback("Decrypting file", 30)
-                if not self.decrypt_file(filepath):
-                    return None
+            # Decrypt in memory if needed; the file on disk stays encrypted
+            if progress_callback:
+                progress_callback("Decrypting file", 30)
+            content = self._decrypted_bytes(filepath)
                     
             # Report progress before reading
             if progress_callback:
                 progress_callback("Reading data", 40)
                 
             # Read the Excel file
-            data = pd.read_excel(filepath, engine='openpyxl')
+            with self.instrumentation.span("read") as stage:
+                data = pd.read_excel(io.BytesIO(content), engine='openpyxl')
+                stage.rows_out = len(data)
             
             # Report progress after reading
             if progress_callback:
@@ -121,7 +340,9 @@ class DataModel:
                 
             logging.info(f"Data read from {filepath} as {self.file_types[-1]} file")
             return data
-            
+
+        except DataModelError:
+            raise
         except Exception as e:
             logging.error(f"Error reading '{filepath}': {e}")
             
@@ -129,143 +350,181 @@ class DataModel:
             if progress_callback:
                 progress_callback("Error reading file", 100)
                 
-            messagebox.showerror("Error", f"Error reading file")
-            return None
+            raise DataModelError(f"Error reading file: {e}") from e
 
-    def combine_data(self):
-        start_time = time.time()
+    def combine_data(self, progress_callback=None):
+        """
+        Match the two loaded files (see models/combine.py) and make the result the combined data.
 
+        Args:
+            progress_callback: Optional callback(message, percent), called as each stage starts
+
+        Returns:
+            True
+
+        Raises:
+            DataModelError: If fewer than two files are loaded or matching fails
+        """
         if len(self.data_frames) < 2:
-            messagebox.showerror("Error", "Please load two Excel files before combining data.")
-            return False
+            raise DataModelError("Please load two Excel files before combining data.")
+
+        span = self.instrumentation.span
+        with self.instrumentation.tracking(progress_callback, COMBINE_STAGES), \
+                span("combine", rows_in=len(self.data_frames[0]) + len(self.data_frames[1])) as total:
+            try:
+                combined_df, unmatched_db, unmatched_med = match_frames(self.data_frames[0], self.data_frames[1], span)
+
+                # Re-attach nurse assignments made on the previous combined dataset
+                with span("carry forward", rows_in=len(combined_df)):
+                    combined_df, self.carry_forward_report = carry_forward_assignments(
+                        combined_df, self._previous_assignments())
+
+                # Cluster exact and near-duplicate records; only the group count is kept for now
+                with span("dedupe", rows_in=len(combined_df)) as stage:
+                    group_ids, group_sizes = assign_duplicate_groups(combined_df)
+                    stage.rows_out = int(group_ids.max()) if len(group_ids) else 0
+            except DataModelError:
+                raise
+            except Exception as e:
+                logging.error(f"Error combining data with Polars: {e}")
+                raise DataModelError(f"Error combining data: {e}") from e
+
+            # Side files from an earlier combine no longer describe this dataset; a queued
+            # write of one must land before it is removed, or it would bring it back
+            self.writer.flush()
+            for stale in (self.output_path(UNMATCHED_FILE), self.output_path(DUPLICATES_FILE)):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+            # Hand the frame to the views now; the workbook is written in the background
+            with span("queue save", rows_in=len(combined_df)):
+                self.combined_data = combined_df
+                self.save_combined_data()
+            version = self.version
+
+            # The loader reads the (typed) combined data when it runs, so no second copy is kept
+            self._duplicates = DeferredFrame(
+                loader=lambda: self._build_duplicate_data(group_ids, group_sizes, version),
+                count=int(group_ids.max()) if len(group_ids) else 0,
+                name="duplicate data")
+
+            # Unmatched counts are known now; pandas frames are built when first viewed
+            self._unmatched = DeferredFrame(
+                loader=lambda: self._build_unmatched_data(unmatched_db, unmatched_med),
+                count=unmatched_db.height + unmatched_med.height,
+                name="unmatched data")
+            remember_recent(self.output_path(COMBINED_FILE), self.output_path(RECENT_FILE))
+            total.rows_out = len(combined_df)
 
-        try:
-            # Convert to Polars
-            db_df = pl.from_pandas(self.data_frames[0].copy())
-            med_df = pl.from_pandas(self.data_frames[1].copy())
-
-            # Rename columns for consistency
-            if "DOB" in db_df.columns:
-                db_df = db_df.rename({"DOB": "Child_Date_of_Birth"})
-            if "Child_DOB" in med_df.columns:
-                med_df = med_df.rename({"Child_DOB": "Child_Date_of_Birth"})
-            if "Last_Name" in med_df.columns:
-                med_df = med_df.rename({"Last_Name": "Mother_Last_Name"})
-
-            # Normalize + generate Match_Key
-            def normalize(df):
-                return df.with_columns([
-                    pl.col("Mother_First_Name").cast(pl.Utf8).str.to_lowercase().str.replace_all(r"\W", ""),
-                    pl.col("Mother_Last_Name").cast(pl.Utf8).str.to_lowercase().str.replace_all(r"\W", ""),
-                    pl.col("Child_Date_of_Birth").cast(pl.Utf8).str.strip_chars().str.strptime(pl.Date, "%Y-%m-%d", strict=False).cast(pl.Utf8),
-                ]).with_columns([
-                    (pl.col("Mother_First_Name") + "_" +
-                    pl.col("Mother_Last_Name") + "_" +
-                    pl.col("Child_Date_of_Birth")).alias("Match_Key")
-                ])
-
-            db_df = normalize(db_df)
-            med_df = normalize(med_df)
-
-            # Join on Match_Key using Polars
-            combined = db_df.join(med_df, on="Match_Key", how="inner", suffix="_medicaid")
-
-            # Drop duplicate `_medicaid` columns
-            for col in ["Mother_First_Name", "Mother_Last_Name", "Child_Date_of_Birth"]:
-                if f"{col}_medicaid" in combined.columns:
-                    combined = combined.drop(f"{col}_medicaid")
-
-            # Add Assigned_Nurse if missing
-            if "Assigned_Nurse" not in combined.columns:
-                combined = combined.with_columns(pl.lit("None").alias("Assigned_Nurse"))
-
-            # Capitalize child names
-            for col in ["Mother_First_Name", "Mother_Last_Name", "Child_First_Name", "Child_Last_Name"]:
-                if col in combined.columns:
-                    combined = combined.with_columns(pl.col(col).str.to_titlecase())
-
-            # Convert back to Pandas
-            combined_df = combined.drop("Match_Key").to_pandas()
-
-            # Detect duplicates with Pandas
-            duplicate_df = combined_df[combined_df.duplicated(
-                subset=["Mother_ID", "Child_First_Name", "Child_Last_Name"], keep=False)].copy()
-            if not duplicate_df.empty:
-                duplicate_df.to_excel("duplicate_names.xlsx", index=False)
-                self.duplicate_data = duplicate_df
-            else:
-                self.duplicate_data = pd.DataFrame()
-
-            # Detect unmatched records using hash key
-            db_df_pd = db_df.to_pandas()
-            med_df_pd = med_df.to_pandas()
-            combined_keys = set(combined_df["Mother_First_Name"].str.lower().str.replace(r'\W', '', regex=True) + "_" +
-                                combined_df["Mother_Last_Name"].str.lower().str.replace(r'\W', '', regex=True) + "_" +
-                                combined_df["Child_Date_of_Birth"])
-
-            unmatched_db = db_df_pd[~db_df_pd["Match_Key"].isin(combined_keys)].copy()
-            unmatched_db["Source"] = "Database"
-
-            unmatched_med = med_df_pd[~med_df_pd["Match_Key"].isin(combined_keys)].copy()
-            unmatched_med["Source"] = "Medicaid"
-
-            unmatched = pd.concat([unmatched_db, unmatched_med], ignore_index=True) if not unmatched_db.empty or not unmatched_med.empty else pd.DataFrame()
-            if not unmatched.empty:
-                for col in ['Mother_First_Name', 'Mother_Last_Name', 'Child_First_Name', 'Child_Last_Name']:
-                    if col in unmatched.columns:
-                        unmatched[col] = unmatched[col].astype(str).str.capitalize()
-                unmatched.to_excel("unmatched_data.xlsx", index=False)
-            self.unmatched_data = unmatched
-
-            # Save and assign
-            combined_df.to_excel("combined_matched_data.xlsx", index=False)
-            self.combined_data = combined_df
-
-            print(f"Polars + Pandas combine_data execution time: {time.time() - start_time:.4f} sec")
-            return True
+        if progress_callback:
+            progress_callback("Data combined", 100)
+        return True
 
-        except Exception as e:
-            logging.error(f"Error combining data with Polars: {e}")
-            messagebox.showerror("Error", f"Error combining data: {e}")
-            return False
+    def _build_duplicate_data(self, group_ids, group_sizes, version):
+        """
+        Build and save the duplicate dataset from group assignments computed
+        when the combined data was at version.
+        """
+        combined_df = self.combined_data
+        if self.version != version:
+            # The data changed since the combine (e.g. rows were merged in); the groups may not line up
+            group_ids, group_sizes = assign_duplicate_groups(combined_df)
+        if not (group_ids > 0).any():
+            return pd.DataFrame()
+        duplicate_df = duplicate_rows(combined_df, group_ids, group_sizes)
+        self.writer.submit(duplicate_df, self.output_path(DUPLICATES_FILE))
+        return duplicate_df
+
+    def _build_unmatched_data(self, unmatched_db, unmatched_med):
+        """Build and save the unmatched dataset from the filtered Polars frames."""
+        if unmatched_db.is_empty() and unmatched_med.is_empty():
+            return pd.DataFrame()
+        unmatched_db = unmatched_db.to_pandas()
+        unmatched_db["Source"] = "Database"
+        unmatched_med = unmatched_med.to_pandas()
+        unmatched_med["Source"] = "Medicaid"
+
+        unmatched = pd.concat([unmatched_db, unmatched_med], ignore_index=True)
+        for col in ['Mother_First_Name', 'Mother_Last_Name', 'Child_First_Name', 'Child_Last_Name']:
+            if col in unmatched.columns:
+                unmatched[col] = unmatched[col].astype(str).str.capitalize()
+        self.writer.submit(unmatched, self.output_path(UNMATCHED_FILE))
+        return unmatched
+
+    def _read_side_file(self, path):
+        """Defer reading a supplementary Excel file until its data is first needed."""
+        def loader():
+            self.writer.flush()
+            return pd.read_excel(path) if os.path.exists(path) else pd.DataFrame()
+        return DeferredFrame(loader=loader, name=path)
+
+    def _previous_assignments(self, filepath=None):
+        """
+        Return the previous combined dataset so its nurse assignments can be carried forward.
+        Prefers the dataset in memory and falls back to the last saved combined file,
+        which is decrypted in memory.
 
+        Returns:
+            DataFrame, or None if there is no previous dataset
 
-    def load_combined_data(self, filepath='combined_matched_data.xlsx', progress_callback=None):
-        """Load the combined data from the saved Excel file.
+        Raises:
+            DataModelError: If the saved file exists but cannot be read; combining
+                anyway would overwrite it with every nurse unassigned
+        """
+        if self.combined_data is not None and not self.combined_data.empty:
+            return self.combined_data
+        filepath = filepath or self.output_path(COMBINED_FILE)
+        self.writer.flush()
+        if not os.path.exists(filepath):
+            return None
+        try:
+            wanted = set(RECORD_KEY_COLUMNS + ["Assigned_Nurse"])
+            return pd.read_excel(io.BytesIO(self._decrypted_bytes(filepath)), usecols=lambda c: c in wanted)
+        except Exception as e:
+            reason = e.message if isinstance(e, DataModelError) else e
+            logging.error(f"Could not read previous assignments from '{filepath}': {reason}")
+            raise DataModelError(
+                f"Could not read the nurse assignments saved in '{filepath}': {reason}\n\n"
+                "Combining now would replace them, so nothing was changed.") from e
+
+    def load_combined_data(self, filepath=None, progress_callback=None):
+        """Load the combined data from the saved Excel file, decrypting it in memory.
         
         Args:
             progress_callback: Optional callback for progress updates
             
         Returns:
-            True if successful, False otherwise
+            True
+
+        Raises:
+            DataModelError: If the file is missing or cannot be decrypted or read
         """
-        path = filepath
+        path = filepath or self.output_path(COMBINED_FILE)
         
         # Initial progress
         if progress_callback:
             progress_callback("Checking file", 10)
+
+        # Make sure a queued save of this file has landed before reading it
+        self.writer.flush()
             
         if not os.path.exists(path):
             if progress_callback:
                 progress_callback("File not found", 100)
-            messagebox.showerror("Error", "No combined data file found. Please combine data first.")
-            return False
+            raise DataModelError("No combined data file found. Please combine data first.")
 
         try:
-            # Check encryption
-            if progress_callback:
-                progress_callback("Checking encryption", 20)
-                
-            if self.is_file_encrypted(path):
-                if progress_callback:
-                    progress_callback("Decrypting file", 30)
-                self.decrypt_file(path)
+            # Usually read already, in the background after login
+            df = self.preloader.take(path)
 
-            # Read data
+            # Read data, decrypting it in memory; the file on disk stays encrypted
             if progress_callback:
                 progress_callback("Reading data", 40)
-                
-            df = pd.read_excel(path)
+
+            if df is None:
+                with self.instrumentation.span("read") as stage:
+                    df = read_combined_file(path, self._key())
+                    stage.rows_out = len(df)
 
             # Process data
             if progress_callback:
@@ -281,17 +540,9 @@ class DataModel:
             if progress_callback:
                 progress_callback("Loading additional files", 80)
                 
-            unmatched_path = 'unmatched_data.xlsx'
-            if os.path.exists(unmatched_path):
-                self.unmatched_data = pd.read_excel(unmatched_path)
-            else:
-                self.unmatched_data = pd.DataFrame()
-
-            duplicate_path = 'duplicate_names.xlsx'
-            if os.path.exists(duplicate_path):
-                self.duplicate_data = pd.read_excel(duplicate_path)
-            else:
-                self.duplicate_data = pd.DataFrame()
+            self._unmatched = self._read_side_file(self.output_path(UNMATCHED_FILE))
+            self._duplicates = self._read_side_file(self.output_path(DUPLICATES_FILE))
+            remember_recent(path, self.output_path(RECENT_FILE))
 
             # Complete
             if progress_callback:
@@ -305,77 +556,276 @@ class DataModel:
             # Report error
             if progress_callback:
                 progress_callback("Error loading data", 100)
-                
-            messagebox.showerror("Error", "Failed to load combined data")
+
+            if isinstance(e, DataModelError):
+                raise
+            raise DataModelError("Failed to load combined data") from e
+
+    def preload_combined_data(self, filepath=None):
+        """
+        Start reading the most recently used combined file on a background thread,
+        so that loading it afterwards does not have to wait for Excel parsing.
+
+        Args:
+            filepath: File to preload (default: the most recently used one)
+
+        Returns:
+            True if a preload was started, False if there is no file to preload
+        """
+        path = filepath or recent_combined_file(self.output_path(COMBINED_FILE), self.output_path(RECENT_FILE))
+        self.writer.flush()
+        if not os.path.exists(path):
             return False
+        self.preloader.start(path, self._key())
+        return True
+
+    def save_combined_data(self, filepath=None):
+        """Queue the current combined data to be written to disk on the background writer."""
+        if self.combined_data is not None:
+            self.writer.submit(self.combined_data, filepath or self.output_path(COMBINED_FILE))
+
+    def flush_writes(self):
+        """Block until all queued file writes have finished."""
+        self.writer.flush()
+
+    def upsert_combined_data(self, new_data, prefer="incoming"):
+        """
+        Merge previously combined rows into the current dataset without duplicating records.
+
+        Args:
+            new_data: DataFrame of combined rows from an earlier session
+            prefer: Which side wins for records present in both ("incoming" or "existing")
+
+        Returns:
+            Dict with 'inserted', 'updated' and 'unchanged' counts
+        """
+        merged, report = upsert_records(self.combined_data, apply_schema(new_data), prefer=prefer)
+        self.combined_data = merged
+        self.save_combined_data()
+        return report
+
+    def statistics(self):
+        """Return report statistics for the combined data, recomputed only when the data changed."""
+        if self._statistics is None or self._statistics[0] != self.version:
+            self._statistics = (self.version, compute_statistics(self.combined_data))
+        return self._statistics[1]
+
+    def duplicate_group_count(self):
+        """Return the number of duplicate groups, without building the duplicate dataset if it is known."""
+        count = self._duplicates.count()
+        if count is None:
+            df = self.duplicate_data
+            count = duplicate_group_count(df) if isinstance(df, pd.DataFrame) else 0
+        return count
 
     # Nurse assignment
-    def update_child_assigned_nurse(self, child_data, nurse_name):
+    def locate_child(self, child_data):
+        """
+        Return the index labels of combined rows matching a child record.
+
+        Args:
+            child_data: Mapping with Mother_ID, child first/last name and DOB
+
+        Returns:
+            pandas Index (empty if there is no combined data or no match)
+        """
+        df = self.combined_data
+        if df is None or df.empty:
+            return pd.Index([])
+        dob = pd.to_datetime(child_data.get('Child_Date_of_Birth'), errors='coerce')
+        mask = match_child(self.child_keys, child_data) & (df['Child_Date_of_Birth'] == dob).to_numpy(dtype=bool)
+        return df.index[mask]
+
+    def assign_nurse(self, rows, nurse_name, save=True):
+        """
+        Set the assigned nurse on the given rows of the combined data.
+
+        Args:
+            rows: Index labels or boolean mask selecting the rows
+            nurse_name: Nurse to assign
+            save: Queue a save of the combined file afterwards
+        """
+        previous = self.combined_data.loc[rows, 'Assigned_Nurse'].copy()
+        self._journal(rows, nurse_name)
+        set_category_value(self.combined_data, rows, 'Assigned_Nurse', nurse_name)
+        self.version += 1
+        if self._query_index is not None:
+            self._query_index.invalidate('Assigned_Nurse')
+        # Keep cached statistics current instead of recomputing them on the next report
+        if self._statistics is not None and self._statistics[0] == self.version - 1:
+            stats = self._statistics[1]
+            stats.apply_assignment(previous, nurse_name)
+            self._statistics = (self.version, stats)
+        if save:
+            self.save_combined_data()
+
+    def _journal(self, rows, nurses):
+        """Record assignments (made to the rows' current values) in the store's journal."""
+        if self.store is None:
+            return
+        try:
+            self.store.journal_assignments(self.combined_data.loc[rows], nurses)
+        except Exception as e:
+            logging.error(f"Could not journal nurse assignments: {e}")
+
+    def assign_nurses(self, assignments):
+        """
+        Write many nurse assignments at once.
+
+        Args:
+            assignments: Series of nurse names indexed by combined data row labels
+
+        Returns:
+            Number of rows assigned
+        """
+        if assignments.empty:
+            return 0
+        df = self.combined_data
+        column = df['Assigned_Nurse']
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            new = pd.Index(assignments.unique()).difference(column.cat.categories)
+            if len(new):
+                df['Assigned_Nurse'] = column.cat.add_categories(new)
+        self._journal(assignments.index, assignments.to_numpy())
+        df.loc[assignments.index, 'Assigned_Nurse'] = assignments.to_numpy()
+        self.version += 1
+        if self._query_index is not None:
+            self._query_index.invalidate('Assigned_Nurse')
+        self.save_combined_data()
+        return len(assignments)
+
+    def auto_assign_nurses(self, roster):
+        """
+        Distribute unassigned children across a nurse roster (see models/auto_assign.py)
+        and write the result in one batch.
+
+        Args:
+            roster: Roster DataFrame with nurse names, capacities and home ZIPs
+
+        Returns:
+            Report dict with 'assigned', 'unplaced', 'by_tier' and 'max_load'
+        """
         if self.combined_data is None or self.combined_data.empty:
-            return False
-        mother_id = child_data.get('Mother_ID')
-        fn = child_data.get('Child_First_Name','')
-        ln = child_data.get('Child_Last_Name','')
-        dob = child_data.get('Child_Date_of_Birth','')
-
-        matches = self.combined_data[
-            (self.combined_data['Mother_ID'].astype(str) == str(mother_id)) &
-            (self.combined_data['Child_First_Name'].str.lower() == fn.lower()) &
-            (self.combined_data['Child_Last_Name'].str.lower() == ln.lower()) &
-            (self.combined_data['Child_Date_of_Birth'] == dob)
-        ]
+            return {"assigned": 0, "unplaced": 0, "by_tier": {}, "max_load": 0}
+        centroids = load_zip_centroids()
+        if not len(centroids):
+            logging.warning("No ZIP centroids; the 'nearby' auto-assign tier is skipped.")
+        assignments, report = auto_assign(self.combined_data, normalize_roster(roster), centroids=centroids)
+        self.assign_nurses(assignments)
+        return report
+
+    def update_child_assigned_nurse(self, child_data, nurse_name):
+        matches = self.locate_child(child_data)
         if matches.empty:
             return False
 
-        idx = matches.index[0]
-        self.combined_data.at[idx, 'Assigned_Nurse'] = nurse_name
-        self.combined_data.to_excel('combined_matched_data.xlsx', index=False)
+        self.assign_nurse(matches[:1], nurse_name)
         return True
 
-    def batch_update_nurses(self, nurse_name, city, state, zipcode):
+    def assign_matching(self, predicate, nurse_name):
+        """
+        Assign a nurse to every child matching a predicate.
+
+        Returns:
+            Number of children assigned
+        """
         if self.combined_data is None or self.combined_data.empty:
             return 0
-
-        df = self.combined_data
-        def match_filter(row):
-            c_ok = (not city) or (str(row.get('City','')).lower() == city.lower())
-            s_ok = (not state) or (str(row.get('State','')).lower() == state.lower())
-            z_ok = (not zipcode) or (str(row.get('ZIP','')) == zipcode)
-            return c_ok and s_ok and z_ok
-
-        mask = df.apply(match_filter, axis=1)
-        count = mask.sum()
+        mask = predicate.mask(self.query_index)
+        count = int(mask.sum())
         if count == 0:
             return 0
-
-        self.combined_data.loc[mask, 'Assigned_Nurse'] = nurse_name
-        self.combined_data.to_excel('combined_matched_data.xlsx', index=False)
+        logging.info(f"Assigning '{nurse_name}' to {count} children matching {predicate!r}.")
+        self.assign_nurse(mask, nurse_name)
         return count
 
+    def batch_update_nurses(self, nurse_name, city, state, zipcode, radius_miles=None,
+                            born_from=None, born_to=None, unassigned_only=False, match_any=False):
+        """
+        Assign a nurse to every child matching the batch-assign filters.
+
+        City/State/ZIP take a value, a comma-separated list or a "prefix*"
+        (see field_predicate). With radius_miles, the ZIP filter matches every
+        child living within that distance of the ZIP instead of the ZIP itself.
+
+        Args:
+            born_from, born_to: Inclusive date of birth bounds
+            unassigned_only: Leave children who already have a nurse alone
+            match_any: Match children meeting any filter rather than all of them
+
+        Returns:
+            Number of children assigned
+
+        Raises:
+            DataModelError: If radius_miles is given but there is no ZIP centroid table
+        """
+        zip_filter = Near(zipcode, radius_miles) if zipcode and radius_miles else field_predicate('ZIP', zipcode)
+        dob_filter = Range(DOB_COLUMN, born_from or None, born_to or None) if born_from or born_to else None
+        predicate = combine([field_predicate('City', city), field_predicate('State', state), zip_filter, dob_filter], match_any)
+        if unassigned_only:
+            predicate = predicate & Unassigned()
+        return self.assign_matching(predicate, nurse_name)
+
     def find_child_in_combined(self, full_name, dob):
         if self.combined_data is None:
             return None
         parts = full_name.split()
         if len(parts) < 2:
             return None
-        fn, ln = parts[0], parts[1]
-        row = self.combined_data[
-            (self.combined_data['Child_First_Name'].str.lower() == fn.lower()) &
-            (self.combined_data['Child_Last_Name'].str.lower() == ln.lower()) &
-            (self.combined_data['Child_Date_of_Birth'] == dob)
-        ]
+        df = self.combined_data
+        child = {'Child_First_Name': parts[0], 'Child_Last_Name': parts[1]}
+        mask = match_child(self.child_keys, child, fields=('first', 'last'))
+        mask &= (df['Child_Date_of_Birth'] == pd.to_datetime(dob, errors='coerce')).to_numpy(dtype=bool)
+        row = df[mask]
         if row.empty:
             return None
         return row.iloc[0]
     
+    def _read_visit_log(self, path='nurse_log.xlsx'):
+        """
+        Return (log, keys) for the nurse visit log, or (None, None) if there is no log.
+
+        The log and its normalized child keys are cached until the file changes,
+        so opening several profiles does not re-read and re-fold the whole log.
+        """
+        if not os.path.exists(path):
+            return None, None
+        stat = os.stat(path)
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        if self._visit_log is None or self._visit_log[0] != stamp:
+            log = pd.read_excel(path)
+            self._visit_log = (stamp, log, build_child_keys(log))
+        return self._visit_log[1], self._visit_log[2]
+
+    def visit_log_for(self, child_data, path='nurse_log.xlsx'):
+        """Return the nurse visit log rows recorded for a child."""
+        log, keys = self._read_visit_log(path)
+        if log is None:
+            return pd.DataFrame()
+        return log[match_child(keys, child_data)]
+
+    def caseload(self, path='nurse_log.xlsx'):
+        """
+        Return per-nurse caseload analytics (see models/caseload.py).
+        Cached until the combined data or the visit log changes.
+        """
+        log, keys = self._read_visit_log(path)
+        stamp = (self.version, self._visit_log[0] if log is not None else None)
+        if self._caseload is None or self._caseload[0] != stamp:
+            self._caseload = (stamp, compute_caseload(self.combined_data, log, keys))
+        return self._caseload[1]
+
     def updated_data(self):
         """
-        Return the current state of the combined data and unmatched data DataFrames.
+        Reload the combined data (and its side files) from disk and return it.
+
+        Raises:
+            DataModelError: If the file is missing or cannot be read
         """
-        path = 'combined_matched_data.xlsx'
+        path = self.output_path(COMBINED_FILE)
+        self.writer.flush()
         if not os.path.exists(path):
-            messagebox.showerror("Error", "No combined data file found. Cannot Refresh")
-            return False
+            raise DataModelError("No combined data file found. Cannot Refresh")
         
         try:
 
@@ -387,20 +837,10 @@ class DataModel:
 
             self.combined_data = df
 
-            unmatched_path = 'unmatched_data.xlsx'
-            if os.path.exists(unmatched_path):
-                self.unmatched_data = pd.read_excel(unmatched_path)
-            else:
-                self.unmatched_data = pd.DataFrame()
-
-            duplicate_path = 'duplicate_names.xlsx'
-            if os.path.exists(duplicate_path):
-                self.duplicate_data = pd.read_excel(duplicate_path)
-            else:
-                self.duplicate_data = pd.DataFrame()
+            self._unmatched = self._read_side_file(self.output_path(UNMATCHED_FILE))
+            self._duplicates = self._read_side_file(self.output_path(DUPLICATES_FILE))
 
             return self.combined_data
         
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to refresh combined data: {e}")
-            return None
+            raise DataModelError(f"Failed to refresh combined data: {e}") from e
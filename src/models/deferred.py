@@ -0,0 +1,41 @@
+import logging
+
+
+class DeferredFrame:
+    """
+    A DataFrame that is only built when first asked for.
+
+    Holds either a ready value or a loader callable. The loader runs at most
+    once; its result is cached. A count can be supplied up front so callers
+    that only need the size (e.g. badges) never trigger the load.
+    """
+
+    def __init__(self, value=None, loader=None, count=None, name="data"):
+        self._value = value
+        self._loader = loader
+        self._count = count
+        self.name = name
+
+    @property
+    def is_loaded(self):
+        return self._loader is None
+
+    def get(self):
+        """
+        Return the frame, running the loader on first access.
+
+        A loader that fails raises its error and is kept, so the next call tries again.
+        """
+        if self._loader is not None:
+            logging.info(f"Materializing deferred {self.name}.")
+            try:
+                self._value = self._loader()
+            except Exception as e:
+                logging.error(f"Error materializing {self.name}: {e}")
+                raise
+            self._loader = None
+        return self._value
+
+    def count(self, default=None):
+        """Return the known count, or default if it has not been computed."""
+        return self._count if self._count is not None else default
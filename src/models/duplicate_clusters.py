@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+from models.record_key import normalize_date, normalize_id, normalize_name
+
+# Each entry is a list of normalized fields; rows agreeing on every field of any
+# one entry are linked, and linked rows are merged transitively into a group.
+#   exact:   the original (Mother_ID, child first, child last) criterion
+#   swapped: same mother and DOB with first/last name swapped
+#   id_typo: same child and DOB recorded under a different Mother_ID
+DUPLICATE_KEYS = {
+    "exact": ["mother_id", "first", "last"],
+    "swapped": ["mother_id", "dob", "name_pair"],
+    "id_typo": ["first", "last", "dob"],
+}
+
+
+def _normalized_fields(df):
+    """Normalize the columns used by DUPLICATE_KEYS once per call."""
+    first = normalize_name(df["Child_First_Name"])
+    last = normalize_name(df["Child_Last_Name"])
+    name_pair = first.where(first < last, last) + "|" + last.where(first < last, first)
+    fields = {
+        "mother_id": normalize_id(df["Mother_ID"]),
+        "first": first,
+        "last": last,
+        "name_pair": name_pair.mask((first == "") | (last == ""), ""),
+    }
+    if "Child_Date_of_Birth" in df.columns:
+        fields["dob"] = normalize_date(df["Child_Date_of_Birth"])
+    return fields
+
+
+def _key_edges(parts):
+    """
+    Link every row to the first row sharing its key.
+    Rows with a blank component never match anything.
+    """
+    key = parts[0]
+    blank = parts[0] == ""
+    for part in parts[1:]:
+        key = key + "|" + part
+        blank |= part == ""
+    codes = pd.factorize(key)[0]
+    rows = np.flatnonzero(~blank.to_numpy())
+    if rows.size == 0:
+        return rows, rows
+    codes = codes[rows]
+    order = np.argsort(codes, kind="stable")
+    rows, codes = rows[order], codes[order]
+    starts = np.r_[True, codes[1:] != codes[:-1]]
+    firsts = rows[starts][np.cumsum(starts) - 1]
+    linked = rows != firsts
+    return rows[linked], firsts[linked]
+
+
+def _compress(parent):
+    """Point every node straight at its root (vectorized path compression)."""
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def _union_find(n, left, right):
+    """
+    Vectorized union-find over an edge list.
+    Roots are always hooked under the smaller index, so no cycles can form;
+    rounds repeat until both ends of every edge share a root.
+    """
+    parent = np.arange(n)
+    while True:
+        parent = _compress(parent)
+        a, b = parent[left], parent[right]
+        pending = a != b
+        if not pending.any():
+            return parent
+        np.minimum.at(parent, np.maximum(a[pending], b[pending]), np.minimum(a[pending], b[pending]))
+
+
+def assign_duplicate_groups(df, keys=None):
+    """
+    Cluster rows of a combined dataset into duplicate groups.
+
+    Args:
+        df: Combined DataFrame
+        keys: Mapping of key name -> list of normalized fields (defaults to DUPLICATE_KEYS)
+
+    Returns:
+        (group_ids, group_sizes) as int arrays aligned with df. Rows without a
+        duplicate get group id 0 and size 1; groups are numbered from 1 in
+        order of first appearance.
+    """
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    fields = _normalized_fields(df)
+    left, right = [], []
+    for parts in (keys or DUPLICATE_KEYS).values():
+        if all(part in fields for part in parts):
+            l, r = _key_edges([fields[part] for part in parts])
+            left.append(l)
+            right.append(r)
+    if not left:
+        return np.zeros(n, dtype=np.int64), np.ones(n, dtype=np.int64)
+    roots = _union_find(n, np.concatenate(left), np.concatenate(right))
+
+    sizes = np.bincount(roots, minlength=n)[roots]
+    group_ids = np.zeros(n, dtype=np.int64)
+    in_group = sizes > 1
+    group_ids[in_group] = pd.factorize(roots[in_group])[0] + 1
+    return group_ids, sizes
+
+
+def find_duplicates(df, keys=None):
+    """
+    Return the rows of df that belong to a duplicate group, ordered by group,
+    with 'Duplicate_Group_ID' and 'Duplicate_Group_Size' columns added.
+    """
+    group_ids, sizes = assign_duplicate_groups(df, keys)
+    return duplicate_rows(df, group_ids, sizes)
+
+
+def duplicate_rows(df, group_ids, sizes):
+    """Select the grouped rows of df given precomputed assign_duplicate_groups output."""
+    mask = group_ids > 0
+    duplicates = df[mask].copy()
+    duplicates["Duplicate_Group_ID"] = group_ids[mask]
+    duplicates["Duplicate_Group_Size"] = sizes[mask]
+    return duplicates.sort_values("Duplicate_Group_ID", kind="stable")
+
+
+def duplicate_group_count(duplicate_data):
+    """Number of duplicate groups in a duplicate dataset (legacy files are assumed to hold pairs)."""
+    if duplicate_data is None or duplicate_data.empty:
+        return 0
+    if "Duplicate_Group_ID" in duplicate_data.columns:
+        return int(duplicate_data["Duplicate_Group_ID"].nunique())
+    return len(duplicate_data) // 2
@@ -0,0 +1,13 @@
+class DataModelError(Exception):
+    """
+    A data operation failed in a way the user should be told about.
+
+    The message is written for the user. The GUI shows it in a dialog with
+    title and severity ('error' or 'warning'); headless callers log it.
+    """
+
+    def __init__(self, message, title="Error", severity="error"):
+        super().__init__(message)
+        self.message = message
+        self.title = title
+        self.severity = severity
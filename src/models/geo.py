@@ -0,0 +1,269 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+from models.record_key import normalize_zip
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; queries fall back to a blocked NumPy scan
+    cKDTree = None
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Bundled ZIP centroid table (ZIP, Latitude, Longitude) for every active US ZIP
+# code, from the MIT-licensed `zipcodes` package (1.3.0, data of Feb. 2025). The
+# Census Gazetteer ZCTA file (GEOID, INTPTLAT, INTPTLONG) can be used in its place as-is.
+DEFAULT_CENTROIDS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "zip_centroids.csv")
+
+NO_CENTROIDS_MESSAGE = (
+    "Distance matching is unavailable: the ZIP centroid table (assets/zip_centroids.csv) is missing or empty. "
+    "Add a ZIP,Latitude,Longitude file or the Census ZCTA Gazetteer file there to use it."
+)
+
+CENTROID_ALIASES = {
+    "ZIP": ["ZIP", "Zip", "ZCTA5", "GEOID"],
+    "Latitude": ["Latitude", "Lat", "INTPTLAT"],
+    "Longitude": ["Longitude", "Lon", "Lng", "INTPTLONG"],
+}
+
+# Number of query x point distances computed at once by the NumPy fallback
+_BLOCK = 4_000_000
+
+_centroid_cache = {}
+
+
+def read_zip_centroids(path):
+    """
+    Read a ZIP centroid file into a DataFrame of Latitude/Longitude indexed by 5-digit ZIP.
+
+    Accepts comma- or tab-separated files, including the Census Gazetteer ZCTA
+    file. Rows without a ZIP or coordinates are dropped.
+    """
+    with open(path, encoding="utf-8-sig") as f:
+        header = f.readline()
+    table = pd.read_csv(path, sep="\t" if "\t" in header else ",", dtype=str, encoding="utf-8-sig")
+    table.columns = [str(c).strip() for c in table.columns]
+    columns = {}
+    for target, aliases in CENTROID_ALIASES.items():
+        found = next((alias for alias in aliases if alias in table.columns), None)
+        if found is None:
+            raise ValueError(f"ZIP centroid file '{path}' has no {target} column.")
+        columns[target] = table[found]
+
+    centroids = pd.DataFrame({
+        "ZIP": normalize_zip(columns["ZIP"]),
+        "Latitude": pd.to_numeric(columns["Latitude"], errors="coerce"),
+        "Longitude": pd.to_numeric(columns["Longitude"], errors="coerce"),
+    })
+    centroids = centroids[(centroids["ZIP"] != "") & centroids["Latitude"].notna() & centroids["Longitude"].notna()]
+    return centroids.drop_duplicates("ZIP").set_index("ZIP")
+
+
+def load_zip_centroids(path=DEFAULT_CENTROIDS):
+    """
+    Return the ZIP centroid table, read once and cached until the file changes.
+
+    A missing or empty file gives an empty table, which turns the
+    distance-based features off (see has_zip_centroids) rather than failing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        logging.warning(f"ZIP centroid file '{path}' not found; distance-based features are disabled.")
+        return pd.DataFrame(columns=["Latitude", "Longitude"], index=pd.Index([], name="ZIP"), dtype=float)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _centroid_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, read_zip_centroids(path))
+        _centroid_cache[path] = cached
+        if len(cached[1]):
+            logging.info(f"Loaded {len(cached[1])} ZIP centroids from '{path}'.")
+        else:
+            logging.warning(f"ZIP centroid file '{path}' has no centroids; distance-based features are disabled.")
+    return cached[1]
+
+
+def has_zip_centroids(path=DEFAULT_CENTROIDS):
+    """Whether the ZIP centroid table has any rows, i.e. whether distance-based features work."""
+    return len(load_zip_centroids(path)) > 0
+
+
+def locate_zips(centroids, zips):
+    """
+    Look up the centroid of every ZIP in zips.
+
+    Returns:
+        (latitude, longitude) float arrays, NaN where the ZIP is unknown
+    """
+    zips = normalize_zip(pd.Series(zips) if not isinstance(zips, pd.Series) else zips)
+    positions = centroids.index.get_indexer(zips.to_numpy(dtype=object))
+    found = positions >= 0
+    lat = np.full(len(positions), np.nan)
+    lon = np.full(len(positions), np.nan)
+    lat[found] = centroids["Latitude"].to_numpy(dtype=float)[positions[found]]
+    lon[found] = centroids["Longitude"].to_numpy(dtype=float)[positions[found]]
+    return lat, lon
+
+
+def _unit_vectors(lat, lon):
+    """Points on the unit sphere, so straight-line (chord) distance orders like great-circle distance."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def _chord(miles):
+    return 2 * np.sin(np.minimum(np.asarray(miles, dtype=float) / EARTH_RADIUS_MILES, np.pi) / 2)
+
+
+def _miles(chord):
+    return 2 * np.arcsin(np.clip(chord / 2, 0, 1)) * EARTH_RADIUS_MILES
+
+
+class GeoIndex:
+    """
+    Spatial index over latitude/longitude points with batched radius and
+    k-nearest queries in miles.
+
+    Points are stored as 3-D unit vectors in a KD-tree (scipy's cKDTree when
+    available, otherwise a blocked brute-force scan with NumPy), so queries
+    never deal with longitude wrap-around or the poles.
+    """
+
+    def __init__(self, lat, lon):
+        self.points = _unit_vectors(lat, lon)
+        self._tree = cKDTree(self.points) if cKDTree is not None and len(self.points) else None
+
+    def __len__(self):
+        return len(self.points)
+
+    def within(self, lat, lon, miles):
+        """
+        Find the points within a radius of each query location.
+
+        Args:
+            lat, lon: Query coordinates (arrays; NaN queries match nothing)
+            miles: Radius in miles
+
+        Returns:
+            A list with one sorted int array of point positions per query
+        """
+        queries = _unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        valid = ~np.isnan(queries).any(axis=1)
+        result = [np.empty(0, dtype=np.intp) for _ in range(len(queries))]
+        if not len(self.points) or not valid.any():
+            return result
+        radius = _chord(miles)
+        rows = np.flatnonzero(valid)
+        if self._tree is not None:
+            for row, found in zip(rows, self._tree.query_ball_point(queries[valid], radius)):
+                result[row] = np.sort(np.asarray(found, dtype=np.intp))
+            return result
+        # cos(angle) >= threshold  <=>  chord <= radius
+        threshold = 1 - radius ** 2 / 2
+        step = max(1, _BLOCK // len(self.points))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            hits = (queries[block] @ self.points.T) >= threshold - 1e-12
+            for row, mask in zip(block, hits):
+                result[row] = np.flatnonzero(mask)
+        return result
+
+    def nearest(self, lat, lon, k=1):
+        """
+        Find the k nearest points to each query location.
+
+        Returns:
+            (miles, positions) arrays of shape (queries, k), nearest first.
+            Missing neighbours (unknown queries or fewer than k points) have
+            distance inf and position -1.
+        """
+        queries = _unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        valid = ~np.isnan(queries).any(axis=1)
+        miles = np.full((len(queries), k), np.inf)
+        positions = np.full((len(queries), k), -1, dtype=np.intp)
+        available = min(k, len(self.points))
+        if not available or not valid.any():
+            return miles, positions
+        rows = np.flatnonzero(valid)
+        if self._tree is not None:
+            chord, found = self._tree.query(queries[valid], k=available)
+            chord, found = chord.reshape(len(rows), available), found.reshape(len(rows), available)
+        else:
+            chord = np.empty((len(rows), available))
+            found = np.empty((len(rows), available), dtype=np.intp)
+            step = max(1, _BLOCK // len(self.points))
+            for start in range(0, len(rows), step):
+                block = slice(start, start + step)
+                squared = np.maximum(2 - 2 * (queries[rows[block]] @ self.points.T), 0)
+                if available < len(self.points):
+                    nearest = np.argpartition(squared, available - 1, axis=1)[:, :available]
+                else:
+                    nearest = np.broadcast_to(np.arange(available), squared.shape).copy()
+                distances = np.take_along_axis(squared, nearest, axis=1)
+                order = np.argsort(distances, axis=1, kind="stable")
+                found[block] = np.take_along_axis(nearest, order, axis=1)
+                # 2 - 2*dot loses precision for close points; recompute the k chords directly
+                difference = self.points[found[block]] - queries[rows[block]][:, None, :]
+                chord[block] = np.sqrt((difference ** 2).sum(axis=2))
+        miles[rows, :available] = _miles(chord)
+        positions[rows, :available] = found
+        return miles, positions
+
+
+class ChildGeoIndex:
+    """
+    Spatial index over the children of a combined dataset by ZIP centroid.
+
+    Children share ZIPs, so the tree holds one point per distinct ZIP and each
+    ZIP maps to the row positions of its children; a radius query is a tree
+    lookup plus a concatenation of those groups.
+    """
+
+    def __init__(self, df, centroids):
+        """
+        Args:
+            df: Combined DataFrame with a ZIP column
+            centroids: ZIP centroid table (see load_zip_centroids)
+        """
+        self.centroids = centroids
+        zips = normalize_zip(df["ZIP"]) if "ZIP" in df.columns else pd.Series("", index=df.index, dtype=object)
+        groups = pd.Series(np.arange(len(df))).groupby(zips.to_numpy(), sort=False).indices
+        known = [zipcode for zipcode in groups if zipcode in centroids.index]
+        self.zips = np.array(known, dtype=object)
+        self._rows = [groups[zipcode] for zipcode in known]
+        self.index = GeoIndex(*locate_zips(centroids, self.zips))
+        self.located = sum(len(rows) for rows in self._rows)
+
+    def _rows_of(self, zip_positions):
+        if not len(zip_positions):
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate([self._rows[i] for i in zip_positions])
+
+    def within(self, zips, miles):
+        """
+        Row positions of the children living within a radius of each ZIP.
+
+        Returns:
+            A list with one sorted int array of row positions per ZIP
+        """
+        zips = [zips] if isinstance(zips, str) else list(zips)
+        lat, lon = locate_zips(self.centroids, zips)
+        return [np.sort(self._rows_of(found)) for found in self.index.within(lat, lon, miles)]
+
+    def nearest(self, zipcode, k):
+        """
+        Row positions of (at least) the k children closest to a ZIP, closest
+        ZIPs first. Every child of the last ZIP reached is included.
+        """
+        lat, lon = locate_zips(self.centroids, [zipcode])
+        wanted = 1
+        while True:
+            _, found = self.index.nearest(lat, lon, min(wanted, len(self.index)) or 1)
+            found = found[0][found[0] >= 0]
+            rows = self._rows_of(found)
+            if len(rows) >= k or len(found) >= len(self.index) or not len(found):
+                return rows
+            wanted *= 2
@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB, or None where it cannot be measured."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2**20
+    except ImportError:
+        return None
+
+
+def rss_mb():
+    """Current resident memory of this process in MB, or None where it cannot be measured."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        return None
+
+
+def no_span(name, rows_in=None):
+    """Stand-in for Instrumentation.span where nothing is recorded."""
+    return nullcontext(SimpleNamespace(name=name, rows_in=rows_in, rows_out=None))
+
+
+class Span:
+    """One timed stage: duration, rows in and out, and the change in resident memory."""
+
+    def __init__(self, name, rows_in=None, parent=None):
+        self.name = name
+        self.parent = parent
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.started_at = time.time()
+        self.seconds = None
+        self.memory_delta_mb = None
+        self.error = None
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "started_at": round(self.started_at, 3),
+            "seconds": round(self.seconds, 6) if self.seconds is not None else None,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "memory_delta_mb": round(self.memory_delta_mb, 2) if self.memory_delta_mb is not None else None,
+            "error": self.error,
+        }
+
+
+class _Progress:
+    """Turns the spans of a planned operation into progress percentages."""
+
+    def __init__(self, callback, plan):
+        self.callback = callback
+        self.plan = {name: (label, weight) for name, label, weight in plan}
+        self.total = sum(weight for _, _, weight in plan) or 1
+        self.done = 0
+
+    def started(self, name):
+        if name in self.plan:
+            self.callback(self.plan[name][0], int(100 * self.done / self.total))
+
+    def finished(self, name):
+        if name in self.plan:
+            self.done += self.plan[name][1]
+
+
+class Instrumentation:
+    """
+    Records spans around the stages of data operations.
+
+    Every finished span is logged, kept in a bounded list of recent spans,
+    added to per-stage totals (exported in Prometheus text format) and,
+    with span_log, appended to that file as one JSON line.
+
+    Spans are safe to open from any thread; nesting is tracked per thread.
+    """
+
+    def __init__(self, span_log=None, keep=1000):
+        """
+        Args:
+            span_log: Optional path of a JSON-lines file every finished span is appended to
+            keep: Number of recent spans kept in memory
+        """
+        self.span_log = span_log
+        self.recent = deque(maxlen=keep)
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, rows_in=None):
+        """
+        Time the enclosed block as stage `name`. Set rows_out on the yielded
+        span to record the rows it produced.
+        """
+        stack = self._stack()
+        span = Span(name, rows_in, parent=stack[-1].name if stack else None)
+        progress = getattr(self._local, "progress", None)
+        if progress:
+            progress.started(name)
+        stack.append(span)
+        memory_before = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.seconds = time.perf_counter() - start
+            memory_after = rss_mb()
+            if memory_before is not None and memory_after is not None:
+                span.memory_delta_mb = memory_after - memory_before
+            stack.pop()
+            if progress:
+                progress.finished(name)
+            self._record(span)
+
+    @contextmanager
+    def tracking(self, callback, plan):
+        """
+        Report progress through callback(message, percent) while the enclosed
+        block runs, based on which of the planned spans have finished.
+
+        Args:
+            callback: Progress callback, or None to report nothing
+            plan: List of (span name, message, weight); weights are relative costs
+        """
+        if callback is None:
+            yield
+            return
+        previous = getattr(self._local, "progress", None)
+        self._local.progress = _Progress(callback, plan)
+        try:
+            yield
+        finally:
+            self._local.progress = previous
+
+    def _record(self, span):
+        rows = f", rows {span.rows_in} -> {span.rows_out}" if span.rows_in is not None or span.rows_out is not None else ""
+        memory = f", memory {span.memory_delta_mb:+.1f} MB" if span.memory_delta_mb is not None else ""
+        logging.info(f"{span.name}: {span.seconds:.3f} s{rows}{memory}")
+        with self._lock:
+            self.recent.append(span)
+            totals = self.totals.setdefault(span.name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                        "errors": 0, "rows_out": None})
+            totals["count"] += 1
+            totals["seconds"] += span.seconds
+            totals["max_seconds"] = max(totals["max_seconds"], span.seconds)
+            totals["errors"] += span.error is not None
+            if span.rows_out is not None:
+                totals["rows_out"] = span.rows_out
+            if self.span_log:
+                try:
+                    with open(self.span_log, "a") as f:
+                        f.write(json.dumps(span.as_dict()) + "\n")
+                except OSError as e:
+                    logging.warning(f"Could not write span log '{self.span_log}': {e}")
+
+    def to_prometheus(self, prefix="nursefilter"):
+        """The per-stage totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = {name: dict(values) for name, values in self.totals.items()}
+        metrics = [
+            ("stage_seconds_total", "counter", "Time spent in each stage", "seconds"),
+            ("stage_runs_total", "counter", "Times each stage ran", "count"),
+            ("stage_errors_total", "counter", "Times each stage failed", "errors"),
+            ("stage_max_seconds", "gauge", "Longest single run of each stage", "max_seconds"),
+            ("stage_rows", "gauge", "Rows produced by the last run of each stage", "rows_out"),
+        ]
+        lines = []
+        for metric, kind, help_text, key in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for name, values in sorted(totals.items()):
+                if values[key] is not None:
+                    label = re.sub(r'(["\\])', r'\\\1', name)
+                    lines.append(f'{prefix}_{metric}{{stage="{label}"}} {values[key]:g}')
+        peak = peak_memory_mb()
+        if peak is not None:
+            lines += [f"# HELP {prefix}_peak_memory_bytes Peak resident memory",
+                      f"# TYPE {prefix}_peak_memory_bytes gauge",
+                      f"{prefix}_peak_memory_bytes {int(peak * 2**20)}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write to_prometheus() to path atomically (e.g. for node_exporter's textfile collector)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
@@ -0,0 +1,176 @@
+import json
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from models.profiling import ENTRY_POINTS, current_action
+
+# Methods reported as the running action during a stall: the profiled entry
+# points plus the slow calls known to run on the Tk thread
+WATCHED = ENTRY_POINTS + [
+    ("views.combined_data_view", "CombinedDataView", ["update_treeview"]),
+    ("models.data_model", "DataModel", ["is_file_encrypted", "load_combined_data", "flush_writes"]),
+]
+
+def percentile(values, fraction):
+    """The value below which `fraction` (0.95 = 95%) of values lie, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LatencyMonitor:
+    """
+    Measures how responsive the Tk main loop is.
+
+    A heartbeat is scheduled with root.after() every interval_ms; how late
+    it runs is the lag, i.e. how long input would have waited. A watchdog
+    thread notices when the heartbeat is more than threshold_ms overdue and
+    records which controller action (see models.profiling.current_action)
+    and which code the Tk thread was running at that moment. When the
+    heartbeat finally runs, the stall is logged with its full length.
+
+    Actions are only known for methods wrapped by models.profiling.instrument;
+    app.py wraps WATCHED. Start the monitor from the Tk thread.
+    """
+
+    def __init__(self, root, interval_ms=100, threshold_ms=200, report_path=None, keep=10000,
+                 clock=time.monotonic):
+        """
+        Args:
+            root: Tk root whose main loop is measured
+            interval_ms: Time between heartbeats
+            threshold_ms: Lag that counts as a stall
+            report_path: Optional JSON file the summary is written to on stop()
+            keep: Number of recent lags (and stalls / 100) kept for the summary
+            clock: Monotonic clock in seconds; replaceable in tests
+        """
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.report_path = report_path
+        self.clock = clock
+        self.lags = deque(maxlen=keep)
+        self.stalls = deque(maxlen=max(keep // 100, 10))
+        self.beats = 0
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.stall_seconds = 0.0
+        self._due = None
+        self._open_stall = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watchdog = None
+        self._after_id = None
+        self.tk_thread = None
+
+    def start(self):
+        self.tk_thread = threading.get_ident()
+        self._stop.clear()
+        self._schedule()
+        self._watchdog = threading.Thread(target=self._watch, name="tk-latency-watchdog", daemon=True)
+        self._watchdog.start()
+        logging.info(f"Latency monitor started (heartbeat {self.interval * 1000:.0f} ms, "
+                     f"stall threshold {self.threshold * 1000:.0f} ms).")
+
+    def stop(self):
+        """Stop measuring and write the report, if one was asked for."""
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # the window is already gone
+            self._after_id = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        if self.report_path:
+            try:
+                self.write_report(self.report_path)
+            except OSError as e:
+                logging.warning(f"Could not write latency report '{self.report_path}': {e}")
+
+    def _schedule(self):
+        self._due = self.clock() + self.interval
+        self._after_id = self.root.after(int(self.interval * 1000), self._beat)
+
+    def _beat(self):
+        """Runs on the Tk thread: record how late this heartbeat is and schedule the next."""
+        lag = max(0.0, self.clock() - self._due)
+        with self._lock:
+            self.beats += 1
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            stall, self._open_stall = self._open_stall, None
+            self._due = None
+            if stall is None and lag > self.threshold:
+                # Over before the watchdog looked; what was running is unknown
+                stall = {"at": time.strftime("%Y-%m-%dT%H:%M:%S"), "action": None, "stack": None}
+            if stall is not None:
+                stall["lag_ms"] = round(lag * 1000, 1)
+                self.stalls.append(stall)
+                self.stall_count += 1
+                self.stall_seconds += lag
+        if stall is not None:
+            logging.warning(f"UI stalled for {lag * 1000:.0f} ms" +
+                            (f" in {stall['action']}" if stall["action"] else ""))
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 4):
+            self.check()
+
+    def check(self):
+        """Runs on the watchdog: capture what the Tk thread is doing if the heartbeat is overdue."""
+        due = self._due
+        if due is None or self.clock() - due <= self.threshold:
+            return
+        with self._lock:
+            if self._open_stall is not None or self._due != due:
+                return
+            self._open_stall = self._capture()
+
+    def _capture(self):
+        action = current_action(self.tk_thread)
+        frame = sys._current_frames().get(self.tk_thread)
+        return {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "action": action[0] if action else None,
+            "action_seconds": round(time.time() - action[1], 3) if action else None,
+            "stack": traceback.format_stack(frame)[-8:] if frame is not None else None,
+        }
+
+    def summary(self):
+        with self._lock:
+            lags = list(self.lags)
+            stalls = [dict(stall) for stall in self.stalls]
+            summary = {
+                "beats": self.beats,
+                "interval_ms": round(self.interval * 1000),
+                "threshold_ms": round(self.threshold * 1000),
+                "stalls": self.stall_count,
+                "stalled_seconds": round(self.stall_seconds, 3),
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+            }
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = percentile(lags, fraction)
+            summary[f"{name}_lag_ms"] = round(value * 1000, 1) if value is not None else None
+        by_action = {}
+        for stall in stalls:
+            totals = by_action.setdefault(stall["action"] or "(unknown)", {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            totals["count"] += 1
+            totals["total_ms"] = round(totals["total_ms"] + stall["lag_ms"], 1)
+            totals["max_ms"] = max(totals["max_ms"], stall["lag_ms"])
+        summary["stalls_by_action"] = dict(sorted(by_action.items(), key=lambda item: -item[1]["total_ms"]))
+        summary["recent_stalls"] = stalls
+        return summary
+
+    def write_report(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        logging.info(f"Latency report written to '{path}'.")
@@ -0,0 +1,77 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from models.instrumentation import no_span
+
+
+class BackgroundWriter:
+    """
+    Writes DataFrames to Excel on a single worker thread.
+
+    Each submit takes a snapshot of the frame, so the caller can keep editing
+    it. Writes to the same path are coalesced: if a newer snapshot arrives
+    before the older one is written, only the newest is written. Pending
+    writes are flushed at interpreter exit.
+
+    Each workbook is written to '<path>.tmp' and then moved over path, so a
+    write cut short leaves the previous file whole.
+    """
+
+    def __init__(self, instrumentation=None):
+        """
+        Args:
+            instrumentation: Optional models.instrumentation.Instrumentation that times each write
+        """
+        self._span = instrumentation.span if instrumentation is not None else no_span
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def submit(self, df, path):
+        """Queue df to be written to path."""
+        snapshot = df.copy()
+        with self._lock:
+            self._pending[path] = snapshot
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+                self._thread.start()
+        self._queue.put(path)
+        logging.info(f"Queued background write of {len(snapshot)} rows to '{path}'.")
+
+    def pending(self, path=None):
+        """Return True if a write (to path, or to any file) has not finished yet."""
+        if path is None:
+            return self._queue.unfinished_tasks > 0
+        with self._lock:
+            return path in self._pending or self._queue.unfinished_tasks > 0
+
+    def flush(self):
+        """Block until every queued write has been written."""
+        if self._queue.unfinished_tasks:
+            logging.info("Waiting for background writes to finish.")
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            tmp = path + ".tmp"
+            try:
+                with self._lock:
+                    df = self._pending.pop(path, None)
+                # None means a later task for this path already wrote the newest snapshot
+                if df is not None:
+                    with self._span("write", rows_in=len(df)):
+                        with open(tmp, "wb") as f:
+                            df.to_excel(f, index=False, engine="openpyxl")
+                        os.replace(tmp, path)
+                    logging.info(f"Background write to '{path}' finished.")
+            except Exception as e:
+                logging.error(f"Background write to '{path}' failed: {e}")
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,162 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import Future
+import pandas as pd
+from cryptography.fernet import InvalidToken
+from app_crypto import Crypto
+
+# Remembers the combined file loaded last, so it can be preloaded at the next login
+RECENT_FILE = 'recent_combined.txt'
+# Parsed copy of a combined workbook, next to it: '<workbook>.cache'
+CACHE_SUFFIX = '.cache'
+
+
+def remember_recent(path, recent_file=RECENT_FILE):
+    """Record path as the most recently used combined file."""
+    try:
+        with open(recent_file, 'w') as f:
+            f.write(os.path.abspath(path))
+    except OSError as e:
+        logging.warning(f"Could not record recent file '{path}': {e}")
+
+
+def recent_combined_file(default, recent_file=RECENT_FILE):
+    """Return the most recently used combined file if it still exists, else default."""
+    try:
+        with open(recent_file) as f:
+            path = f.read().strip()
+    except OSError:
+        return default
+    return path if path and os.path.exists(path) else default
+
+
+def file_stamp(path):
+    """(mtime, size) of path, used to tell whether it changed since it was read."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_cache(path, digest, key):
+    cache = path + CACHE_SUFFIX
+    if not os.path.exists(cache):
+        return None
+    try:
+        with open(cache, 'rb') as f:
+            data = f.read()
+        if key is not None:
+            data = Crypto.decrypt_data(data, key)
+        stored, _, payload = data.partition(b'\n')
+        if stored.decode() != digest:
+            return None
+        return pd.read_parquet(io.BytesIO(payload))
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cache '{cache}': {e}")
+        return None
+
+
+def _write_cache(path, digest, df, key):
+    cache = path + CACHE_SUFFIX
+    try:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        data = digest.encode() + b'\n' + buffer.getvalue()
+        if key is not None:
+            data = Crypto.encrypt_data(data, key)
+        tmp = cache + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, cache)
+    except Exception as e:
+        # No parquet engine, or columns parquet cannot store: the workbook is still the source
+        logging.warning(f"Could not cache '{path}': {e}")
+
+
+def read_combined_file(path, key=None):
+    """
+    Read a combined workbook, decrypting it in memory if needed.
+
+    The file on disk is left as it is. The parsed frame is cached as parquet
+    next to the workbook (encrypted with the same key), keyed on a hash of
+    the decrypted workbook, so a later read of unchanged data skips Excel
+    parsing even after the file has been re-encrypted.
+
+    Args:
+        path: Path to the combined workbook
+        key: Fernet key, or None if there is no key
+
+    Returns:
+        DataFrame: The workbook's data
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if key is not None:
+        try:
+            data = Crypto.decrypt_data(data, key)
+        except InvalidToken:
+            pass  # not encrypted
+    digest = hashlib.sha256(data).hexdigest()
+
+    df = _read_cache(path, digest, key)
+    if df is not None:
+        logging.info(f"Read '{path}' from its cache.")
+        return df
+    df = pd.read_excel(io.BytesIO(data))
+    _write_cache(path, digest, df, key)
+    return df
+
+
+class Preloader:
+    """
+    Reads a combined file on a background thread so it is ready when asked for.
+
+    The result is handed out once, and only if the file has not changed
+    since it was read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._stamp = None
+        self._future = None
+
+    def start(self, path, key=None):
+        """Start reading path in the background, replacing any earlier preload."""
+        future = Future()
+        with self._lock:
+            self._path = os.path.abspath(path)
+            self._stamp = file_stamp(path)
+            self._future = future
+
+        def run():
+            try:
+                future.set_result(read_combined_file(path, key))
+                logging.info(f"Preloaded combined data from '{path}'.")
+            except Exception as e:
+                logging.warning(f"Preloading '{path}' failed: {e}")
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="Preloader", daemon=True).start()
+        return future
+
+    def take(self, path):
+        """
+        Return the preloaded frame for path, waiting if it is still being read.
+
+        Returns:
+            DataFrame, or None if path was not preloaded, changed since, or failed to read
+        """
+        with self._lock:
+            future, preloaded, stamp = self._future, self._path, self._stamp
+            self._future = self._path = self._stamp = None
+        if future is None or preloaded != os.path.abspath(path):
+            return None
+        try:
+            df = future.result()
+        except Exception:
+            return None
+        if not os.path.exists(path) or file_stamp(path) != stamp:
+            return None
+        return df
@@ -0,0 +1,244 @@
+import cProfile
+import functools
+import importlib
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+
+# Controller methods that are timed as user actions: (module, class, methods)
+ENTRY_POINTS = [
+    ("controllers.combined_data_controller", "CombinedDataController",
+     ["show_combined_data", "search_combined_names", "batch_assign_nurses", "generate_report"]),
+    ("controllers.profile_controller", "ProfileController", ["show_profile"]),
+    ("controllers.nurse_controller", "NurseController",
+     ["generate_report", "batch_assign_nurses", "save_nurse"]),
+]
+
+# The actions running on each thread, innermost last: {thread id: [(name, started_at), ...]}
+_running = {}
+_running_lock = threading.Lock()
+# The Profiler in use while profiling mode is on
+_profiler = None
+
+
+def current_action(thread_id=None):
+    """
+    The innermost action running on a thread.
+
+    Args:
+        thread_id: Thread to look at (default: the calling thread)
+
+    Returns:
+        (name, started_at) or None when no action is running
+    """
+    thread_id = threading.get_ident() if thread_id is None else thread_id
+    with _running_lock:
+        actions = _running.get(thread_id)
+        return actions[-1] if actions else None
+
+
+class _Tracked:
+    """Registers an action as running on the calling thread for as long as it lasts."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.thread_id = threading.get_ident()
+        with _running_lock:
+            _running.setdefault(self.thread_id, []).append((self.name, time.time()))
+        return self
+
+    def __exit__(self, *exc):
+        with _running_lock:
+            actions = _running[self.thread_id]
+            actions.pop()
+            if not actions:
+                del _running[self.thread_id]
+        return False
+
+
+class Profiler:
+    """
+    Profiles user actions with cProfile and tracemalloc.
+
+    Each profiled action writes two files to output_dir: a .prof file for
+    pstats/snakeviz and a .txt report with the slowest functions and the
+    lines that allocated the most memory. summary.json and summary.txt list
+    per-action totals and the slowest single runs; they are rewritten after
+    every action, so they are current even if the app does not exit cleanly.
+
+    Only one action is profiled at a time. Actions nested in it, or started
+    on another thread meanwhile, are timed but not profiled.
+    """
+
+    def __init__(self, output_dir, memory=True, top=30, keep_slowest=20):
+        """
+        Args:
+            output_dir: Directory the profiles and summary are written to
+            memory: Also trace allocations with tracemalloc (slows the app down further)
+            top: Functions and allocation sites listed in each report
+            keep_slowest: Single runs listed in the summary
+        """
+        self.output_dir = output_dir
+        self.memory = memory
+        self.top = top
+        self.keep_slowest = keep_slowest
+        self.totals = {}
+        self.slowest = []
+        self._count = 0
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def run(self, name, function, *args, **kwargs):
+        """Call function(*args, **kwargs) as the action `name` and return its result."""
+        if not self._busy.acquire(blocking=False):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._record(name, time.perf_counter() - start, None)
+
+        try:
+            profile = cProfile.Profile()
+            snapshot = None
+            if self.memory:
+                tracemalloc.reset_peak()
+                snapshot = tracemalloc.take_snapshot()
+            start = time.perf_counter()
+            error = None
+            try:
+                return profile.runcall(function, *args, **kwargs)
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                seconds = time.perf_counter() - start
+                try:
+                    path = self._write_profile(name, seconds, profile, snapshot, error)
+                except OSError as e:
+                    logging.warning(f"Could not write profile of {name}: {e}")
+                    path = None
+                self._record(name, seconds, path)
+        finally:
+            self._busy.release()
+
+    def _write_profile(self, name, seconds, profile, snapshot, error):
+        with self._lock:
+            self._count += 1
+            count = self._count
+        stem = os.path.join(self.output_dir, f"{count:04d}-{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}")
+        profile.dump_stats(stem + ".prof")
+
+        report = io.StringIO()
+        report.write(f"{name}: {seconds:.3f} s{f' (failed: {error})' if error else ''}\n\n")
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        if snapshot is not None:
+            _, peak = tracemalloc.get_traced_memory()
+            report.write(f"Peak traced memory: {peak / 2**20:.1f} MB\n")
+            report.write(f"Top {self.top} allocation sites (net change):\n")
+            for diff in tracemalloc.take_snapshot().compare_to(snapshot, "lineno")[:self.top]:
+                report.write(f"  {diff}\n")
+        with open(stem + ".txt", "w") as f:
+            f.write(report.getvalue())
+        logging.info(f"Profiled {name}: {seconds:.3f} s -> {stem}.prof")
+        return stem + ".prof"
+
+    def _record(self, name, seconds, path):
+        with self._lock:
+            totals = self.totals.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            totals["count"] += 1
+            totals["seconds"] += seconds
+            totals["max_seconds"] = max(totals["max_seconds"], seconds)
+            self.slowest.append({"name": name, "seconds": round(seconds, 6), "profile": path,
+                                 "at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+            self.slowest.sort(key=lambda run: run["seconds"], reverse=True)
+            del self.slowest[self.keep_slowest:]
+        try:
+            self.write_summary()
+        except OSError as e:
+            logging.warning(f"Could not write profile summary: {e}")
+
+    def summary(self):
+        """Per-action totals, slowest total first, and the slowest single runs."""
+        with self._lock:
+            actions = [
+                {"name": name, "count": t["count"], "total_seconds": round(t["seconds"], 6),
+                 "mean_seconds": round(t["seconds"] / t["count"], 6), "max_seconds": round(t["max_seconds"], 6)}
+                for name, t in self.totals.items()
+            ]
+            slowest = [dict(run) for run in self.slowest]
+        actions.sort(key=lambda action: action["total_seconds"], reverse=True)
+        return {"actions": actions, "slowest": slowest}
+
+    def write_summary(self):
+        summary = self.summary()
+        with open(os.path.join(self.output_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        lines = [f"{'action':<48} {'runs':>6} {'total s':>10} {'mean s':>10} {'max s':>10}"]
+        for action in summary["actions"]:
+            lines.append(f"{action['name']:<48} {action['count']:>6} {action['total_seconds']:>10.3f} "
+                         f"{action['mean_seconds']:>10.3f} {action['max_seconds']:>10.3f}")
+        lines += ["", "Slowest runs:"]
+        for run in summary["slowest"]:
+            lines.append(f"  {run['seconds']:9.3f} s  {run['name']}  {run['at']}  {run['profile'] or '(not profiled)'}")
+        with open(os.path.join(self.output_dir, "summary.txt"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def _wrap(name, method):
+    @functools.wraps(method)
+    def action(*args, **kwargs):
+        with _Tracked(name):
+            if _profiler is not None:
+                return _profiler.run(name, method, *args, **kwargs)
+            return method(*args, **kwargs)
+    action._action_name = name
+    return action
+
+
+def instrument(entry_points=ENTRY_POINTS):
+    """
+    Wrap the entry point methods so current_action() reports them while they
+    run and, once profiling is enabled, so they are profiled. Methods that
+    are already wrapped are left alone.
+    """
+    for module_name, class_name, methods in entry_points:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for method_name in methods:
+            method = cls.__dict__[method_name]
+            if not hasattr(method, "_action_name"):
+                setattr(cls, method_name, _wrap(f"{class_name}.{method_name}", method))
+
+
+def enable_profiling(output_dir, memory=True, entry_points=ENTRY_POINTS):
+    """
+    Turn profiling mode on: instrument the entry points and profile every
+    call of them into output_dir.
+
+    Returns:
+        Profiler: The profiler in use
+    """
+    global _profiler
+    instrument(entry_points)
+    _profiler = Profiler(output_dir, memory=memory)
+    logging.info(f"Profiling mode on; writing profiles to '{os.path.abspath(output_dir)}'.")
+    return _profiler
+
+
+def disable_profiling():
+    """Stop profiling; the entry points stay instrumented for current_action()."""
+    global _profiler
+    _profiler = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
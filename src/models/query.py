@@ -0,0 +1,341 @@
+import numpy as np
+import pandas as pd
+
+from models.errors import DataModelError
+from models.geo import NO_CENTROIDS_MESSAGE
+from models.schema import DATE_FORMAT
+from models.statistics import UNASSIGNED_VALUES
+
+# Column searched by the age predicates
+DOB_COLUMN = "Child_Date_of_Birth"
+
+
+class Predicate:
+    """
+    A condition on the rows of the combined data.
+
+    Predicates combine with & (AND), | (OR) and ~ (NOT) and are evaluated
+    against a QueryIndex, which answers each column test from cached
+    per-column structures instead of scanning the frame row by row.
+    """
+
+    def mask(self, index):
+        """Return a boolean ndarray with one entry per row of index.df."""
+        raise NotImplementedError
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+
+def _fold(value):
+    return "" if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value).strip().lower()
+
+
+class Eq(Predicate):
+    """Column equals value (case-insensitive, ignoring surrounding spaces)."""
+
+    def __init__(self, column, value):
+        self.column = column
+        self.value = value
+
+    def mask(self, index):
+        return index.match(self.column, lambda values: values == index.key_of(self.column, self.value))
+
+    def __repr__(self):
+        return f"Eq({self.column!r}, {self.value!r})"
+
+
+class In(Predicate):
+    """Column equals any of values."""
+
+    def __init__(self, column, values):
+        self.column = column
+        self.values = list(values)
+
+    def mask(self, index):
+        keys = [index.key_of(self.column, value) for value in self.values]
+        return index.match(self.column, lambda values: np.isin(values, keys))
+
+    def __repr__(self):
+        return f"In({self.column!r}, {self.values!r})"
+
+
+class Prefix(Predicate):
+    """Column starts with prefix."""
+
+    def __init__(self, column, prefix):
+        self.column = column
+        self.prefix = prefix
+
+    def mask(self, index):
+        prefix = _fold(self.prefix)
+        return index.match(self.column, lambda values: pd.Series(values, dtype=object).str.startswith(prefix).to_numpy(dtype=bool))
+
+    def __repr__(self):
+        return f"Prefix({self.column!r}, {self.prefix!r})"
+
+
+class Contains(Predicate):
+    """Column (or any of columns; all columns when None) contains text."""
+
+    def __init__(self, text, columns=None):
+        self.text = text
+        self.columns = [columns] if isinstance(columns, str) else columns
+
+    def mask(self, index):
+        text = _fold(self.text)
+        columns = self.columns if self.columns is not None else list(index.df.columns)
+        found = np.zeros(len(index.df), dtype=bool)
+        for column in columns:
+            found |= index.match(column, lambda values: pd.Series(values, dtype=object).str.contains(text, regex=False).to_numpy(dtype=bool))
+        return found
+
+    def __repr__(self):
+        return f"Contains({self.text!r}, {self.columns!r})"
+
+
+class Range(Predicate):
+    """low <= column <= high for a date or numeric column; either bound may be None."""
+
+    def __init__(self, column, low=None, high=None):
+        self.column = column
+        self.low = low
+        self.high = high
+
+    def mask(self, index):
+        return index.between(self.column, self.low, self.high)
+
+    def __repr__(self):
+        return f"Range({self.column!r}, {self.low!r}, {self.high!r})"
+
+
+class AgeRange(Predicate):
+    """
+    Child age in whole years between min_years (inclusive) and max_years
+    (exclusive), e.g. AgeRange(1, 2) is every child aged one.
+    """
+
+    def __init__(self, min_years=None, max_years=None, today=None):
+        self.min_years = min_years
+        self.max_years = max_years
+        self.today = today
+
+    def mask(self, index):
+        today = pd.Timestamp(self.today if self.today is not None else pd.Timestamp.today()).normalize()
+        # Age >= n  <=>  born on or before today - n years
+        high = today - pd.DateOffset(years=self.min_years) if self.min_years is not None else None
+        low = today - pd.DateOffset(years=self.max_years) + pd.Timedelta(days=1) if self.max_years is not None else None
+        return index.between(DOB_COLUMN, low, high)
+
+    def __repr__(self):
+        return f"AgeRange({self.min_years!r}, {self.max_years!r})"
+
+
+class Unassigned(Predicate):
+    """Rows without an assigned nurse."""
+
+    def mask(self, index):
+        if "Assigned_Nurse" not in index.df.columns:
+            return np.ones(len(index.df), dtype=bool)
+        return index.match("Assigned_Nurse", lambda values: np.isin(values, list(UNASSIGNED_VALUES)))
+
+    def __repr__(self):
+        return "Unassigned()"
+
+
+class Near(Predicate):
+    """Children living within miles of a ZIP code (needs a geo index, see models/geo.py)."""
+
+    def __init__(self, zipcode, miles):
+        self.zipcode = zipcode
+        self.miles = miles
+
+    def mask(self, index):
+        return index.near(self.zipcode, self.miles)
+
+    def __repr__(self):
+        return f"Near({self.zipcode!r}, {self.miles!r})"
+
+
+class All(Predicate):
+    """Matches every row."""
+
+    def mask(self, index):
+        return np.ones(len(index.df), dtype=bool)
+
+
+class And(Predicate):
+    def __init__(self, *parts):
+        self.parts = parts
+
+    def mask(self, index):
+        result = np.ones(len(index.df), dtype=bool)
+        for part in self.parts:
+            result &= part.mask(index)
+            if not result.any():
+                break
+        return result
+
+    def __repr__(self):
+        return "And(" + ", ".join(map(repr, self.parts)) + ")"
+
+
+class Or(Predicate):
+    def __init__(self, *parts):
+        self.parts = parts
+
+    def mask(self, index):
+        result = np.zeros(len(index.df), dtype=bool)
+        for part in self.parts:
+            result |= part.mask(index)
+        return result
+
+    def __repr__(self):
+        return "Or(" + ", ".join(map(repr, self.parts)) + ")"
+
+
+class Not(Predicate):
+    def __init__(self, part):
+        self.part = part
+
+    def mask(self, index):
+        return ~self.part.mask(index)
+
+    def __repr__(self):
+        return f"Not({self.part!r})"
+
+
+class QueryIndex:
+    """
+    Per-column lookup structures over one combined DataFrame, built on first use.
+
+    Text and categorical columns are factorized once: a test runs over the
+    column's distinct (lower-cased) values and the result is spread back to
+    the rows through the integer codes. Date and numeric columns keep a
+    sorted copy so a range is two binary searches.
+    """
+
+    def __init__(self, df, geo_index=None):
+        """
+        Args:
+            df: Combined DataFrame (typed with models/schema.py)
+            geo_index: Optional callable returning a ChildGeoIndex, for Near
+        """
+        self.df = df
+        self.geo_index = geo_index
+        self._values = {}
+        self._sorted = {}
+
+    def invalidate(self, column=None):
+        """Forget the cached structures of one column (after it was edited) or of all columns."""
+        if column is None:
+            self._values.clear()
+            self._sorted.clear()
+        else:
+            self._values.pop(column, None)
+            self._sorted.pop(column, None)
+
+    def _distinct(self, column):
+        """(codes, folded distinct values) for a column; code -1 (missing) picks a trailing ""."""
+        if column not in self._values:
+            series = self.df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes, uniques = series.cat.codes.to_numpy(), pd.Series(series.cat.categories)
+            else:
+                codes, uniques = pd.factorize(series)
+                uniques = pd.Series(uniques)
+            if pd.api.types.is_datetime64_any_dtype(uniques):
+                text = uniques.dt.strftime(DATE_FORMAT)
+            else:
+                text = uniques.astype(object).astype(str).str.strip().str.lower()
+            self._values[column] = (codes, np.append(text.to_numpy(dtype=object), ""))
+        return self._values[column]
+
+    def key_of(self, column, value):
+        """Fold a query value the same way the column's values are folded."""
+        if column in self.df.columns and pd.api.types.is_datetime64_any_dtype(self.df[column]):
+            date = pd.to_datetime(value, errors="coerce")
+            return "" if pd.isna(date) else date.strftime(DATE_FORMAT)
+        return _fold(value)
+
+    def match(self, column, test):
+        """
+        Evaluate test (a function of the folded distinct values returning a
+        boolean array) and return the row mask.
+        """
+        if column not in self.df.columns:
+            return np.zeros(len(self.df), dtype=bool)
+        codes, values = self._distinct(column)
+        return np.asarray(test(values), dtype=bool)[codes]
+
+    def _sorted_values(self, column):
+        """(sorted values, row positions) of a date or numeric column, without missing values."""
+        if column not in self._sorted:
+            series = self.df[column]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = series.to_numpy()
+            else:
+                values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+            positions = np.flatnonzero(~pd.isna(values))
+            order = positions[np.argsort(values[positions], kind="stable")]
+            self._sorted[column] = (values[order], order)
+        return self._sorted[column]
+
+    def between(self, column, low, high):
+        if column not in self.df.columns:
+            return np.zeros(len(self.df), dtype=bool)
+        values, order = self._sorted_values(column)
+        if values.dtype.kind == "M":
+            convert = lambda bound: np.datetime64(pd.Timestamp(bound)).astype(values.dtype)
+        else:
+            convert = float
+        start = np.searchsorted(values, convert(low), side="left") if low is not None else 0
+        stop = np.searchsorted(values, convert(high), side="right") if high is not None else len(values)
+        result = np.zeros(len(self.df), dtype=bool)
+        result[order[start:stop]] = True
+        return result
+
+    def near(self, zipcode, miles):
+        geo = self.geo_index() if self.geo_index is not None else None
+        result = np.zeros(len(self.df), dtype=bool)
+        if geo is None:
+            raise DataModelError(NO_CENTROIDS_MESSAGE, title="Distance Unavailable")
+        result[geo.within(str(zipcode), float(miles))[0]] = True
+        return result
+
+    def filter(self, predicate):
+        """Return the rows of the DataFrame matching predicate."""
+        return self.df[predicate.mask(self)]
+
+
+def field_predicate(column, text):
+    """
+    Turn a filter field typed by the user into a predicate.
+
+    "a, b" matches any of the listed values, "ab*" matches values starting
+    with "ab" and anything else must match exactly. Blank text gives None.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    if "," in text:
+        return In(column, [part.strip() for part in text.split(",") if part.strip()])
+    if text.endswith("*"):
+        return Prefix(column, text.rstrip("*"))
+    return Eq(column, text)
+
+
+def combine(predicates, match_any=False):
+    """Join predicates (skipping None) with AND, or with OR when match_any; no predicates match everything."""
+    predicates = [p for p in predicates if p is not None]
+    if not predicates:
+        return All()
+    if len(predicates) == 1:
+        return predicates[0]
+    return Or(*predicates) if match_any else And(*predicates)
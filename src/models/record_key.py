@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# Columns that identify a single child record across sessions.
+RECORD_KEY_COLUMNS = ["Mother_ID", "Child_First_Name", "Child_Last_Name", "Child_Date_of_Birth"]
+
+
+def normalize_name(series):
+    """Lowercase a name column and strip everything but word characters."""
+    return series.fillna("").astype(str).str.lower().str.replace(r"\W", "", regex=True)
+
+
+def normalize_id(series):
+    """
+    Render an ID column as a plain string.
+
+    Excel hands IDs back as int, float (when the column has blanks) or str,
+    so "98765", 98765 and 98765.0 must all produce the same key.
+    """
+    ids = series.astype("object").where(series.notna(), "")
+    return ids.astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+
+
+def normalize_zip(series):
+    """
+    Render a ZIP column as a 5-digit string, or "" when it has no ZIP.
+
+    Excel drops leading zeros from numeric ZIPs and ZIP+4 codes carry a
+    suffix, so 2134, "02134" and "02134-1234" all produce "02134".
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Normalize each distinct value once; code -1 (missing) picks the trailing ""
+        categories = np.append(normalize_zip(pd.Series(series.cat.categories)).to_numpy(dtype=object), "")
+        return pd.Series(categories[series.cat.codes.to_numpy()], index=series.index, dtype=object)
+    digits = normalize_id(series).str.extract(r"^(\d{3,5})", expand=False).fillna("")
+    return digits.where(digits == "", digits.str.zfill(5))
+
+
+def normalize_date(series):
+    """Render a date column as YYYY-MM-DD, or an empty string if it does not parse."""
+    dates = pd.to_datetime(series, errors="coerce")
+    return dates.dt.strftime("%Y-%m-%d").fillna("")
+
+
+def build_record_key(df):
+    """
+    Build the stable record key for every row of a combined dataset.
+
+    Args:
+        df: DataFrame containing the RECORD_KEY_COLUMNS
+
+    Returns:
+        A string Series aligned with df's index
+    """
+    return (
+        normalize_id(df["Mother_ID"]) + "|" +
+        normalize_name(df["Child_First_Name"]) + "|" +
+        normalize_name(df["Child_Last_Name"]) + "|" +
+        normalize_date(df["Child_Date_of_Birth"])
+    )
+
+
+def has_record_key(df):
+    """Return True if df carries every column needed to build a record key."""
+    return df is not None and all(col in df.columns for col in RECORD_KEY_COLUMNS)
+
+
+def record_key_codes(*frames):
+    """
+    Factorize the record keys of several frames into one shared integer code space.
+
+    Matching on integer codes keeps joins between frames a cheap hash lookup
+    regardless of the string dtype pandas picks for the key.
+
+    Returns:
+        A list with one int64 ndarray of codes per frame
+    """
+    keys = pd.concat([build_record_key(df) for df in frames], ignore_index=True)
+    codes = pd.factorize(keys)[0].astype(np.int64)
+    bounds = np.cumsum([0] + [len(df) for df in frames])
+    return [codes[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
@@ -0,0 +1,105 @@
+import importlib.util
+import pandas as pd
+
+from models.record_key import normalize_id
+
+# Canonical in-memory types for the combined dataset. Applying them once at
+# load/combine time lets every filter compare typed values directly instead of
+# casting whole columns on each call.
+ID_COLUMNS = ["Mother_ID"]
+NAME_COLUMNS = ["Mother_First_Name", "Mother_Last_Name", "Child_First_Name", "Child_Last_Name"]
+CATEGORY_COLUMNS = ["City", "State", "ZIP", "Assigned_Nurse"]
+DATE_COLUMNS = ["Child_Date_of_Birth"]
+
+# Arrow-backed strings when pyarrow is installed, pandas' own string dtype otherwise
+TEXT_DTYPE = "string[pyarrow]" if importlib.util.find_spec("pyarrow") else "string"
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def _as_text(series):
+    # Blanks are stored as "" rather than <NA> so equality masks stay plain booleans
+    return series if series.dtype == TEXT_DTYPE else series.astype(TEXT_DTYPE).fillna("")
+
+
+def _as_id(series):
+    """IDs arrive as int, float (when blanks are present) or str; store them as text."""
+    if series.dtype == TEXT_DTYPE:
+        return series
+    return normalize_id(series).astype(TEXT_DTYPE)
+
+
+def _as_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    # ZIP codes and similar read back from Excel as numbers; categorize their text form
+    if pd.api.types.is_numeric_dtype(series):
+        series = normalize_id(series).replace("", None)
+    return series.astype("category")
+
+
+def _as_date(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors="coerce").dt.normalize()
+
+
+CONVERTERS = [
+    (ID_COLUMNS, _as_id),
+    (NAME_COLUMNS, _as_text),
+    (CATEGORY_COLUMNS, _as_category),
+    (DATE_COLUMNS, _as_date),
+]
+
+
+def apply_schema(df):
+    """
+    Convert a combined dataset to the canonical column types.
+
+    Mother_ID becomes text, names become (Arrow) strings, City/State/ZIP/
+    Assigned_Nurse become categoricals and the child's DOB becomes a date.
+    Columns that are missing are skipped and columns that already have the
+    right type are left untouched, so applying the schema twice is cheap.
+
+    Args:
+        df: Combined DataFrame, or None
+
+    Returns:
+        The typed DataFrame (df itself is not modified)
+    """
+    if df is None:
+        return None
+    converted = {}
+    for columns, convert in CONVERTERS:
+        for col in columns:
+            if col in df.columns:
+                series = df[col]
+                typed = convert(series)
+                if typed is not series:
+                    converted[col] = typed
+    return df.assign(**converted) if converted else df
+
+
+def set_category_value(df, rows, column, value):
+    """
+    Set df.loc[rows, column] = value, registering value as a category first if needed.
+
+    Args:
+        df: DataFrame to update in place
+        rows: Index labels or boolean mask selecting the rows
+        column: Column to set
+        value: New value
+    """
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        df[column] = series.cat.add_categories([value])
+    df.loc[rows, column] = value
+
+
+def format_date(value):
+    """Render a DOB for display as YYYY-MM-DD ('' when missing)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, str):
+        return value
+    return pd.Timestamp(value).strftime(DATE_FORMAT)
@@ -0,0 +1,120 @@
+import logging
+import pandas as pd
+
+from models.schema import apply_schema
+
+# Assigned_Nurse values that mean "no nurse" (compared case-insensitively)
+UNASSIGNED_VALUES = {"none", "nan", ""}
+
+
+class ReportStatistics:
+    """
+    Aggregates shown in the Statistical Report and its PDF export.
+
+    Everything is computed in one vectorized pass over the combined data. Only
+    the nurse counts can change without the dataset being replaced, and those
+    are kept current by apply_assignment.
+    """
+
+    def __init__(self, total, nurse_counts, town_counts, town_positions=None, mean_dob=None, youngest=None, oldest=None):
+        self.total = total
+        self.nurse_counts = nurse_counts
+        self.town_counts = town_counts
+        # town -> row positions in the combined data, for drill-downs by iloc
+        self.town_positions = town_positions or {}
+        self.mean_dob = mean_dob
+        self.youngest = youngest
+        self.oldest = oldest
+
+    @property
+    def assigned(self):
+        return int(self.nurse_counts.sum())
+
+    @property
+    def unassigned(self):
+        return self.total - self.assigned
+
+    @property
+    def assigned_percentage(self):
+        return self.assigned / self.total * 100 if self.total > 0 else 0
+
+    @property
+    def nurse_total(self):
+        return len(self.nurse_counts)
+
+    def average_age(self, today=None):
+        """Average child age in years, or None when no DOB parses."""
+        if self.mean_dob is None:
+            return None
+        today = today or pd.Timestamp.today()
+        return (today - self.mean_dob).days / 365
+
+    def apply_assignment(self, previous_nurses, nurse_name):
+        """
+        Update the nurse counts after rows were reassigned.
+
+        Args:
+            previous_nurses: Series of the rows' Assigned_Nurse values before the change
+            nurse_name: Nurse the rows were assigned to
+        """
+        delta = _nurse_counts(previous_nurses)
+        counts = self.nurse_counts.sub(delta, fill_value=0)
+        if _is_assigned(nurse_name):
+            counts = counts.add(pd.Series({str(nurse_name).strip(): len(previous_nurses)}), fill_value=0)
+        counts = counts[counts > 0].astype(int)
+        self.nurse_counts = counts.sort_values(ascending=False, kind="stable")
+
+
+def _is_assigned(nurse):
+    return not pd.isna(nurse) and str(nurse).strip().lower() not in UNASSIGNED_VALUES
+
+
+def _nurse_counts(nurses):
+    """Count rows per assigned nurse, counting distinct values once rather than per row."""
+    counts = nurses.value_counts(dropna=True)
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str).str.strip()
+    counts = counts[[_is_assigned(name) for name in counts.index]]
+    return counts.groupby(level=0, sort=False).sum()
+
+
+def _child_summary(row):
+    return {
+        "Child_First_Name": row.get("Child_First_Name", ""),
+        "Child_Last_Name": row.get("Child_Last_Name", ""),
+        "Child_Date_of_Birth": row.get("Child_Date_of_Birth"),
+    }
+
+
+def compute_statistics(df):
+    """
+    Compute the report aggregates for a combined dataset without modifying it.
+
+    Args:
+        df: Combined DataFrame (typed or not)
+
+    Returns:
+        ReportStatistics
+    """
+    df = apply_schema(df)
+    nurse_counts = pd.Series(dtype=int)
+    if "Assigned_Nurse" in df.columns:
+        nurse_counts = _nurse_counts(df["Assigned_Nurse"]).sort_values(ascending=False, kind="stable")
+
+    town_counts = pd.Series(dtype=int)
+    town_positions = {}
+    if "City" in df.columns:
+        town_counts = df["City"].value_counts()
+        town_counts = town_counts[town_counts > 0]
+        town_positions = df.groupby("City", observed=True, sort=False).indices
+
+    stats = ReportStatistics(len(df), nurse_counts, town_counts, town_positions)
+    if "Child_Date_of_Birth" in df.columns:
+        dob = df["Child_Date_of_Birth"]
+        if dob.notna().any():
+            stats.mean_dob = dob.mean()
+            stats.youngest = _child_summary(df.loc[dob.idxmax()])
+            stats.oldest = _child_summary(df.loc[dob.idxmin()])
+
+    logging.info(f"Computed report statistics for {len(df)} rows.")
+    return stats
@@ -0,0 +1,250 @@
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_DB = 'users.db'
+
+# Each entry upgrades the schema by one version (tracked in PRAGMA user_version).
+# Append new migrations; never edit one that has shipped.
+MIGRATIONS = [
+    # 1: the users table the login screen has always created
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE,
+        password TEXT)
+    """,
+    # 2: assignment journal, visit log and notes
+    """
+    CREATE TABLE assignment_journal (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        changed_at TEXT NOT NULL,
+        mother_id TEXT,
+        child_first_name TEXT,
+        child_last_name TEXT,
+        child_dob TEXT,
+        previous_nurse TEXT,
+        nurse TEXT);
+    CREATE TABLE visit_log (
+        visit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mother_id TEXT,
+        child_first_name TEXT,
+        child_last_name TEXT,
+        nurse_name TEXT,
+        visit_time TEXT);
+    CREATE INDEX visit_log_child ON visit_log (child_first_name, child_last_name);
+    CREATE TABLE notes (
+        mother_id TEXT NOT NULL,
+        child_first_name TEXT NOT NULL,
+        child_last_name TEXT NOT NULL,
+        notes TEXT,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (mother_id, child_first_name, child_last_name));
+    """,
+    # 3: consecutive failed logins per user, for throttling
+    """
+    CREATE TABLE login_attempts (
+        username TEXT PRIMARY KEY,
+        failures INTEGER NOT NULL,
+        last_failure REAL NOT NULL)
+    """,
+    # 4: drop failures recorded for names that are not users (no longer recorded)
+    """
+    DELETE FROM login_attempts WHERE username NOT IN (SELECT username FROM users)
+    """,
+]
+
+
+def _text(value):
+    """A cell value as trimmed text: blanks and NaN become "", 98765.0 becomes "98765"."""
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _child_key(child_data):
+    """The (mother_id, first, last) key rows are stored under."""
+    return tuple(_text(child_data.get(column)) for column in ("Mother_ID", "Child_First_Name", "Child_Last_Name"))
+
+
+class Store:
+    """
+    The application's SQLite database: users, the assignment journal, the
+    visit log and profile notes.
+
+    Each thread gets one long-lived connection (sqlite3 connections cannot be
+    shared across threads), opened in WAL mode so readers do not block the
+    writer. sqlite3 keeps the compiled statements of each connection, so the
+    parameterized queries below are prepared once per thread. Pending
+    migrations are applied when a connection is opened.
+    """
+
+    _migrate_lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._migrate(conn)
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self, conn):
+        with self._migrate_lock:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                try:
+                    conn.executescript(f"BEGIN; {script}; PRAGMA user_version = {number}; COMMIT;")
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+                logging.info(f"Migrated '{self.path}' to schema version {number}.")
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements as one transaction, committed on success."""
+        conn = self.connection()
+        with conn:
+            yield conn
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Users
+    def password_hash(self, username):
+        """Return the stored bcrypt hash for username, or None if there is no such user."""
+        row = self.connection().execute(
+            "SELECT password FROM users WHERE username=?", (username,)).fetchone()
+        return row[0] if row else None
+
+    def add_user(self, username, password_hash):
+        """
+        Add a user.
+
+        Returns:
+            True, or False if the username is already taken
+        """
+        try:
+            with self.transaction() as conn:
+                conn.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password_hash))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def set_password_hash(self, username, password_hash):
+        """Replace a user's stored password hash."""
+        with self.transaction() as conn:
+            conn.execute("UPDATE users SET password=? WHERE username=?", (password_hash, username))
+
+    def login_failures(self, username):
+        """Return (consecutive failed logins, time of the last one) for username."""
+        row = self.connection().execute(
+            "SELECT failures, last_failure FROM login_attempts WHERE username=?", (username,)).fetchone()
+        return (row[0], row[1]) if row else (0, 0.0)
+
+    def record_login_failure(self, username, when):
+        """Count a failed login for username at time `when`."""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO login_attempts (username, failures, last_failure) VALUES (?, 1, ?) "
+                "ON CONFLICT(username) DO UPDATE SET failures=failures + 1, last_failure=excluded.last_failure",
+                (username, when))
+
+    def clear_login_failures(self, username):
+        """Reset the failed login count for username."""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM login_attempts WHERE username=?", (username,))
+
+    # Assignment journal
+    def journal_assignments(self, rows, nurses):
+        """
+        Record nurse assignments.
+
+        Args:
+            rows: DataFrame of the reassigned children, with their previous Assigned_Nurse
+            nurses: Nurse they were all assigned to, or one nurse per row
+        """
+        if isinstance(nurses, str):
+            nurses = [nurses] * len(rows)
+        now = datetime.now().isoformat(timespec='seconds')
+        entries = [
+            (now, *_child_key(row), _text(row.get("Child_Date_of_Birth")),
+             _text(row.get("Assigned_Nurse")), _text(nurse))
+            for row, nurse in zip(rows.to_dict(orient='records'), nurses)
+        ]
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO assignment_journal (changed_at, mother_id, child_first_name, child_last_name, "
+                "child_dob, previous_nurse, nurse) VALUES (?, ?, ?, ?, ?, ?, ?)", entries)
+
+    def assignment_history(self, child_data):
+        """Return the journal entries for a child, oldest first."""
+        return [dict(row) for row in self.connection().execute(
+            "SELECT * FROM assignment_journal WHERE mother_id=? AND child_first_name=? AND child_last_name=? "
+            "ORDER BY id", _child_key(child_data))]
+
+    # Visit log
+    def record_visit(self, child_data, nurse_name, visit_time):
+        """Add a visit and return its visit_id."""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO visit_log (mother_id, child_first_name, child_last_name, nurse_name, visit_time) "
+                "VALUES (?, ?, ?, ?, ?)", (*_child_key(child_data), nurse_name, visit_time))
+        return cursor.lastrowid
+
+    def visits_for(self, child_data):
+        """Return a child's visits, oldest first."""
+        return [dict(row) for row in self.connection().execute(
+            "SELECT * FROM visit_log WHERE mother_id=? AND child_first_name=? AND child_last_name=? "
+            "ORDER BY visit_time, visit_id", _child_key(child_data))]
+
+    def delete_visit(self, visit_id):
+        """Delete a visit; returns True if it existed."""
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM visit_log WHERE visit_id=?", (visit_id,)).rowcount > 0
+
+    # Notes
+    def note_for(self, child_data):
+        """Return the notes saved for a child, or None."""
+        row = self.connection().execute(
+            "SELECT notes FROM notes WHERE mother_id=? AND child_first_name=? AND child_last_name=?",
+            _child_key(child_data)).fetchone()
+        return row[0] if row else None
+
+    def save_note(self, child_data, notes):
+        """Save (replace) the notes for a child."""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO notes (mother_id, child_first_name, child_last_name, notes, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (*_child_key(child_data), notes, datetime.now().isoformat(timespec='seconds')))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DEFAULT_DB):
+    """Return the shared Store for path."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = Store(path)
+        return store
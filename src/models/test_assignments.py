@@ -0,0 +1,56 @@
+import unittest
+import pandas as pd
+from models.assignments import carry_forward_assignments
+from models.record_key import build_record_key
+
+
+class TestRecordKey(unittest.TestCase):
+
+    def test_key_ignores_id_type_case_and_date_format(self):
+        a = pd.DataFrame({
+            'Mother_ID': [98765],
+            'Child_First_Name': ['Alice'],
+            'Child_Last_Name': ['Doe'],
+            'Child_Date_of_Birth': ['2021-05-10'],
+        })
+        b = pd.DataFrame({
+            'Mother_ID': ['98765.0'],
+            'Child_First_Name': ['ALICE '],
+            'Child_Last_Name': ['doe'],
+            'Child_Date_of_Birth': [pd.Timestamp('2021-05-10')],
+        })
+        self.assertEqual(build_record_key(a)[0], build_record_key(b)[0])
+
+
+class TestCarryForwardAssignments(unittest.TestCase):
+
+    def setUp(self):
+        self.previous = pd.DataFrame({
+            'Mother_ID': [1, 2, 3],
+            'Child_First_Name': ['Alice', 'Bob', 'Cara'],
+            'Child_Last_Name': ['Doe', 'Smith', 'Lee'],
+            'Child_Date_of_Birth': ['2021-05-10', '2020-08-21', '2022-01-01'],
+            'Assigned_Nurse': ['Nurse A', 'Nurse B', 'Nurse C'],
+        })
+
+    def test_assignments_carried_dropped_and_conflicted(self):
+        combined = pd.DataFrame({
+            'Mother_ID': ['1', '2', '4'],
+            'Child_First_Name': ['Alice', 'Bob', 'Dan'],
+            'Child_Last_Name': ['Doe', 'Smith', 'Ray'],
+            'Child_Date_of_Birth': ['2021-05-10', '2020-08-21', '2023-03-03'],
+            'Assigned_Nurse': [None, 'Nurse Z', None],
+        })
+        result, report = carry_forward_assignments(combined, self.previous)
+        self.assertEqual(list(result['Assigned_Nurse']), ['Nurse A', 'Nurse B', 'None'])
+        self.assertEqual(report, {'carried': 1, 'dropped': 1, 'conflicted': 1})
+
+    def test_no_previous_dataset_marks_everyone_unassigned(self):
+        combined = self.previous.drop(columns=['Assigned_Nurse'])
+        result, report = carry_forward_assignments(combined, None)
+        self.assertTrue((result['Assigned_Nurse'] == 'None').all())
+        self.assertEqual(report['carried'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
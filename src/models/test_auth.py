@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from models import auth
+from models.store import Store
+
+
+class TestVerifyLogin(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = Store(os.path.join(self.tmp.name, 'users.db'))
+        self.store.add_user('nurse', auth.hash_password('secret', rounds=4))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_results(self):
+        self.assertEqual(auth.verify_login(self.store, 'nurse', 'secret', rounds=4).status, auth.OK)
+        self.assertEqual(auth.verify_login(self.store, 'nurse', 'wrong', rounds=4).status, auth.BAD_PASSWORD)
+        self.assertEqual(auth.verify_login(self.store, 'nobody', 'secret', rounds=4).status, auth.UNKNOWN_USER)
+
+    def test_unknown_users_cost_a_full_check_but_are_not_recorded(self):
+        for name in ('nobody', 'someone', 'anyone'):
+            self.assertEqual(auth.verify_login(self.store, name, 'secret', rounds=5).status, auth.UNKNOWN_USER)
+            self.assertEqual(self.store.login_failures(name), (0, 0.0))
+        self.assertEqual(auth.hash_rounds(auth._dummy_hash(5)), 5)
+        self.assertEqual(auth.hash_rounds(auth._dummy_hash(auth.BCRYPT_ROUNDS)), auth.BCRYPT_ROUNDS)
+
+    def test_repeated_failures_are_throttled_until_the_delay_passes(self):
+        for _ in range(auth.MAX_FAILURES):
+            auth.verify_login(self.store, 'nurse', 'wrong', now=1000, rounds=4)
+        result = auth.verify_login(self.store, 'nurse', 'secret', now=1001, rounds=4)
+        self.assertEqual(result, auth.LoginResult(auth.THROTTLED, auth.THROTTLE_SECONDS))
+
+        later = 1000 + auth.THROTTLE_SECONDS
+        self.assertEqual(auth.verify_login(self.store, 'nurse', 'secret', now=later, rounds=4).status, auth.OK)
+        self.assertEqual(self.store.login_failures('nurse'), (0, 0.0))
+
+    def test_login_upgrades_hash_when_cost_is_raised(self):
+        self.assertEqual(auth.verify_login(self.store, 'nurse', 'secret', rounds=5).status, auth.OK)
+        self.assertEqual(auth.hash_rounds(self.store.password_hash('nurse')), 5)
+        self.assertEqual(auth.verify_login(self.store, 'nurse', 'secret', rounds=5).status, auth.OK)
+
+
+if __name__ == '__main__':
+    unittest.main()
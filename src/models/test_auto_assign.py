@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from models.auto_assign import auto_assign, normalize_roster
+from models.data_model import DataModel
+
+
+class TestAutoAssign(unittest.TestCase):
+
+    def setUp(self):
+        self.combined = pd.DataFrame({
+            'ZIP': ['84601'] * 6 + ['84604'] * 2 + ['10001'] * 2,
+            'Assigned_Nurse': ['None'] * 9 + ['Nurse A'],
+        })
+        self.roster = normalize_roster(pd.DataFrame({
+            'Nurse Name': ['Nurse A', 'Nurse B', 'Nurse C'],
+            'Capacity': [4, 4, None],
+            'Home ZIP': [84601, '84601-1234', '10001'],
+        }))
+
+    def test_normalize_roster(self):
+        self.assertEqual(list(self.roster.columns), ['Nurse', 'Capacity', 'Home_ZIP'])
+        self.assertEqual(list(self.roster['Home_ZIP']), ['84601', '84601', '10001'])
+        with self.assertRaises(ValueError):
+            normalize_roster(pd.DataFrame({'Capacity': [1]}))
+
+    def test_balances_within_locality(self):
+        assignments, report = auto_assign(self.combined, self.roster)
+        self.assertEqual(report['assigned'], 9)
+        self.assertEqual(report['unplaced'], 0)
+        # The six 84601 children are split between the two nurses living there
+        local = assignments[self.combined.loc[assignments.index, 'ZIP'] == '84601'].value_counts()
+        self.assertEqual(sorted(local.to_dict().items()), [('Nurse A', 3), ('Nurse B', 3)])
+        self.assertEqual(assignments[8], 'Nurse C')
+        # Nurse A reaches an equal share first, so one 84604 child stays in the 846 area
+        # with Nurse B and the last one spills over to Nurse C
+        self.assertEqual(report['by_tier'], {'zip': 7, 'zip3': 1, 'any': 1})
+        self.assertEqual(report['max_load'], 4)
+
+    def test_capacity_is_respected(self):
+        roster = normalize_roster(pd.DataFrame({'Nurse': ['Nurse A'], 'Capacity': [3]}))
+        assignments, report = auto_assign(self.combined, roster)
+        # Nurse A already has one child, so only two more fit
+        self.assertEqual(report['assigned'], 2)
+        self.assertEqual(report['unplaced'], 7)
+
+
+class TestModelBatchAssign(unittest.TestCase):
+
+    @patch('models.data_model.BackgroundWriter')
+    def test_auto_assign_writes_one_batch(self, mock_writer):
+        model = DataModel()
+        model.combined_data = pd.DataFrame({
+            'Mother_ID': [1, 2, 3],
+            'ZIP': ['84601', '84601', '10001'],
+            'Assigned_Nurse': ['None', 'None', 'None'],
+        })
+        version = model.version
+        report = model.auto_assign_nurses(pd.DataFrame({'Nurse': ['Nurse X', 'Nurse Y'], 'Home ZIP': ['84601', '10001']}))
+
+        self.assertEqual(report['assigned'], 3)
+        self.assertEqual(list(model.combined_data['Assigned_Nurse']), ['Nurse X', 'Nurse X', 'Nurse Y'])
+        self.assertEqual(model.version, version + 1)
+        model.writer.submit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
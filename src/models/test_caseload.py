@@ -0,0 +1,50 @@
+import unittest
+import pandas as pd
+from models.caseload import CASELOAD_COLUMNS, compute_caseload
+
+
+class TestComputeCaseload(unittest.TestCase):
+
+    def setUp(self):
+        self.combined = pd.DataFrame({
+            'Mother_ID': [1, 2, 3, 4, 5],
+            'Child_First_Name': ['Ann', 'Bob', 'Cy', 'Di', 'Ed'],
+            'Child_Last_Name': ['A', 'B', 'C', 'D', 'E'],
+            'Child_Date_of_Birth': ['2024-06-01', '2023-01-01', '2020-01-01', '2024-01-01', None],
+            'City': ['Provo', 'Provo', 'Orem', 'Provo', 'Lehi'],
+            'ZIP': [84601, 84601, 84057, 84601, 84043],
+            'Assigned_Nurse': ['Nurse A', 'Nurse A', 'Nurse B', 'None', 'Nurse B'],
+        })
+        self.visits = pd.DataFrame({
+            'Mother_ID': [1, 1, 3, 9],
+            'Child_First_Name': ['ANN', 'Ann', 'Cy', 'Zed'],
+            'Child_Last_Name': ['a', 'A', 'C', 'Z'],
+            'Nurse_Name': ['Nurse A', 'Nurse A', 'Nurse B', 'Nurse C'],
+            'Visit_Time': ['2025-01-10', '2024-12-01', '2025-01-05 10:00:00', '2025-01-01'],
+        })
+
+    def test_caseload_per_nurse(self):
+        table = compute_caseload(self.combined, today='2025-01-15').set_index('Nurse')
+        self.assertEqual(list(table.index), ['Nurse A', 'Nurse B'])
+        self.assertEqual(table.loc['Nurse A', 'Active_Caseload'], 2)
+        self.assertEqual(table.loc['Nurse A', 'Age_Under_1'], 1)
+        self.assertEqual(table.loc['Nurse A', 'Age_2_Plus'], 1)
+        self.assertEqual(table.loc['Nurse A', 'Top_Town'], 'Provo')
+        self.assertEqual(table.loc['Nurse B', 'Towns'], 2)
+        self.assertEqual(table.loc['Nurse B', 'ZIPs'], 2)
+        self.assertEqual(table.loc['Nurse B', 'Recent_Visits'], 0)
+
+    def test_visits_are_joined_to_children(self):
+        table = compute_caseload(self.combined, self.visits, today='2025-01-15').set_index('Nurse')
+        self.assertEqual(list(table.reset_index().columns), CASELOAD_COLUMNS)
+        # Only the visit within the last 30 days counts as recent
+        self.assertEqual(table.loc['Nurse A', 'Recent_Visits'], 1)
+        self.assertEqual(table.loc['Nurse A', 'Children_Visited'], 1)
+        self.assertEqual(table.loc['Nurse B', 'Children_Visited'], 1)
+        # Nurses who only appear in the log are listed with no caseload
+        self.assertEqual(table.loc['Nurse C', 'Active_Caseload'], 0)
+        self.assertEqual(table.loc['Nurse C', 'Children_Visited'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import pandas as pd
+from models.child_keys import build_child_keys, child_key, match_child
+
+
+class TestChildKeys(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Mother_ID': [98765, 54321.0, '98765'],
+            'Child_First_Name': ['Alice', ' BOB ', 'alice'],
+            'Child_Last_Name': ['Doe', 'Smith', 'DOE'],
+            'Nurse_Name': ['A', 'B', 'C'],
+        })
+
+    def test_keys_are_folded_and_aligned(self):
+        keys = build_child_keys(self.df)
+        self.assertEqual(list(keys.columns), ['mother_id', 'first', 'last'])
+        self.assertEqual(list(keys['mother_id']), ['98765', '54321', '98765'])
+        self.assertEqual(list(keys['first']), ['alice', 'bob', 'alice'])
+        self.assertTrue(keys.index.equals(self.df.index))
+
+    def test_match_child_ignores_case_and_id_type(self):
+        keys = build_child_keys(self.df)
+        child = {'Mother_ID': '98765', 'Child_First_Name': 'ALICE', 'Child_Last_Name': 'doe'}
+        self.assertEqual(list(self.df[match_child(keys, child)]['Nurse_Name']), ['A', 'C'])
+        self.assertEqual(child_key(child), {'mother_id': '98765', 'first': 'alice', 'last': 'doe'})
+
+    def test_match_child_on_selected_fields(self):
+        keys = build_child_keys(self.df)
+        child = {'Child_First_Name': 'Bob', 'Child_Last_Name': 'Smith'}
+        self.assertFalse(match_child(keys, child).any())
+        self.assertEqual(match_child(keys, child, fields=('first', 'last')).sum(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from app_crypto import Crypto
+from models.data_model import DataModel
+from models.errors import DataModelError
+
+
+class TestCombineData(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+        self.model = DataModel()
+        self.model.data_frames = [
+            pd.DataFrame({
+                'Child_Last_Name': ['Doe', 'Smith', 'Ray'],
+                'Child_First_Name': ['Alice', 'Bob', 'Dan'],
+                'DOB': ['2021-05-10', '2020-08-21', '2019-01-01'],
+                'Mother_Last_Name': ['Doe', 'Smith', 'Ray'],
+                'Mother_First_Name': ['Jane', 'John', 'Dana'],
+                'City': ['Provo', 'Orem', 'Lehi'],
+            }),
+            pd.DataFrame({
+                'Mother_First_Name': ['Jane', 'John'],
+                'Last_Name': ['Doe', 'Smith'],
+                'Mother_ID': [98765, 54321],
+                'Child_DOB': ['2021-05-10', '2020-08-21'],
+            }),
+        ]
+
+    def tearDown(self):
+        self.model.flush_writes()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_failures_raise_instead_of_showing_dialogs(self):
+        model = DataModel()
+        with self.assertRaises(DataModelError):
+            model.combine_data()
+        with self.assertRaises(DataModelError) as raised:
+            model.read_excel_file('missing.xlsx')
+        self.assertIn('missing.xlsx', raised.exception.message)
+        with self.assertRaises(DataModelError):
+            model.load_combined_data()
+
+    def test_side_outputs_are_deferred_until_viewed(self):
+        self.assertTrue(self.model.combine_data())
+        self.assertEqual(len(self.model.combined_data), 2)
+
+        # Counts for the badges are known without writing the side files
+        self.assertEqual(self.model.unmatched_count, 1)
+        self.assertEqual(self.model.duplicate_group_count(), 0)
+        self.assertFalse(os.path.exists('unmatched_data.xlsx'))
+
+        unmatched = self.model.unmatched_data
+        self.assertEqual(list(unmatched['Source']), ['Database'])
+        self.model.flush_writes()
+        self.assertTrue(os.path.exists('unmatched_data.xlsx'))
+
+    def test_side_outputs_keep_no_copy_of_the_combined_data(self):
+        self.model.data_frames[0] = pd.concat([self.model.data_frames[0]] * 2, ignore_index=True)
+        self.model.data_frames[1] = pd.concat([self.model.data_frames[1]] * 2, ignore_index=True)
+        self.assertTrue(self.model.combine_data())
+
+        captured = [cell.cell_contents for cell in self.model._duplicates._loader.__closure__]
+        self.assertFalse(any(isinstance(value, pd.DataFrame) for value in captured))
+        duplicates = self.model.duplicate_data
+        self.assertFalse(duplicates.empty)
+        # Built from the typed combined data
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(duplicates['Child_Date_of_Birth']))
+
+    def test_duplicate_groups_follow_changes_to_the_data(self):
+        self.model.data_frames[0] = pd.concat([self.model.data_frames[0].iloc[[0]], self.model.data_frames[0]],
+                                              ignore_index=True)
+        self.assertTrue(self.model.combine_data())
+        self.assertEqual(self.model.duplicate_group_count(), 1)
+
+        # Same length, different rows at each position
+        self.model.combined_data = self.model.combined_data.iloc[::-1].reset_index(drop=True)
+
+        duplicates = self.model.duplicate_data
+        self.assertEqual(list(duplicates['Child_First_Name']), ['Alice', 'Alice'])
+
+    def test_failed_side_output_raises_and_can_be_retried(self):
+        self.assertTrue(self.model.combine_data())
+        with patch.object(DataModel, '_build_unmatched_data', side_effect=ValueError("boom")):
+            with self.assertRaises(DataModelError) as raised:
+                self.model.unmatched_data
+        self.assertIn('boom', raised.exception.message)
+        self.assertEqual(len(self.model.unmatched_data), 1)
+
+    def test_unreadable_previous_assignments_abort_the_combine(self):
+        self.assertTrue(self.model.combine_data())
+        self.model.assign_nurse([0], 'Nurse A')
+        Crypto.generateKey()
+        self.model.encrypt_file('combined_matched_data.xlsx')
+        with open('combined_matched_data.xlsx', 'rb') as f:
+            saved = f.read()
+        Crypto.generateKey()  # a different key than the file was encrypted with
+
+        model = DataModel()
+        model.data_frames = self.model.data_frames
+        with self.assertRaises(DataModelError) as raised:
+            model.combine_data()
+        self.assertIn('different key', raised.exception.message)
+        self.assertIsNone(model.combined_data)
+        model.flush_writes()
+        with open('combined_matched_data.xlsx', 'rb') as f:
+            self.assertEqual(f.read(), saved)
+
+    def test_combined_file_written_in_background(self):
+        self.assertTrue(self.model.combine_data())
+        self.model.assign_nurse([0], 'Nurse A')
+        self.model.flush_writes()
+
+        saved = pd.read_excel('combined_matched_data.xlsx')
+        self.assertEqual(len(saved), 2)
+        self.assertEqual(saved.loc[0, 'Assigned_Nurse'], 'Nurse A')
+
+    def test_combined_data_uses_typed_schema(self):
+        self.assertTrue(self.model.combine_data())
+        df = self.model.combined_data
+
+        self.assertIsInstance(df['Assigned_Nurse'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df['City'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['Child_Date_of_Birth']))
+        self.assertEqual(list(df['Mother_ID']), ['98765', '54321'])
+
+        # Typed lookups accept IDs and dates in whatever form the views hand over
+        child = {'Mother_ID': 54321.0, 'Child_First_Name': 'BOB',
+                 'Child_Last_Name': 'smith', 'Child_Date_of_Birth': '2020-08-21'}
+        self.assertTrue(self.model.update_child_assigned_nurse(child, 'Nurse B'))
+        self.assertEqual(df.loc[self.model.locate_child(child)[0], 'Assigned_Nurse'], 'Nurse B')
+        self.assertEqual(self.model.batch_update_nurses('Nurse C', 'provo', '', ''), 1)
+
+    def test_child_keys_stay_out_of_the_data(self):
+        self.assertTrue(self.model.combine_data())
+        keys = self.model.child_keys
+        self.assertEqual(list(keys['first']), ['alice', 'bob'])
+        self.assertFalse(any(col in self.model.combined_data.columns for col in keys.columns))
+
+        # Keys are rebuilt whenever a new dataset is set
+        self.model.combined_data = self.model.combined_data.iloc[1:]
+        self.assertEqual(list(self.model.child_keys['first']), ['bob'])
+
+    def test_visit_log_for_child(self):
+        pd.DataFrame({
+            'Visit_ID': [1, 2],
+            'Mother_ID': [98765, 54321],
+            'Child_First_Name': ['Alice', 'Bob'],
+            'Child_Last_Name': ['Doe', 'Smith'],
+            'Nurse_Name': ['Nurse A', 'Nurse B'],
+            'Visit_Time': ['2024-01-01', '2024-01-02'],
+        }).to_excel('nurse_log.xlsx', index=False)
+        child = {'Mother_ID': '98765', 'Child_First_Name': 'ALICE', 'Child_Last_Name': 'doe'}
+        self.assertEqual(list(self.model.visit_log_for(child)['Nurse_Name']), ['Nurse A'])
+        self.assertTrue(self.model.visit_log_for(child, path='missing.xlsx').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
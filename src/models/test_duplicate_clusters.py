@@ -0,0 +1,41 @@
+import unittest
+import pandas as pd
+from models.duplicate_clusters import assign_duplicate_groups, duplicate_group_count, find_duplicates
+
+
+class TestDuplicateClusters(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Mother_ID': [1, 1, 2, 3, 3, 9, 7],
+            'Child_First_Name': ['Alice', 'alice', 'Bob', 'Cara', 'Lee', 'Cara', 'Dan'],
+            'Child_Last_Name': ['Doe', 'Doe', 'Smith', 'Lee', 'Cara', 'Lee', 'Ray'],
+            'Child_Date_of_Birth': ['2021-05-10', '2021-05-10', '2020-08-21',
+                                    '2022-01-01', '2022-01-01', '2022-01-01', '2020-08-21'],
+        })
+
+    def test_exact_and_near_duplicates_are_grouped_transitively(self):
+        group_ids, sizes = assign_duplicate_groups(self.df)
+        # Rows 0-1 are exact duplicates; 3-4 are swapped names and 5 is an ID typo of 3
+        self.assertEqual(list(group_ids), [1, 1, 0, 2, 2, 2, 0])
+        self.assertEqual(list(sizes), [2, 2, 1, 3, 3, 3, 1])
+
+    def test_find_duplicates_returns_group_columns(self):
+        duplicates = find_duplicates(self.df)
+        self.assertEqual(len(duplicates), 5)
+        self.assertEqual(duplicate_group_count(duplicates), 2)
+        self.assertIn('Duplicate_Group_Size', duplicates.columns)
+
+    def test_blank_names_do_not_cluster(self):
+        df = pd.DataFrame({
+            'Mother_ID': [1, 2],
+            'Child_First_Name': [None, None],
+            'Child_Last_Name': [None, None],
+            'Child_Date_of_Birth': ['2021-05-10', '2021-05-10'],
+        })
+        group_ids, _ = assign_duplicate_groups(df)
+        self.assertEqual(list(group_ids), [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
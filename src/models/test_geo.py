@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from models import geo
+from models.auto_assign import auto_assign, normalize_roster
+from models.data_model import DataModel
+from models.errors import DataModelError
+from models.geo import ChildGeoIndex, GeoIndex, locate_zips, read_zip_centroids
+
+# Approximate ZCTA centroids, enough to test distances
+CENTROIDS_CSV = """ZIP,Latitude,Longitude
+84601,40.2338,-111.6585
+84057,40.3133,-111.7010
+84101,40.7559,-111.8967
+10001,40.7506,-73.9972
+"""
+
+GAZETTEER_TSV = (
+    "GEOID\tALAND\tINTPTLAT\tINTPTLONG                    \n"
+    "84601\t1\t40.2338\t-111.6585\n"
+    "02134\t1\t42.3580\t-71.1297\n"
+)
+
+
+class TestGeo(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "zip_centroids.csv")
+        with open(self.path, "w") as f:
+            f.write(CENTROIDS_CSV)
+        self.centroids = read_zip_centroids(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_reads_gazetteer_format(self):
+        path = os.path.join(self.tmpdir.name, "gazetteer.txt")
+        with open(path, "w") as f:
+            f.write(GAZETTEER_TSV)
+        centroids = read_zip_centroids(path)
+        self.assertEqual(list(centroids.index), ["84601", "02134"])
+        self.assertAlmostEqual(centroids.loc["02134", "Longitude"], -71.1297)
+
+    def test_missing_file_gives_empty_table(self):
+        self.assertTrue(geo.load_zip_centroids(os.path.join(self.tmpdir.name, "missing.csv")).empty)
+
+    def test_radius_and_nearest_queries(self):
+        index = GeoIndex(self.centroids["Latitude"], self.centroids["Longitude"])
+        lat, lon = locate_zips(self.centroids, ["84601", 10001, "99999"])
+        within = index.within(lat, lon, 10)
+        self.assertEqual([list(found) for found in within], [[0, 1], [3], []])
+        # Provo to Salt Lake City is about 38 miles
+        self.assertEqual(list(index.within(lat[:1], lon[:1], 40)[0]), [0, 1, 2])
+
+        miles, positions = index.nearest(lat, lon, k=2)
+        self.assertEqual(list(positions[0]), [0, 1])
+        self.assertAlmostEqual(miles[0, 0], 0, places=6)
+        self.assertTrue(5 < miles[0, 1] < 7)
+        self.assertEqual(list(positions[2]), [-1, -1])
+        self.assertTrue(np.isinf(miles[2]).all())
+
+    def test_numpy_fallback_matches_tree(self):
+        rng = np.random.default_rng(0)
+        lat, lon = rng.uniform(25, 49, 500), rng.uniform(-124, -67, 500)
+        queries = (rng.uniform(25, 49, 40), rng.uniform(-124, -67, 40))
+        tree = GeoIndex(lat, lon)
+        with patch("models.geo.cKDTree", None), patch("models.geo._BLOCK", 1000):
+            brute = GeoIndex(lat, lon)
+            self.assertIsNone(brute._tree)
+            brute_within = brute.within(*queries, 150)
+            brute_miles, brute_positions = brute.nearest(*queries, k=5)
+        for a, b in zip(tree.within(*queries, 150), brute_within):
+            self.assertEqual(list(a), list(b))
+        tree_miles, tree_positions = tree.nearest(*queries, k=5)
+        np.testing.assert_allclose(tree_miles, brute_miles)
+        np.testing.assert_array_equal(tree_positions, brute_positions)
+
+    def test_child_index(self):
+        df = pd.DataFrame({"ZIP": ["84601", "84057", "84601", "10001", "", "84101"]})
+        index = ChildGeoIndex(df, self.centroids)
+        self.assertEqual(index.located, 5)
+        self.assertEqual(list(index.within("84601", 10)[0]), [0, 1, 2])
+        self.assertEqual(list(index.within(["10001", "00000"], 10)[1]), [])
+        self.assertEqual(sorted(index.nearest("84601", 3)), [0, 1, 2])
+
+    def test_auto_assign_nearby_tier(self):
+        combined = pd.DataFrame({
+            "ZIP": ["84057"] * 2 + ["10001"],
+            "Assigned_Nurse": ["None"] * 3,
+        })
+        roster = normalize_roster(pd.DataFrame({
+            "Nurse": ["Provo Nurse", "SLC Nurse"],
+            "Capacity": [5, 5],
+            "Home ZIP": ["84601", "84101"],
+        }))
+        assignments, report = auto_assign(combined, roster, centroids=self.centroids, nearby_miles=20)
+        self.assertEqual(report["by_tier"], {"zip": 0, "zip3": 0, "nearby": 2, "any": 1})
+        self.assertEqual(list(assignments[:2]), ["Provo Nurse", "Provo Nurse"])
+
+    def test_batch_update_by_radius(self):
+        model = DataModel()
+        model.combined_data = pd.DataFrame({
+            "City": ["Provo", "Orem", "Salt Lake City", "New York"],
+            "State": ["UT", "UT", "UT", "NY"],
+            "ZIP": ["84601", "84057", "84101", "10001"],
+            "Assigned_Nurse": ["None"] * 4,
+        })
+        with patch("models.data_model.load_zip_centroids", return_value=self.centroids), \
+                patch.object(model, "save_combined_data"):
+            self.assertEqual(model.batch_update_nurses("Nurse A", "", "", "84601", radius_miles=10), 2)
+            self.assertEqual(len(model.children_near("84601", 50)), 3)
+        self.assertEqual(list(model.combined_data["Assigned_Nurse"].astype(str)),
+                         ["Nurse A", "Nurse A", "None", "None"])
+
+    def test_radius_without_centroids_is_an_error(self):
+        model = DataModel()
+        model.combined_data = pd.DataFrame({"City": ["Provo"], "State": ["UT"], "ZIP": ["84601"],
+                                            "Assigned_Nurse": ["None"]})
+        empty = self.centroids.iloc[0:0]
+        with patch("models.data_model.load_zip_centroids", return_value=empty), \
+                patch.object(model, "save_combined_data"):
+            with self.assertRaises(DataModelError):
+                model.batch_update_nurses("Nurse A", "", "", "84601", radius_miles=10)
+            # The exact ZIP still works
+            self.assertEqual(model.batch_update_nurses("Nurse A", "", "", "84601"), 1)
+
+    def test_bundled_table_covers_the_service_area(self):
+        self.assertTrue(geo.has_zip_centroids())
+        centroids = geo.load_zip_centroids()
+        lat, lon = locate_zips(centroids, ["84601", "84057"])  # Provo, Orem: about 6 miles apart
+        index = GeoIndex(lat[1:], lon[1:])
+        self.assertEqual(len(index.within(lat[:1], lon[:1], 10)[0]), 1)
+        self.assertEqual(len(index.within(lat[:1], lon[:1], 2)[0]), 0)
+
+    def test_empty_centroid_file_disables_distance_features(self):
+        empty = os.path.join(self.tmpdir.name, "empty.csv")
+        with open(empty, "w") as f:
+            f.write("ZIP,Latitude,Longitude\n")
+        self.assertTrue(geo.has_zip_centroids(self.path))
+        self.assertFalse(geo.has_zip_centroids(empty))
+        self.assertFalse(geo.has_zip_centroids(os.path.join(self.tmpdir.name, "missing.csv")))
+
+
+if __name__ == "__main__":
+    unittest.main()
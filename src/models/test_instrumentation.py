@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from models.data_model import COMBINE_STAGES, DataModel
+from models.instrumentation import Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_spans_nest_and_export(self):
+        log = os.path.join(self.tmp.name, 'spans.jsonl')
+        instrumentation = Instrumentation(span_log=log)
+        with instrumentation.span('combine', rows_in=10):
+            with instrumentation.span('join', rows_in=10) as join:
+                join.rows_out = 4
+        with self.assertRaises(ValueError):
+            with instrumentation.span('join'):
+                raise ValueError()
+
+        with open(log) as f:
+            spans = [json.loads(line) for line in f]
+        self.assertEqual([(s['name'], s['parent']) for s in spans], [('join', 'combine'), ('combine', None), ('join', None)])
+        self.assertEqual(spans[0]['rows_out'], 4)
+        self.assertEqual(spans[2]['error'], 'ValueError')
+
+        text = instrumentation.to_prometheus()
+        self.assertIn('nursefilter_stage_runs_total{stage="join"} 2', text)
+        self.assertIn('nursefilter_stage_errors_total{stage="join"} 1', text)
+        self.assertIn('nursefilter_stage_rows{stage="join"} 4', text)
+
+    def test_combine_reports_progress_per_stage(self):
+        model = DataModel(output_dir=self.tmp.name)
+        model.data_frames = [
+            pd.DataFrame({'DOB': ['2021-05-10', '2020-08-21'], 'Mother_Last_Name': ['Doe', 'Smith'],
+                          'Mother_First_Name': ['Jane', 'John'], 'Child_First_Name': ['Al', 'Bo'],
+                          'Child_Last_Name': ['Doe', 'Smith']}),
+            pd.DataFrame({'Mother_First_Name': ['Jane'], 'Last_Name': ['Doe'], 'Mother_ID': [98765],
+                          'Child_DOB': ['2021-05-10']}),
+        ]
+        progress = []
+        model.combine_data(progress_callback=lambda message, percent: progress.append((message, percent)))
+        model.flush_writes()
+
+        self.assertEqual([message for message, _ in progress],
+                         [message for _, message, _ in COMBINE_STAGES] + ['Data combined'])
+        percents = [percent for _, percent in progress]
+        self.assertEqual(percents, sorted(percents))
+        self.assertEqual((percents[0], percents[-1]), (0, 100))
+        self.assertEqual(model.instrumentation.totals['combine']['rows_out'], 1)
+        self.assertEqual(model.instrumentation.totals['write']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
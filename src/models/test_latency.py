@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from models import profiling
+from models.latency import LatencyMonitor
+
+
+class FakeRoot:
+
+    def after(self, ms, callback):
+        self.callback = callback
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        self.callback = None
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Controller:
+
+    def show_profile(self, monitor, clock):
+        # Block "the Tk thread" while the watchdog looks at it
+        clock.now += 1.0
+        watchdog = threading.Thread(target=monitor.check)
+        watchdog.start()
+        watchdog.join()
+
+
+class TestLatencyMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.clock = Clock()
+        self.monitor = LatencyMonitor(self.root, interval_ms=100, threshold_ms=200, clock=self.clock)
+        self.monitor.tk_thread = threading.get_ident()
+        self.monitor._schedule()
+
+    def beat(self, after_seconds):
+        self.clock.now += after_seconds
+        self.root.callback()
+
+    def test_lag_is_measured_against_the_heartbeat_interval(self):
+        self.beat(0.1)
+        self.beat(0.15)
+        self.beat(0.5)
+
+        summary = self.monitor.summary()
+        self.assertEqual(summary["beats"], 3)
+        self.assertEqual(summary["max_lag_ms"], 400.0)
+        self.assertEqual(summary["p50_lag_ms"], 50.0)
+        # Too short for the watchdog to see, so the action is unknown
+        self.assertEqual(summary["stalls"], 1)
+        self.assertEqual(summary["stalls_by_action"], {"(unknown)": {"count": 1, "total_ms": 400.0, "max_ms": 400.0}})
+
+    def test_watchdog_captures_the_running_action(self):
+        profiling.instrument([(__name__, "Controller", ["show_profile"])])
+
+        Controller().show_profile(self.monitor, self.clock)
+        self.monitor.check()  # the same stall is only captured once
+        self.root.callback()
+
+        stall = self.monitor.summary()["recent_stalls"][0]
+        self.assertEqual(stall["action"], "Controller.show_profile")
+        self.assertEqual(stall["lag_ms"], 900.0)
+        self.assertTrue(any("show_profile" in line for line in stall["stack"]))
+        self.assertEqual(self.monitor.stall_count, 1)
+
+    def test_report_is_written_on_stop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.monitor.report_path = os.path.join(tmp, "latency.json")
+            self.beat(0.1)
+            self.monitor.stop()
+
+            with open(self.monitor.report_path) as f:
+                self.assertEqual(json.load(f)["beats"], 1)
+        self.assertIsNone(self.root.callback)
+
+
+if __name__ == '__main__':
+    unittest.main()
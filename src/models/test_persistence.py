@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from models.persistence import BackgroundWriter
+
+
+class TestBackgroundWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'combined_matched_data.xlsx')
+        self.writer = BackgroundWriter()
+
+    def tearDown(self):
+        self.writer.flush()
+        self.tmp.cleanup()
+
+    def test_newest_snapshot_is_written(self):
+        df = pd.DataFrame({'Assigned_Nurse': ['Nurse A']})
+        self.writer.submit(df, self.path)
+        df.loc[0, 'Assigned_Nurse'] = 'Nurse B'
+        self.writer.submit(df, self.path)
+        self.writer.flush()
+
+        self.assertEqual(pd.read_excel(self.path).loc[0, 'Assigned_Nurse'], 'Nurse B')
+        self.assertEqual(os.listdir(self.tmp.name), ['combined_matched_data.xlsx'])
+
+    def test_interrupted_write_leaves_the_previous_file(self):
+        self.writer.submit(pd.DataFrame({'Assigned_Nurse': ['Nurse A']}), self.path)
+        self.writer.flush()
+
+        def truncated(df, f, **kwargs):
+            f.write(b'PK')
+            raise OSError("disk full")
+
+        with patch.object(pd.DataFrame, 'to_excel', truncated):
+            self.writer.submit(pd.DataFrame({'Assigned_Nurse': ['Nurse B']}), self.path)
+            self.writer.flush()
+
+        self.assertEqual(pd.read_excel(self.path).loc[0, 'Assigned_Nurse'], 'Nurse A')
+        self.assertEqual(os.listdir(self.tmp.name), ['combined_matched_data.xlsx'])
+
+
+if __name__ == '__main__':
+    unittest.main()
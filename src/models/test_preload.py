@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from app_crypto import Crypto
+from models.data_model import DataModel
+from models.preload import CACHE_SUFFIX, Preloader, read_combined_file
+
+
+class TestPreload(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        Crypto.generateKey()
+        self.key = Crypto.loadKey()
+        self.df = pd.DataFrame({
+            'Child_First_Name': ['Alice', 'Bob'],
+            'Child_Last_Name': ['Doe', 'Smith'],
+            'Assigned_Nurse': ['Nurse A', None],
+        })
+        self.path = 'combined_matched_data.xlsx'
+        self.df.to_excel(self.path, index=False)
+        Crypto.encrypt_file(self.path, self.key)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_reads_encrypted_file_in_memory_and_caches_it(self):
+        with open(self.path, 'rb') as f:
+            encrypted = f.read()
+        df = read_combined_file(self.path, self.key)
+        self.assertEqual(df['Child_First_Name'].tolist(), ['Alice', 'Bob'])
+        # The workbook is untouched and the cache is encrypted too
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), encrypted)
+        self.assertTrue(Crypto.is_encrypted(self.path + CACHE_SUFFIX, False))
+
+        # Decrypting the workbook in place does not invalidate the cache
+        Crypto.decrypt_file(self.path, self.key)
+        with patch('models.preload.pd.read_excel') as read_excel:
+            cached = read_combined_file(self.path, self.key)
+        read_excel.assert_not_called()
+        pd.testing.assert_frame_equal(cached, df)
+
+    def test_changed_file_is_not_handed_out(self):
+        preloader = Preloader()
+        preloader.start(self.path, self.key).result()
+        pd.DataFrame({'Child_First_Name': ['Carl']}).to_excel(self.path, index=False)
+        os.utime(self.path, ns=(0, 0))
+        self.assertIsNone(preloader.take(self.path))
+
+    def test_load_uses_preloaded_data(self):
+        model = DataModel()
+        self.assertTrue(model.preload_combined_data())
+        model.preloader._future.result()
+        with patch('models.preload.pd.read_excel') as read_excel:
+            self.assertTrue(model.load_combined_data())
+        read_excel.assert_not_called()
+        self.assertEqual(model.combined_data['Assigned_Nurse'].tolist(), ['Nurse A', 'None'])
+        # Neither the preload nor the load decrypts the file on disk
+        self.assertTrue(Crypto.is_encrypted(self.path, False))
+        self.assertEqual(os.path.abspath(self.path), open('recent_combined.txt').read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+from models import profiling
+
+
+class Controller:
+
+    def show_combined_data(self, rows):
+        self.seen = profiling.current_action()
+        return sum(range(rows))
+
+    def save_nurse(self, nurse_name):
+        raise ValueError(nurse_name)
+
+
+ENTRY_POINTS = [(__name__, "Controller", ["show_combined_data", "save_nurse"])]
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        profiling.disable_profiling()
+        self.tmp.cleanup()
+
+    def test_actions_are_tracked_while_they_run(self):
+        profiling.instrument(ENTRY_POINTS)
+        profiling.instrument(ENTRY_POINTS)  # wrapping twice must not nest
+        controller = Controller()
+
+        self.assertEqual(controller.show_combined_data(10), 45)
+        self.assertEqual(controller.seen[0], "Controller.show_combined_data")
+        self.assertIsNone(profiling.current_action())
+        self.assertEqual(Controller.show_combined_data.__wrapped__.__name__, "show_combined_data")
+        self.assertFalse(hasattr(Controller.show_combined_data.__wrapped__, "_action_name"))
+
+    def test_profiles_and_summary_are_written(self):
+        profiler = profiling.enable_profiling(self.tmp.name, entry_points=ENTRY_POINTS)
+        controller = Controller()
+
+        controller.show_combined_data(1000)
+        controller.show_combined_data(10)
+        with self.assertRaises(ValueError):
+            controller.save_nurse("Nurse A")
+
+        files = sorted(os.listdir(self.tmp.name))
+        self.assertIn("0001-Controller.show_combined_data.prof", files)
+        self.assertIn("0003-Controller.save_nurse.txt", files)
+        with open(os.path.join(self.tmp.name, "0003-Controller.save_nurse.txt")) as f:
+            self.assertIn("failed: ValueError", f.read())
+
+        with open(os.path.join(self.tmp.name, "summary.json")) as f:
+            summary = json.load(f)
+        counts = {action["name"]: action["count"] for action in summary["actions"]}
+        self.assertEqual(counts, {"Controller.show_combined_data": 2, "Controller.save_nurse": 1})
+        self.assertEqual(len(summary["slowest"]), 3)
+        self.assertEqual(summary, profiler.summary())
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "summary.txt")))
+
+
+if __name__ == '__main__':
+    unittest.main()
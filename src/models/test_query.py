@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from models.data_model import DataModel
+from models.query import (AgeRange, Contains, Eq, In, Prefix, QueryIndex, Range, Unassigned,
+                          combine, field_predicate)
+from models.schema import apply_schema
+
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.df = apply_schema(pd.DataFrame({
+            'Mother_ID': [101, 102, 103, 104, 105],
+            'Child_First_Name': ['Alice', 'Bob', 'Cara', 'Dan', 'Eve'],
+            'Child_Last_Name': ['Smith', 'Jones', 'Smith', 'Brown', 'Lee'],
+            'Child_Date_of_Birth': ['2024-03-01', '2023-06-15', None, '2021-01-10', '2024-01-01'],
+            'City': ['Provo', ' provo', 'Orem', 'Salt Lake City', None],
+            'State': ['UT', 'UT', 'UT', 'UT', 'ID'],
+            'ZIP': [84601, 84604, 84057, 84101, 83201],
+            'Assigned_Nurse': ['None', 'Nurse A', None, '', 'Nurse B'],
+        }))
+        self.index = QueryIndex(self.df)
+
+    def rows(self, predicate):
+        return list(self.index.filter(predicate)['Child_First_Name'])
+
+    def test_column_predicates(self):
+        self.assertEqual(self.rows(Eq('City', 'PROVO')), ['Alice', 'Bob'])
+        self.assertEqual(self.rows(In('State', ['id', 'nv'])), ['Eve'])
+        self.assertEqual(self.rows(Prefix('ZIP', '846')), ['Alice', 'Bob'])
+        self.assertEqual(self.rows(Eq('Mother_ID', 103)), ['Cara'])
+        self.assertEqual(self.rows(Eq('Child_Date_of_Birth', '2024-3-1')), ['Alice'])
+        self.assertEqual(self.rows(Eq('Missing_Column', 'x')), [])
+        self.assertEqual(self.rows(Unassigned()), ['Alice', 'Cara', 'Dan'])
+
+    def test_ranges(self):
+        self.assertEqual(self.rows(Range('Child_Date_of_Birth', '2023-06-15', '2024-01-01')), ['Bob', 'Eve'])
+        self.assertEqual(self.rows(Range('Child_Date_of_Birth', low='2024-01-01')), ['Alice', 'Eve'])
+        self.assertEqual(self.rows(Range('Mother_ID', 102, 104)), ['Bob', 'Cara', 'Dan'])
+        today = pd.Timestamp('2024-06-15')
+        self.assertEqual(self.rows(AgeRange(max_years=1, today=today)), ['Alice', 'Eve'])
+        self.assertEqual(self.rows(AgeRange(1, 2, today=today)), ['Bob'])
+        self.assertEqual(self.rows(AgeRange(min_years=3, today=today)), ['Dan'])
+
+    def test_boolean_combinations(self):
+        self.assertEqual(self.rows(Eq('City', 'provo') & Unassigned()), ['Alice'])
+        self.assertEqual(self.rows(Eq('City', 'orem') | Eq('State', 'id')), ['Cara', 'Eve'])
+        self.assertEqual(self.rows(Eq('State', 'UT') & ~Prefix('ZIP', '846')), ['Cara', 'Dan'])
+        self.assertEqual(self.rows(combine([None, field_predicate('City', 'orem, provo')])), ['Alice', 'Bob', 'Cara'])
+        self.assertEqual(len(self.rows(combine([]))), 5)
+
+    def test_contains_across_columns(self):
+        self.assertEqual(self.rows(Contains('smi')), ['Alice', 'Cara'])
+        self.assertEqual(self.rows(Contains('nurse b')), ['Eve'])
+        self.assertEqual(self.rows(Contains('2023-06')), ['Bob'])
+        self.assertEqual(self.rows(Contains('lake', columns='City')), ['Dan'])
+
+    def test_field_predicate(self):
+        self.assertIsNone(field_predicate('City', '  '))
+        self.assertIsInstance(field_predicate('City', 'a, b'), In)
+        self.assertIsInstance(field_predicate('ZIP', '846*'), Prefix)
+        self.assertIsInstance(field_predicate('City', 'Provo'), Eq)
+
+    def test_model_keeps_index_current_after_assignment(self):
+        model = DataModel()
+        model.combined_data = self.df.copy()
+        with patch.object(model, 'save_combined_data'):
+            self.assertEqual(len(model.query(Unassigned())), 3)
+            count = model.batch_update_nurses('Nurse C', 'provo, orem', '', '', unassigned_only=True)
+            self.assertEqual(count, 2)
+            self.assertEqual(list(model.query(Unassigned())['Child_First_Name']), ['Dan'])
+            self.assertEqual(list(model.search('nurse c')['Child_First_Name']), ['Alice', 'Cara'])
+            # Any-of matching and a date-of-birth window
+            count = model.batch_update_nurses('Nurse D', '', 'ID', '846*', born_from='2024-01-01', match_any=True)
+            self.assertEqual(count, 3)
+        self.assertEqual(list(model.combined_data['Assigned_Nurse'].astype(str)),
+                         ['Nurse D', 'Nurse D', 'Nurse C', '', 'Nurse D'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+import pandas as pd
+from models.schema import apply_schema, format_date, set_category_value
+
+
+class TestApplySchema(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Mother_ID': [98765.0, np.nan, 123],
+            'Child_First_Name': ['Alice', None, 'Dan'],
+            'City': ['Provo', 'Orem', 'Provo'],
+            'ZIP': [84601, 84602, 84601],
+            'Assigned_Nurse': ['None', 'Nurse A', 'None'],
+            'Child_Date_of_Birth': ['2021-05-10', 'not a date', None],
+        })
+
+    def test_columns_get_canonical_types(self):
+        typed = apply_schema(self.df)
+
+        self.assertEqual(list(typed['Mother_ID']), ['98765', '', '123'])
+        self.assertEqual(list(typed['Child_First_Name']), ['Alice', '', 'Dan'])
+        self.assertEqual(list(typed['ZIP']), ['84601', '84602', '84601'])
+        for col in ('City', 'ZIP', 'Assigned_Nurse'):
+            self.assertIsInstance(typed[col].dtype, pd.CategoricalDtype)
+        self.assertEqual(typed.loc[0, 'Child_Date_of_Birth'], pd.Timestamp('2021-05-10'))
+        self.assertTrue(pd.isna(typed.loc[1, 'Child_Date_of_Birth']))
+        # The input frame is left as it was
+        self.assertEqual(self.df['Mother_ID'].dtype, float)
+
+    def test_applying_twice_is_a_no_op(self):
+        typed = apply_schema(self.df)
+        self.assertIs(apply_schema(typed), typed)
+        self.assertIsNone(apply_schema(None))
+
+    def test_set_category_value_adds_new_categories(self):
+        typed = apply_schema(self.df)
+        set_category_value(typed, [0, 2], 'Assigned_Nurse', 'Nurse B')
+        self.assertEqual(list(typed['Assigned_Nurse']), ['Nurse B', 'Nurse A', 'Nurse B'])
+
+    def test_format_date(self):
+        self.assertEqual(format_date(pd.Timestamp('2021-05-10')), '2021-05-10')
+        self.assertEqual(format_date(pd.NaT), '')
+        self.assertEqual(format_date('2021-05-10'), '2021-05-10')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from models.data_model import DataModel
+from models.statistics import compute_statistics
+
+
+class TestComputeStatistics(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Mother_ID': [1, 2, 3, 4],
+            'Child_First_Name': ['Ann', 'Bob', 'Cy', 'Di'],
+            'Child_Last_Name': ['A', 'B', 'C', 'D'],
+            'Child_Date_of_Birth': ['2010-01-01', '2012-06-30', 'unknown', '2011-03-15'],
+            'City': ['Provo', 'Orem', 'Provo', 'Provo'],
+            'Assigned_Nurse': ['None', 'Nurse A', None, ' Nurse A '],
+        })
+
+    def test_aggregates(self):
+        stats = compute_statistics(self.df)
+        self.assertEqual(stats.total, 4)
+        self.assertEqual(stats.assigned, 2)
+        self.assertEqual(stats.unassigned, 2)
+        self.assertEqual(stats.nurse_counts.to_dict(), {'Nurse A': 2})
+        self.assertEqual(stats.town_counts.to_dict(), {'Provo': 3, 'Orem': 1})
+        self.assertEqual(stats.youngest['Child_First_Name'], 'Bob')
+        self.assertEqual(stats.oldest['Child_First_Name'], 'Ann')
+        self.assertAlmostEqual(stats.average_age(pd.Timestamp('2021-01-01')), 9.78, places=2)
+        self.assertEqual(list(self.df.iloc[stats.town_positions['Provo']]['Child_First_Name']), ['Ann', 'Cy', 'Di'])
+        # The input frame is not modified
+        self.assertNotIn('dob_temp', self.df.columns)
+
+    def test_apply_assignment_matches_recompute(self):
+        stats = compute_statistics(self.df)
+        rows = [0, 1]
+        previous = self.df.loc[rows, 'Assigned_Nurse']
+        self.df.loc[rows, 'Assigned_Nurse'] = 'Nurse B'
+        stats.apply_assignment(previous, 'Nurse B')
+
+        fresh = compute_statistics(self.df)
+        self.assertEqual(stats.nurse_counts.to_dict(), fresh.nurse_counts.to_dict())
+        self.assertEqual(stats.assigned, 3)
+
+
+class TestModelStatisticsCache(unittest.TestCase):
+
+    @patch('models.data_model.BackgroundWriter')
+    def test_cached_until_data_changes(self, mock_writer):
+        model = DataModel()
+        model.combined_data = pd.DataFrame({
+            'Mother_ID': [1, 2],
+            'Child_First_Name': ['Ann', 'Bob'],
+            'Child_Last_Name': ['A', 'B'],
+            'Child_Date_of_Birth': ['2010-01-01', '2012-06-30'],
+            'Assigned_Nurse': ['None', 'None'],
+        })
+        stats = model.statistics()
+        self.assertIs(model.statistics(), stats)
+
+        # Assignments update the cached object in place
+        model.assign_nurse([0], 'Nurse A')
+        self.assertIs(model.statistics(), stats)
+        self.assertEqual(stats.assigned, 1)
+
+        # A new dataset invalidates the cache
+        model.combined_data = model.combined_data.iloc[:1]
+        self.assertIsNot(model.statistics(), stats)
+        self.assertEqual(model.statistics().total, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
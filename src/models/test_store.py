@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+import unittest
+import pandas as pd
+from models.data_model import DataModel
+from models.store import MIGRATIONS, Store
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = Store(os.path.join(self.tmp.name, 'users.db'))
+        self.child = {'Mother_ID': 98765.0, 'Child_First_Name': 'Alice', 'Child_Last_Name': 'Doe'}
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_schema_is_migrated_in_wal_mode(self):
+        conn = self.store.connection()
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], len(MIGRATIONS))
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        # A second store on the same file finds nothing left to migrate
+        other = Store(self.store.path)
+        self.assertIsNone(other.password_hash('nobody'))
+        other.close()
+
+    def test_users_notes_and_visits(self):
+        self.assertTrue(self.store.add_user('admin', b'hash'))
+        self.assertFalse(self.store.add_user('admin', b'other'))
+        self.assertEqual(self.store.password_hash('admin'), b'hash')
+
+        self.assertIsNone(self.store.note_for(self.child))
+        self.store.save_note(self.child, 'first')
+        self.store.save_note({**self.child, 'Mother_ID': '98765'}, 'second')
+        self.assertEqual(self.store.note_for(self.child), 'second')
+
+        visit_id = self.store.record_visit(self.child, 'Nurse A', '2024-01-02')
+        self.assertEqual([v['nurse_name'] for v in self.store.visits_for(self.child)], ['Nurse A'])
+        self.assertTrue(self.store.delete_visit(visit_id))
+        self.assertEqual(self.store.visits_for(self.child), [])
+
+    def test_each_thread_gets_its_own_connection(self):
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(self.store.connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], self.store.connection())
+
+    def test_data_model_journals_assignments(self):
+        model = DataModel(output_dir=self.tmp.name, store=self.store)
+        model.combined_data = pd.DataFrame({
+            'Mother_ID': [98765, 54321],
+            'Child_First_Name': ['Alice', 'Bob'],
+            'Child_Last_Name': ['Doe', 'Smith'],
+            'Child_Date_of_Birth': ['2021-05-10', '2020-08-21'],
+            'Assigned_Nurse': ['None', 'None'],
+        })
+        model.assign_nurse(model.combined_data.index[:1], 'Nurse A', save=False)
+        model.assign_nurse(model.combined_data.index[:1], 'Nurse B', save=False)
+        history = self.store.assignment_history(self.child)
+        self.assertEqual([(h['previous_nurse'], h['nurse']) for h in history],
+                         [('None', 'Nurse A'), ('Nurse A', 'Nurse B')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import pandas as pd
+from models.upsert import upsert_records
+
+
+class TestUpsertRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.existing = pd.DataFrame({
+            'Mother_ID': [1, 2],
+            'Child_First_Name': ['Alice', 'Bob'],
+            'Child_Last_Name': ['Doe', 'Smith'],
+            'Child_Date_of_Birth': ['2021-05-10', '2020-08-21'],
+            'City': ['Provo', 'Orem'],
+            'Assigned_Nurse': ['Nurse A', 'None'],
+        })
+
+    def test_readding_same_session_does_not_grow(self):
+        merged, report = upsert_records(self.existing, self.existing.copy())
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(report, {'inserted': 0, 'updated': 0, 'unchanged': 2})
+
+    def test_readding_rows_with_blanks_reports_no_updates(self):
+        self.existing['Phone'] = [None, '555-0100']
+        self.existing.loc[1, 'City'] = None
+
+        merged, report = upsert_records(self.existing, self.existing.copy())
+
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(report, {'inserted': 0, 'updated': 0, 'unchanged': 2})
+
+    def test_repeated_records_are_kept(self):
+        existing = pd.concat([self.existing, self.existing.iloc[[0]]], ignore_index=True)
+        existing.loc[2, 'City'] = 'Lehi'
+        incoming = self.existing.iloc[[0, 0]].copy()
+        incoming['Mother_ID'] = 3
+        incoming['City'] = ['Orem', 'Provo']
+
+        merged, report = upsert_records(existing, existing.copy())
+        self.assertEqual(list(merged['City']), ['Provo', 'Orem', 'Lehi'])
+        self.assertEqual(report, {'inserted': 0, 'updated': 0, 'unchanged': 2})
+
+        # Both incoming rows of a new key go in; the existing repeat is untouched
+        merged, report = upsert_records(existing, incoming)
+        self.assertEqual(list(merged['City']), ['Provo', 'Orem', 'Lehi', 'Orem', 'Provo'])
+        self.assertEqual(report['inserted'], 2)
+
+    def test_incoming_wins_and_new_rows_inserted(self):
+        incoming = pd.DataFrame({
+            'Mother_ID': ['2', '3'],
+            'Child_First_Name': ['Bob', 'Cara'],
+            'Child_Last_Name': ['Smith', 'Lee'],
+            'Child_Date_of_Birth': ['2020-08-21', '2022-01-01'],
+            'City': ['Orem', 'Lehi'],
+            'Assigned_Nurse': ['Nurse B', None],
+        })
+        merged, report = upsert_records(self.existing, incoming)
+        self.assertEqual(report, {'inserted': 1, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(list(merged['Assigned_Nurse']), ['Nurse A', 'Nurse B', 'None'])
+
+    def test_existing_preference_keeps_current_assignment(self):
+        incoming = self.existing.copy()
+        incoming['Assigned_Nurse'] = ['Nurse X', 'Nurse Y']
+        merged, report = upsert_records(self.existing, incoming, prefer='existing')
+        # An unassigned existing row still picks up the incoming nurse
+        self.assertEqual(list(merged['Assigned_Nurse']), ['Nurse A', 'Nurse Y'])
+        self.assertEqual(report['updated'], 1)
+
+    def test_unknown_preference_rejected(self):
+        with self.assertRaises(ValueError):
+            upsert_records(self.existing, self.existing, prefer='newest')
+
+
+if __name__ == '__main__':
+    unittest.main()
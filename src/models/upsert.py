@@ -0,0 +1,109 @@
+import logging
+import pandas as pd
+
+from models.assignments import UNASSIGNED, normalize_nurse
+from models.record_key import RECORD_KEY_COLUMNS, record_key_codes
+
+MERGE_PREFERENCES = ("incoming", "existing")
+
+
+def _keyed(df, codes, columns):
+    """
+    Index df by record key code, keeping the last row of any repeated key.
+
+    Returns:
+        (keyed, repeated) where repeated marks the rows of df left out of keyed
+    """
+    repeated = pd.Index(codes).duplicated(keep="last")
+    keyed = df[~repeated].set_axis(codes[~repeated]).reindex(columns=columns)
+    return keyed, repeated
+
+
+def _plain(df):
+    """Copy df with categorical columns widened to object so rows from either side can be mixed."""
+    categorical = df.select_dtypes("category").columns
+    return df.astype({col: object for col in categorical}) if len(categorical) else df.copy()
+
+
+def _as_text(df):
+    """df as strings with every missing value (None, NaN, NA) as the empty string."""
+    return df.astype(object).where(df.notna(), "").astype(str)
+
+
+def upsert_records(existing, incoming, prefer="incoming"):
+    """
+    Merge incoming combined rows into an existing combined dataset by record key.
+
+    Both sides are indexed by record key, so matching is a hash lookup and the
+    merge runs in linear time. Rows whose key is new are inserted; rows whose
+    key already exists are replaced by the preferred side. An unassigned nurse
+    on the preferred side never erases an assignment from the other side.
+
+    Rows that share a key are genuine duplicates for the duplicate review, so
+    none are dropped: only the last row of a repeated key is matched, and the
+    others are carried through (existing) or inserted (incoming) as they are.
+
+    Args:
+        existing: Current combined DataFrame, or None
+        incoming: Combined DataFrame being added
+        prefer: "incoming" (newest session wins) or "existing"
+
+    Returns:
+        (merged, report) where report has 'inserted', 'updated' and 'unchanged' counts
+    """
+    if prefer not in MERGE_PREFERENCES:
+        raise ValueError(f"prefer must be one of {MERGE_PREFERENCES}, got '{prefer}'")
+
+    incoming = _plain(incoming)
+    incoming["Assigned_Nurse"] = normalize_nurse(
+        incoming["Assigned_Nurse"] if "Assigned_Nurse" in incoming.columns else pd.Series(UNASSIGNED, index=incoming.index))
+
+    if existing is None or existing.empty:
+        merged = incoming.reset_index(drop=True)
+        return merged, {"inserted": len(merged), "updated": 0, "unchanged": 0}
+
+    existing = _plain(existing).reset_index(drop=True)
+    existing["Assigned_Nurse"] = normalize_nurse(existing["Assigned_Nurse"])
+    columns = list(existing.columns) + [c for c in incoming.columns if c not in existing.columns]
+
+    existing_codes, incoming_codes = record_key_codes(existing, incoming)
+    current, carried = _keyed(existing, existing_codes, columns)
+    if carried.any():
+        logging.info(f"Carried {int(carried.sum())} repeated records in the existing dataset through unchanged.")
+    new, _ = _keyed(incoming, incoming_codes, columns)
+
+    is_overlap = new.index.isin(current.index)
+    # Repeated incoming rows of a new key are inserted with its last row, in incoming order
+    is_new = ~pd.Index(incoming_codes).isin(current.index)
+    inserted = incoming[is_new].reindex(columns=columns)
+    overlap = new.index[is_overlap]
+
+    winner, loser = (new, current) if prefer == "incoming" else (current, new)
+    replacement = winner.loc[overlap]
+    replacement = replacement.where(replacement.notna(), loser.loc[overlap])
+    nurses = replacement["Assigned_Nurse"]
+    replacement["Assigned_Nurse"] = nurses.mask(nurses == UNASSIGNED, loser.loc[overlap, "Assigned_Nurse"])
+
+    # Key columns match by construction; compare everything else as text,
+    # treating every kind of blank as equal
+    compare = [c for c in columns if c not in RECORD_KEY_COLUMNS]
+    before = _as_text(current.loc[overlap, compare])
+    changed = (_as_text(replacement[compare]) != before).any(axis=1)
+
+    replaced = pd.Series(current.index.isin(overlap), index=current.index)
+    updated = current.mask(replaced, replacement.reindex(current.index), axis=0)
+    # Back in the existing order, with the carried rows where they were
+    updated = updated.set_axis(existing.index[~carried])
+    kept = pd.concat([updated, existing[carried].reindex(columns=columns)]).sort_index()
+    merged = pd.concat([kept, inserted]).reset_index(drop=True)
+
+    report = {
+        "inserted": len(inserted),
+        "updated": int(changed.sum()),
+        "unchanged": int((~changed).sum()),
+    }
+    logging.info(
+        f"Upsert merge ({prefer} wins): {report['inserted']} inserted, "
+        f"{report['updated']} updated, {report['unchanged']} unchanged."
+    )
+    return merged, report
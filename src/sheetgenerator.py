@@ -2,146 +2,244 @@
 Fake Data Generator
 
 by Vadim Pidoshva
+
+Generates a matching pair of hospital ("Database") and Medicaid lists for
+testing and load testing. Faker is only used to fill small pools of names,
+streets and places; every row is then drawn from the pools with NumPy, so a
+million-row pair takes seconds rather than hours.
+
+    python sheetgenerator.py --rows 500 --seed 42 --output-dir ./test_data
+    python sheetgenerator.py --rows 1000000 --format parquet --typos 0.02
 """
+import argparse
+import os
+import numpy as np
 import pandas as pd
 from faker import Faker
-from datetime import timedelta, date
-import random
-
-# Initialize Faker instance
-fake = Faker()
-
-# Function to generate birthdates for children under 4 years old
-def generate_child_dob():
-    today = date.today()
-    max_age = timedelta(days=365 * 3 + 9 * 30)  # 3 years and 9 months
-    birth_date = today - timedelta(days=fake.random_int(min=0, max=max_age.days))
-    return birth_date
-
-# Function to generate shared data for both lists
-def generate_shared_data(num_entries=1000):
-    shared_data = []
-    for _ in range(num_entries):
-        child_last_name = fake.last_name()
-        child_first_name = fake.first_name()
-        child_middle_name = fake.first_name()
-        mom_last_name = fake.last_name()
-        mom_first_name = fake.first_name()
-        child_dob = generate_child_dob().strftime("%Y-%m-%d")
-        mother_id = fake.unique.random_number(digits=9)
-        shared_data.append({
-            "child_last_name": child_last_name,
-            "child_first_name": child_first_name,
-            "child_middle_name": child_middle_name,
-            "mom_last_name": mom_last_name,
-            "mom_first_name": mom_first_name,
-            "child_dob": child_dob,
-            "mother_id": mother_id
-        })
-    return shared_data
-
-# Function to generate "Database" data with optional duplicates
-def generate_database_data(shared_data, unmatched_entries=0, num_duplicates=0):
-    database_data = []
-    for entry in shared_data:
-        state_file_number = fake.unique.random_number(digits=9)
-        street = fake.street_address()
-        city = fake.city()
-        state = fake.state_abbr()
-        zip_ = fake.zipcode()
-        phone = fake.phone_number()
-        mobile = fake.phone_number()
-        
-        database_data.append([
-            entry["child_last_name"], entry["child_first_name"], entry["child_middle_name"], entry["child_dob"],
-            entry["mom_last_name"], entry["mom_first_name"], state_file_number,
-            street, city, state, zip_, phone, mobile
-        ])
-
-    # Generate unmatched entries
-    for _ in range(unmatched_entries):
-        child_last_name = fake.last_name()
-        child_first_name = fake.first_name()
-        child_middle_name = fake.first_name()
-        mom_last_name = fake.last_name()
-        mom_first_name = fake.first_name()
-        child_dob = generate_child_dob().strftime("%Y-%m-%d")
-        state_file_number = fake.unique.random_number(digits=9)
-        street = fake.street_address()
-        city = fake.city()
-        state = fake.state_abbr()
-        zip_ = fake.zipcode()
-        phone = fake.phone_number()
-        mobile = fake.phone_number()
-
-        database_data.append([
-            child_last_name, child_first_name, child_middle_name, child_dob,
-            mom_last_name, mom_first_name, state_file_number,
-            street, city, state, zip_, phone, mobile
-        ])
-
-    # Generate duplicates
-    for _ in range(num_duplicates):
-        duplicate = random.choice(database_data)
-        database_data.append(duplicate)
-
-    return pd.DataFrame(database_data, columns=[
-        "Child Last Name", "Child First Name", "Child Middle Name", "DOB",
-        "Mother Last Name", "Mother First Name", "State File Number",
-        "Street", "City", "State", "ZIP", "Phone #", "Mobile #"
-    ])
-
-# Function to generate "Medicaid List" data with optional duplicates
-def generate_medicaid_data(shared_data, unmatched_entries=0, num_duplicates=0):
-    medicaid_data = []
-    for entry in shared_data:
-        mom_dob = fake.date_of_birth(minimum_age=18, maximum_age=50).strftime("%Y-%m-%d")
-        child_id = fake.unique.random_number(digits=5)
-        phone = fake.phone_number()
-        city = fake.city()
-        zip_ = fake.zipcode()
-        street_address = fake.street_address()
-
-        medicaid_data.append([
-            entry["mom_first_name"], entry["mom_last_name"], mom_dob, entry["mother_id"], child_id, entry["child_dob"], city, zip_,phone,street_address
-        ])
-
-    # Generate unmatched entries
-    for _ in range(unmatched_entries):
-        mom_first_name = fake.first_name()
-        mom_last_name = fake.last_name()
-        mom_dob = fake.date_of_birth(minimum_age=18, maximum_age=50).strftime("%Y-%m-%d")
-        child_first_name = fake.first_name()
-        child_last_name = fake.last_name()
-        child_dob = generate_child_dob().strftime("%Y-%m-%d")
-        mother_id = fake.unique.random_number(digits=9)
-        child_id = fake.unique.random_number(digits=5)
-        city = fake.city()
-        zip_ = fake.zipcode()
-        phone = fake.phone_number()
-        street_address = fake.street_address()
-        
-        medicaid_data.append([
-            mom_first_name, mom_last_name, mom_dob, mother_id, child_id, child_dob, city, zip_, phone, street_address
-        ])
-
-    # Generate duplicates
-    for _ in range(num_duplicates):
-        duplicate = random.choice(medicaid_data)
-        medicaid_data.append(duplicate)
-
-    return pd.DataFrame(medicaid_data, columns=[
-        "Mother First Name", "Last Name", "Mother DOB", "Mother ID", "Child ID", "Child DOB","City","Zip","Phone","Street_address"
-    ])
+
+# Distinct values drawn per pool; larger pools mean fewer accidental name collisions
+POOL_SIZE = 2000
+# Children are under 3 years 9 months old, mothers between 18 and 50
+CHILD_MAX_AGE_DAYS = 365 * 3 + 9 * 30
+MOTHER_AGE_DAYS = (18 * 365, 50 * 365)
+# Excel's sheet limit, including the header row
+XLSX_MAX_ROWS = 1_048_576
+
+DATABASE_COLUMNS = [
+    "Child Last Name", "Child First Name", "Child Middle Name", "DOB",
+    "Mother Last Name", "Mother First Name", "State File Number",
+    "Street", "City", "State", "ZIP", "Phone #", "Mobile #"
+]
+MEDICAID_COLUMNS = [
+    "Mother First Name", "Last Name", "Mother DOB", "Mother ID", "Child ID", "Child DOB", "City", "Zip", "Phone",
+    "Street_address"
+]
+
+
+class Pools:
+    """Value pools sampled once from Faker."""
+
+    def __init__(self, seed=None, size=POOL_SIZE):
+        fake = Faker()
+        if seed is not None:
+            Faker.seed(seed)
+        self.first_names = np.array([fake.first_name() for _ in range(size)], dtype=object)
+        self.last_names = np.array([fake.last_name() for _ in range(size)], dtype=object)
+        self.streets = np.array([fake.street_name() for _ in range(size)], dtype=object)
+        self.cities = np.array([fake.city() for _ in range(size // 4)], dtype=object)
+        self.states = np.array([fake.state_abbr() for _ in range(size // 4)], dtype=object)
+        self.zips = np.array([fake.zipcode() for _ in range(size // 4)], dtype=object)
+
+
+def _pick(rng, pool, n):
+    return pool[rng.integers(0, len(pool), n)]
+
+
+def _dates(rng, n, min_days, max_days, today):
+    """n random dates between max_days and min_days before today, as YYYY-MM-DD strings."""
+    days = rng.integers(min_days, max_days + 1, n).astype("timedelta64[D]")
+    return np.datetime_as_string(np.datetime64(today, "D") - days, unit="D").astype(object)
+
+
+def _unique_ids(rng, n, digits):
+    """n distinct random numbers with the given number of digits (more if n needs them)."""
+    digits = max(digits, len(str(n)) + 1)
+    low = 10 ** (digits - 1)
+    return rng.choice(9 * low, size=n, replace=False) + low
+
+
+def _phones(rng, n):
+    parts = [pd.Series(rng.integers(low, high, n)).astype(str)
+             for low, high in ((200, 1000), (200, 1000), (1000, 10000))]
+    return ("(" + parts[0] + ") " + parts[1] + "-" + parts[2]).to_numpy()
+
+
+def _streets(rng, pools, n):
+    return (pd.Series(rng.integers(1, 10000, n)).astype(str) + " " + _pick(rng, pools.streets, n)).to_numpy()
+
+
+def _typo(name, kind):
+    """Misspell a name: swap two letters, drop one, or change its case (which still matches)."""
+    if len(name) < 3:
+        return name.upper()
+    i = len(name) // 2
+    if kind == 0:
+        return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+    if kind == 1:
+        return name[:i] + name[i + 1:]
+    return name.upper()
+
+
+def generate_families(rng, pools, n, today=None):
+    """Draw n mother/child families as a dict of column arrays."""
+    today = today or pd.Timestamp.today().date()
+    return {
+        "child_last_name": _pick(rng, pools.last_names, n),
+        "child_first_name": _pick(rng, pools.first_names, n),
+        "child_middle_name": _pick(rng, pools.first_names, n),
+        "mom_last_name": _pick(rng, pools.last_names, n),
+        "mom_first_name": _pick(rng, pools.first_names, n),
+        "child_dob": _dates(rng, n, 0, CHILD_MAX_AGE_DAYS, today),
+        "mother_id": _unique_ids(rng, n, 9),
+    }
+
+
+def _database_frame(rng, pools, families):
+    n = len(families["mother_id"])
+    place = rng.integers(0, len(pools.cities), n)
+    return pd.DataFrame({
+        "Child Last Name": families["child_last_name"],
+        "Child First Name": families["child_first_name"],
+        "Child Middle Name": families["child_middle_name"],
+        "DOB": families["child_dob"],
+        "Mother Last Name": families["mom_last_name"],
+        "Mother First Name": families["mom_first_name"],
+        "State File Number": _unique_ids(rng, n, 9),
+        "Street": _streets(rng, pools, n),
+        "City": pools.cities[place],
+        "State": pools.states[place],
+        "ZIP": pools.zips[place],
+        "Phone #": _phones(rng, n),
+        "Mobile #": _phones(rng, n),
+    }, columns=DATABASE_COLUMNS)
+
+
+def _medicaid_frame(rng, pools, families, today=None):
+    today = today or pd.Timestamp.today().date()
+    n = len(families["mother_id"])
+    place = rng.integers(0, len(pools.cities), n)
+    return pd.DataFrame({
+        "Mother First Name": families["mom_first_name"],
+        "Last Name": families["mom_last_name"],
+        "Mother DOB": _dates(rng, n, *MOTHER_AGE_DAYS, today),
+        "Mother ID": families["mother_id"],
+        "Child ID": _unique_ids(rng, n, 5),
+        "Child DOB": families["child_dob"],
+        "City": pools.cities[place],
+        "Zip": pools.zips[place],
+        "Phone": _phones(rng, n),
+        "Street_address": _streets(rng, pools, n),
+    }, columns=MEDICAID_COLUMNS)
+
+
+def _add_duplicates(rng, df, count):
+    if count <= 0 or df.empty:
+        return df
+    return pd.concat([df, df.iloc[rng.integers(0, len(df), count)]], ignore_index=True)
+
+
+def _add_typos(rng, df, column, rate):
+    count = int(round(len(df) * rate))
+    if count <= 0:
+        return df
+    rows = rng.choice(len(df), size=count, replace=False)
+    kinds = rng.integers(0, 3, count)
+    values = df[column].to_numpy(copy=True)
+    values[rows] = [_typo(name, kind) for name, kind in zip(values[rows], kinds)]
+    df[column] = values
+    return df
+
+
+def generate_pair(rows=100, seed=None, unmatched=0.0, duplicates=0.0, typos=0.0,
+                  unmatched_target="both", duplicate_target="both", pools=None, today=None):
+    """
+    Generate a matching pair of hospital and Medicaid lists.
+
+    Args:
+        rows: Number of families present in both lists
+        seed: Random seed for reproducible data (default: random)
+        unmatched: Extra families, as a fraction of rows, that appear in only one list
+        duplicates: Repeated rows, as a fraction of each list
+        typos: Fraction of Medicaid mother first names to misspell. A third of
+            the typos are case changes, which the combine still matches
+        unmatched_target, duplicate_target: "database", "medicaid" or "both"
+        pools: Pools to draw from (default: new Pools for the seed)
+        today: Date ages are counted back from (default: today)
+
+    Returns:
+        (database, medicaid) DataFrames
+    """
+    rng = np.random.default_rng(seed)
+    pools = pools or Pools(seed)
+    today = today or pd.Timestamp.today().date()
+    extra = int(round(rows * unmatched))
+
+    shared = generate_families(rng, pools, rows + 2 * extra, today)
+    # Mother IDs must stay unique across both lists, so draw every family at once and split
+    split = {key: (values[:rows], values[rows:rows + extra], values[rows + extra:]) for key, values in shared.items()}
+    matched = {key: parts[0] for key, parts in split.items()}
+    only_db = {key: np.concatenate([parts[0], parts[1]]) for key, parts in split.items()}
+    only_med = {key: np.concatenate([parts[0], parts[2]]) for key, parts in split.items()}
+
+    database = _database_frame(rng, pools, only_db if unmatched_target in ("database", "both") else matched)
+    medicaid = _medicaid_frame(rng, pools, only_med if unmatched_target in ("medicaid", "both") else matched, today)
+    medicaid = _add_typos(rng, medicaid, "Mother First Name", typos)
+
+    if duplicate_target in ("database", "both"):
+        database = _add_duplicates(rng, database, int(round(len(database) * duplicates)))
+    if duplicate_target in ("medicaid", "both"):
+        medicaid = _add_duplicates(rng, medicaid, int(round(len(medicaid) * duplicates)))
+    return database, medicaid
+
+
+def write_xlsx(df, path):
+    """Write df to an .xlsx file row by row, without holding the whole workbook in memory."""
+    from openpyxl import Workbook
+
+    if len(df) + 1 > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(df)} rows do not fit in an Excel sheet; use --format parquet or csv")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        sheet.append([value.item() if isinstance(value, np.generic) else value for value in row])
+    workbook.save(path)
+
+
+def write_frame(df, path, fmt):
+    """Write df as xlsx, parquet or csv."""
+    if fmt == "xlsx":
+        write_xlsx(df, path)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
 
 # Function to check and display formatted duplicate records
-def check_duplicates(df, list_name, subset_columns):
+def check_duplicates(df, list_name, subset_columns, limit=5):
     duplicates = df[df.duplicated(subset=subset_columns, keep=False)]
-    
+
     if not duplicates.empty:
-        print(f"\nDuplicates found in {list_name} (based on {', '.join(subset_columns)}):\n")
+        groups = duplicates.groupby(subset_columns)
+        print(f"\n{groups.ngroups} duplicate groups found in {list_name} (based on {', '.join(subset_columns)}):\n")
 
-        for _, group in duplicates.groupby(subset_columns):
+        for i, (_, group) in enumerate(groups):
+            if i == limit:
+                print(f"... and {groups.ngroups - limit} more")
+                break
             print(f"Duplicate Group: {tuple(group.iloc[0][subset_columns])}")
             print(group.to_string(index=False))  # Formats output beautifully
             print("-" * 50)  # Divider for clarity
@@ -149,78 +247,57 @@ def check_duplicates(df, list_name, subset_columns):
         print(f"No duplicates found in {list_name}.\n")
 
 # Function to verify mismatched names
-def verify_names(database_file, medicaid_data_file):
-    database_df = pd.read_excel(database_file)
-    medicaid_df = pd.read_excel(medicaid_data_file)
-
+def verify_names(database_df, medicaid_df, limit=10):
     database_names = set((database_df["Mother First Name"].str.strip() + " " + database_df["Mother Last Name"].str.strip()).unique())
     medicaid_names = set((medicaid_df["Mother First Name"].str.strip() + " " + medicaid_df["Last Name"].str.strip()).unique())
 
-    missing_in_medicaid = database_names - medicaid_names
-    missing_in_database = medicaid_names - database_names
+    for missing, where, other in ((database_names - medicaid_names, "Database", "Medicaid List"),
+                                  (medicaid_names - database_names, "Medicaid List", "Database List")):
+        if missing:
+            print(f"{len(missing)} names in {where} but missing in {other}, e.g.:")
+            for name in sorted(missing)[:limit]:
+                print(f"  - {name}")
+            print()
+        else:
+            print(f"No names missing in {other}.\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate fake hospital and Medicaid lists.")
+    parser.add_argument("--rows", type=int, default=100, help="Families in both lists (default: 100)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible data (default: random)")
+    parser.add_argument("--output-dir", default=".", help="Directory to write to (default: current directory)")
+    parser.add_argument("--format", choices=["xlsx", "parquet", "csv"], default="xlsx", help="Output format")
+    parser.add_argument("--unmatched", type=float, default=0.0, metavar="RATE",
+                        help="Extra families in only one list, as a fraction of --rows")
+    parser.add_argument("--unmatched-target", choices=["database", "medicaid", "both"], default="both")
+    parser.add_argument("--duplicates", type=float, default=0.0, metavar="RATE",
+                        help="Repeated rows, as a fraction of each list")
+    parser.add_argument("--duplicate-target", choices=["database", "medicaid", "both"], default="both")
+    parser.add_argument("--typos", type=float, default=0.0, metavar="RATE",
+                        help="Fraction of Medicaid mother first names to misspell")
+    parser.add_argument("--quiet", action="store_true", help="Skip the name and duplicate checks")
+    args = parser.parse_args(argv)
+
+    database_df, medicaid_df = generate_pair(
+        args.rows, args.seed, args.unmatched, args.duplicates, args.typos,
+        args.unmatched_target, args.duplicate_target)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    database_filename = os.path.join(args.output_dir, f"database_data.{args.format}")
+    medicaid_filename = os.path.join(args.output_dir, f"medicaid_data.{args.format}")
+    write_frame(database_df, database_filename, args.format)
+    write_frame(medicaid_df, medicaid_filename, args.format)
+
+    print(f"\nFiles created: {database_filename} ({len(database_df)} rows), "
+          f"{medicaid_filename} ({len(medicaid_df)} rows)")
+
+    if not args.quiet:
+        verify_names(database_df, medicaid_df)
+        check_duplicates(database_df, "Database List", ["Child Last Name", "Child First Name", "DOB"])
+        check_duplicates(medicaid_df, "Medicaid List", ["Mother First Name", "Last Name", "Child DOB"])
 
-    print("\nMismatched Names Found:\n")
-    if missing_in_medicaid:
-        print("Names in Database but missing in Medicaid List:")
-        print("--------------------------------------------------")
-        for name in missing_in_medicaid:
-            print(f"  - {name}")
-        print("\n")
-    else:
-        print("No names missing in Medicaid List.\n")
-
-    if missing_in_database:
-        print("Names in Medicaid List but missing in Database List:")
-        print("--------------------------------------------------")
-        for name in missing_in_database:
-            print(f"  - {name}")
-        print("\n")
-    else:
-        print("No names missing in Database List.\n")
-
-# Main function to generate the files
-def generate_excel_files():
-    names_count = int(input("How many names to generate in each list? "))
-    
-    add_duplicates = input("Add duplicates to lists? (y/n): ").strip().lower()
-    num_duplicates = 0
-    duplicate_target = "both"
-    if add_duplicates == 'y':
-        num_duplicates = int(input("Enter the number of duplicates: "))
-        duplicate_target = input("Add duplicates to (database/medicaid/both): ").strip().lower()
-
-    add_unmatched = input("Generate unmatched data? (y/n): ").strip().lower()
-    unmatched_entries = 0
-    unmatched_target = "both"
-    if add_unmatched == 'y':
-        unmatched_entries = int(input("Enter the number of unmatched entries: "))
-        unmatched_target = input("Add unmatched entries to (database/medicaid/both): ").strip().lower()
-
-    shared_data = generate_shared_data(names_count)
-    
-    database_data_df = generate_database_data(
-        shared_data, 
-        unmatched_entries if unmatched_target in ["database", "both"] else 0,
-        num_duplicates if duplicate_target in ["database", "both"] else 0
-    )
-    medicaid_data_df = generate_medicaid_data(
-        shared_data, 
-        unmatched_entries if unmatched_target in ["medicaid", "both"] else 0,
-        num_duplicates if duplicate_target in ["medicaid", "both"] else 0
-    )
-    
-    database_filename = "database_data.xlsx"
-    medicaid_filename = "medicaid_data.xlsx"
-    database_data_df.to_excel(database_filename, index=False)
-    medicaid_data_df.to_excel(medicaid_filename, index=False)
-    
-    print(f"\nFiles created: {database_filename}, {medicaid_filename}")
-    
-    verify_names(database_filename, medicaid_filename)
-    check_duplicates(database_data_df, "Database List", ["Child Last Name", "Child First Name", "DOB"])
-    check_duplicates(medicaid_data_df, "Medicaid List", ["Mother First Name", "Last Name", "Child DOB"])
 
 # Run the program
 if __name__ == "__main__":
-    generate_excel_files()
-
+    main()
@@ -0,0 +1,28 @@
+import tempfile
+import unittest
+import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_pipeline_records_every_stage(self):
+        with tempfile.TemporaryDirectory() as fixtures:
+            result = benchmark.run_pipeline(200, seed=1, fixture_dir=fixtures)
+        names = [stage['name'] for stage in result['stages']]
+        self.assertEqual(names[:3], ['read database', 'read medicaid', 'combine'])
+        self.assertIn('load (cached)', names)
+        self.assertIn('report', names)
+        self.assertGreater(result['rows']['combined'], 150)
+        self.assertGreater(result['counts']['batch_assigned'], 0)
+
+    def test_regressions_ignore_short_stages(self):
+        previous = {'stages': [{'name': 'combine', 'seconds': 1.0}, {'name': 'report', 'seconds': 0.001}],
+                    'total_seconds': 2.0}
+        current = {'stages': [{'name': 'combine', 'seconds': 1.5}, {'name': 'report', 'seconds': 0.01}],
+                   'total_seconds': 2.2}
+        self.assertEqual(benchmark.regressions(previous, current, 0.2), [('combine', 1.0, 1.5)])
+        self.assertEqual(benchmark.parse_size('100k'), 100_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
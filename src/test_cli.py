@@ -0,0 +1,93 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import pandas as pd
+import cli
+from app_crypto import Crypto
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.tmp.name, 'db.xlsx')
+        self.medicaid = os.path.join(self.tmp.name, 'medicaid.xlsx')
+        pd.DataFrame({
+            'Child_Last_Name': ['Doe', 'Smith', 'Ray'],
+            'Child_First_Name': ['Alice', 'Bob', 'Dan'],
+            'DOB': ['2021-05-10', '2020-08-21', '2019-01-01'],
+            'Mother_Last_Name': ['Doe', 'Smith', 'Ray'],
+            'Mother_First_Name': ['Jane', 'John', 'Dana'],
+        }).to_excel(self.database, index=False)
+        pd.DataFrame({
+            'Mother_First_Name': ['Jane', 'John'],
+            'Last_Name': ['Doe', 'Smith'],
+            'Mother_ID': [98765, 54321],
+            'Child_DOB': ['2021-05-10', '2020-08-21'],
+        }).to_excel(self.medicaid, index=False)
+        self.out = os.path.join(self.tmp.name, 'out')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = cli.main(list(argv))
+        return code, output.getvalue()
+
+    def test_combine_writes_results_and_stats(self):
+        stats_path = os.path.join(self.tmp.name, 'stats.json')
+        metrics_path = os.path.join(self.tmp.name, 'metrics.prom')
+        code, output = self.run_cli('combine', self.database, self.medicaid, '--out', self.out,
+                                    '--side-files', '--stats', stats_path, '--metrics', metrics_path)
+        self.assertEqual(code, 0)
+        self.assertEqual(len(pd.read_excel(os.path.join(self.out, 'combined_matched_data.xlsx'))), 2)
+        self.assertEqual(len(pd.read_excel(os.path.join(self.out, 'unmatched_data.xlsx'))), 1)
+        self.assertIn('combined rows: 2', output)
+
+        with open(stats_path) as f:
+            stats = json.load(f)
+        self.assertEqual(stats['exit_code'], 0)
+        self.assertEqual([stage['name'] for stage in stats['stages']][:3],
+                         ['read database', 'read medicaid', 'combine'])
+        self.assertEqual(stats['rows']['unmatched'], 1)
+        with open(metrics_path) as f:
+            self.assertIn('nursefilter_stage_rows{stage="join"} 2', f.read())
+
+    def test_plain_workbooks_combine_without_a_key(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            self.assertFalse(os.path.exists('key.txt'))
+            code, output = self.run_cli('combine', self.database, self.medicaid, '--out', self.out)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(code, 0)
+        self.assertEqual(len(pd.read_excel(os.path.join(self.out, 'combined_matched_data.xlsx'))), 2)
+
+    def test_encrypted_inputs_stay_encrypted(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            Crypto.generateKey()
+            for path in (self.database, self.medicaid):
+                Crypto.encrypt_file(path, Crypto.loadKey())
+            code, _ = self.run_cli('combine', self.database, self.medicaid, '--out', self.out, '--encrypt')
+            self.assertEqual(code, 0)
+            for path in (self.database, self.medicaid, os.path.join(self.out, 'combined_matched_data.xlsx')):
+                self.assertTrue(Crypto.is_encrypted(path, False), path)
+        finally:
+            os.chdir(cwd)
+
+    def test_missing_input_fails_without_dialogs(self):
+        code, _ = self.run_cli('combine', os.path.join(self.tmp.name, 'missing.xlsx'), self.medicaid, '--out', self.out)
+        self.assertEqual(code, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.out, 'combined_matched_data.xlsx')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+import import_profile
+
+
+class TestImportProfile(unittest.TestCase):
+
+    def test_startup_does_not_import_heavy_modules(self):
+        imports = import_profile.profile_imports('app')
+        loaded = import_profile.loaded_packages(imports)
+        self.assertIn('tkinter', loaded)
+        self.assertIn('bcrypt', loaded)
+        for heavy in ('pandas', 'polars', 'reportlab'):
+            self.assertNotIn(heavy, loaded)
+
+    def test_deferred_controllers_still_resolve(self):
+        imports = import_profile.profile_imports('controllers.main_controller as m; m.InitialController')
+        # importlib.import_module itself is not timed, only the imports it makes
+        self.assertIn('views.initial_view', [entry['module'] for entry in imports])
+
+
+if __name__ == '__main__':
+    unittest.main()
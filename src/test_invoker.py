@@ -0,0 +1,169 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from app_crypto import Crypto
+from invoker import (CANCELLED, DONE, FAILED, Cancelled, CombineDataCommand, Command, CommandError, Invoker,
+                     ReadExcelCommand, _run_command, submit_combine_pipeline)
+from models import data_model
+
+
+def database_frame():
+    return pd.DataFrame({
+        'Child_Last_Name': ['Doe', 'Smith', 'Young'],
+        'Child_First_Name': ['Alice', 'Bob', 'Cara'],
+        'DOB': ['2021-05-10', '2020-08-21', '2022-01-02'],
+        'Mother_Last_Name': ['Doe', 'Smith', 'Young'],
+        'Mother_First_Name': ['Jane', 'John', 'Ann'],
+    })
+
+
+def medicaid_frame():
+    return pd.DataFrame({
+        'Mother_First_Name': ['Jane', 'John'],
+        'Last_Name': ['Doe', 'Smith'],
+        'Child_DOB': ['2021-05-10', '2020-08-21'],
+        'Mother_ID': [98765, 54321],
+    })
+
+
+class Sleep(Command):
+    """Sleeps, noting when it ran, and returns its value plus those it was given."""
+
+    def __init__(self, seconds, log):
+        self.seconds = seconds
+        self.log = log
+
+    def execute(self, value, *earlier):
+        start = time.monotonic()
+        while time.monotonic() - start < self.seconds:
+            self.check_cancelled()
+            time.sleep(0.005)
+        self.log.append((value, start, time.monotonic()))
+        return value + sum(earlier)
+
+
+class Fail(Command):
+
+    def execute(self):
+        return self.fail("broken")
+
+
+class TestInvoker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.invoker = Invoker(max_workers=4)
+
+    def tearDown(self):
+        self.invoker.shutdown(cancel=True)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_combine_command_still_runs_synchronously(self):
+        app = type("App", (), {"combined_data": None})()
+
+        combined = CombineDataCommand(app, [database_frame(), medicaid_frame()]).execute()
+
+        self.assertEqual(len(combined), 2)
+        self.assertIs(app.combined_data, combined)
+        self.assertTrue(os.path.exists('combined_matched_data.xlsx'))
+        # The same combine as the application: typed columns and nurse assignments carried along
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(combined['Child_Date_of_Birth']))
+        self.assertIn('Assigned_Nurse', combined.columns)
+
+    def test_independent_jobs_overlap_and_dependents_get_their_results(self):
+        log = []
+        first = self.invoker.submit(Sleep(0.2, log), 1)
+        second = self.invoker.submit(Sleep(0.2, log), 2)
+        total = self.invoker.submit(Sleep(0, log), 10, first, second)
+
+        self.assertEqual(total.wait(timeout=5), 13)
+        runs = {value: (start, end) for value, start, end in log}
+        self.assertLess(runs[2][0], runs[1][1])  # the first two ran at the same time
+        self.assertGreaterEqual(runs[10][0], max(runs[1][1], runs[2][1]))
+        self.assertEqual([job["status"] for job in self.invoker.status()], [DONE] * 3)
+        self.assertEqual(self.invoker.status()[2]["depends_on"], [first.id, second.id])
+
+    def test_failure_and_cancellation_reach_dependents(self):
+        log = []
+        failed = self.invoker.submit(Fail())
+        skipped = self.invoker.submit(Sleep(0, log), 1, after=[failed])
+        running = self.invoker.submit(Sleep(5, log), 2)
+        waiting = self.invoker.submit(Sleep(0, log), 3, running)
+
+        with self.assertRaises(CommandError):
+            failed.wait(timeout=5)
+        while running.status != "running":
+            time.sleep(0.01)
+        running.cancel()
+
+        self.assertTrue(self.invoker.wait(timeout=5))
+        self.assertEqual((failed.status, skipped.status, running.status, waiting.status),
+                         (FAILED, CANCELLED, CANCELLED, CANCELLED))
+        with self.assertRaises(Cancelled):
+            waiting.wait()
+        self.assertEqual(log, [])
+
+    def run_pipeline(self, invoker):
+        Crypto.generateKey()
+        database_frame().to_excel('database.xlsx', index=False)
+        medicaid_frame().to_excel('medicaid.xlsx', index=False)
+        Crypto.encrypt_file('database.xlsx', Crypto.loadKey())
+        os.mkdir('out')
+
+        jobs = submit_combine_pipeline(invoker, None, 'database.xlsx', 'medicaid.xlsx', 'out')
+
+        self.assertEqual(jobs["encrypt"].wait(timeout=60), True)
+        self.assertEqual(len(jobs["combine"].result), 2)
+        self.assertTrue(Crypto.is_encrypted(os.path.join('out', 'combined_matched_data.xlsx'), False))
+        # The encrypted input was read in memory and is still encrypted on disk
+        self.assertTrue(Crypto.is_encrypted('database.xlsx', False))
+        return jobs
+
+    def test_pipeline_reads_combines_and_encrypts(self):
+        statuses = []
+        self.invoker.on_status = lambda job: statuses.append((job.name, job.status))
+
+        self.run_pipeline(self.invoker)
+
+        self.assertIn(("combine", DONE), statuses)
+
+    def test_pipeline_runs_in_a_process_pool(self):
+        invoker = Invoker(max_workers=2, executor="process")
+        try:
+            self.run_pipeline(invoker)
+        finally:
+            invoker.shutdown()
+
+    def test_combine_stops_at_the_next_stage_when_cancelled(self):
+        cancel = threading.Event()
+        match_frames = data_model.match_frames
+
+        def match_then_cancel(*args):
+            result = match_frames(*args)
+            cancel.set()
+            return result
+
+        with patch('models.data_model.match_frames', side_effect=match_then_cancel):
+            with self.assertRaises(Cancelled):
+                _run_command(CombineDataCommand(None), ([database_frame(), medicaid_frame()],), {}, cancel)
+        self.assertFalse(os.path.exists('combined_matched_data.xlsx'))
+
+    def test_commands_run_in_a_process_pool(self):
+        database_frame().to_excel('database.xlsx', index=False)
+        invoker = Invoker(max_workers=2, executor="process")
+        try:
+            job = invoker.submit(ReadExcelCommand(None), os.path.abspath('database.xlsx'))
+            self.assertEqual(len(job.wait(timeout=60)), 3)
+        finally:
+            invoker.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import datetime
+import unittest
+import sheetgenerator
+
+
+class TestSheetGenerator(unittest.TestCase):
+
+    def generate(self, **kwargs):
+        return sheetgenerator.generate_pair(200, seed=7, today=datetime.date(2025, 1, 1), **kwargs)
+
+    def test_seed_reproduces_the_pair(self):
+        first, second = self.generate(), self.generate()
+        for a, b in zip(first, second):
+            self.assertTrue(a.equals(b))
+
+    def test_rates(self):
+        database, medicaid = self.generate(unmatched=0.1, duplicates=0.05, typos=0.1)
+        self.assertEqual(len(database), 231)  # 200 shared + 20 unmatched + 11 duplicates
+        self.assertEqual(len(medicaid), 231)
+        self.assertEqual(list(database.columns), sheetgenerator.DATABASE_COLUMNS)
+        self.assertTrue(database['State File Number'].iloc[:220].is_unique)
+
+        shared_db = set(zip(database['Mother First Name'][:200], database['DOB'][:200]))
+        shared_med = set(zip(medicaid['Mother First Name'][:200], medicaid['Child DOB'][:200]))
+        self.assertGreater(len(shared_db - shared_med), 0)
+        self.assertLessEqual(len(shared_db - shared_med), 20)
+        self.assertTrue(database['DOB'].between('2021-04-01', '2025-01-01').all())
+
+
+if __name__ == '__main__':
+    unittest.main()
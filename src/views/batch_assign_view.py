@@ -1,5 +1,7 @@
 import tkinter as tk
+import pandas as pd
 from tkinter import messagebox
+from models.geo import NO_CENTROIDS_MESSAGE, has_zip_centroids
 from views.tooltip import add_tooltip
 
 
@@ -25,7 +27,7 @@ class BatchAssignView:
         city_var = tk.StringVar()
         city_entry = tk.Entry(main_frame, textvariable=city_var)
         city_entry.pack(pady=5)
-        add_tooltip(city_entry, "Leave blank to ignore this filter")
+        add_tooltip(city_entry, "Leave blank to ignore this filter. Separate several cities with commas, or end with * to match a prefix")
 
         state_label = tk.Label(main_frame, text="Filter by State:")
         state_label.pack(pady=5)
@@ -34,7 +36,7 @@ class BatchAssignView:
         state_var = tk.StringVar()
         state_entry = tk.Entry(main_frame, textvariable=state_var)
         state_entry.pack(pady=5)
-        add_tooltip(state_entry, "Leave blank to ignore this filter")
+        add_tooltip(state_entry, "Leave blank to ignore this filter. Separate several states with commas")
 
         zip_label = tk.Label(main_frame, text="Filter by ZIP Code:")
         zip_label.pack(pady=5)
@@ -43,7 +45,45 @@ class BatchAssignView:
         zip_var = tk.StringVar()
         zip_entry = tk.Entry(main_frame, textvariable=zip_var)
         zip_entry.pack(pady=5)
-        add_tooltip(zip_entry, "Leave blank to ignore this filter")
+        add_tooltip(zip_entry, "Leave blank to ignore this filter. Separate several ZIP codes with commas, or end with * to match a prefix (e.g. 846*)")
+
+        radius_label = tk.Label(main_frame, text="Within Miles of ZIP:")
+        radius_label.pack(pady=5)
+        add_tooltip(radius_label, "Match every child living within this distance of the ZIP code instead of the ZIP code alone")
+
+        radius_var = tk.StringVar()
+        radius_entry = tk.Entry(main_frame, textvariable=radius_var)
+        radius_entry.pack(pady=5)
+        if has_zip_centroids():
+            add_tooltip(radius_entry, "Leave blank to match the ZIP code exactly")
+        else:
+            radius_entry.config(state="disabled")
+            add_tooltip(radius_entry, NO_CENTROIDS_MESSAGE)
+
+        dob_label = tk.Label(main_frame, text="Born Between (YYYY-MM-DD):")
+        dob_label.pack(pady=5)
+        add_tooltip(dob_label, "Only match children born within these dates (inclusive)")
+
+        dob_frame = tk.Frame(main_frame)
+        dob_frame.pack(pady=5)
+        born_from_var = tk.StringVar()
+        born_to_var = tk.StringVar()
+        tk.Entry(dob_frame, textvariable=born_from_var, width=12).pack(side=tk.LEFT)
+        tk.Label(dob_frame, text="and").pack(side=tk.LEFT, padx=5)
+        tk.Entry(dob_frame, textvariable=born_to_var, width=12).pack(side=tk.LEFT)
+        add_tooltip(dob_frame, "Leave either date blank for an open-ended range")
+
+        unassigned_var = tk.BooleanVar(value=False)
+        unassigned_check = tk.Checkbutton(main_frame, text="Only children without a nurse", variable=unassigned_var)
+        unassigned_check.pack(pady=5)
+        add_tooltip(unassigned_check, "Leave children who already have a nurse assigned unchanged")
+
+        match_var = tk.StringVar(value="all")
+        match_frame = tk.Frame(main_frame)
+        match_frame.pack(pady=5)
+        tk.Radiobutton(match_frame, text="Match all filters", variable=match_var, value="all").pack(side=tk.LEFT)
+        tk.Radiobutton(match_frame, text="Match any filter", variable=match_var, value="any").pack(side=tk.LEFT)
+        add_tooltip(match_frame, "Whether a child must match every filter above or just one of them")
 
         nurse_label = tk.Label(main_frame, text="Nurse Name:")
         nurse_label.pack(pady=5)
@@ -66,7 +106,29 @@ class BatchAssignView:
             city = city_var.get().strip()
             state = state_var.get().strip()
             zipcode = zip_var.get().strip()
-            count = self.batch_assign_callback(nurse_name, city, state, zipcode)
+            radius = radius_var.get().strip()
+            if radius:
+                try:
+                    radius = float(radius)
+                except ValueError:
+                    messagebox.showerror("Error", "Distance must be a number of miles.")
+                    return
+                if not zipcode:
+                    messagebox.showerror("Error", "Enter the ZIP code to measure the distance from.")
+                    return
+            born = []
+            for var in (born_from_var, born_to_var):
+                value = var.get().strip()
+                if value and pd.isna(pd.to_datetime(value, errors="coerce")):
+                    messagebox.showerror("Error", f"'{value}' is not a valid date.")
+                    return
+                born.append(value or None)
+            count = self.batch_assign_callback(
+                nurse_name, city, state, zipcode, radius_miles=radius or None,
+                born_from=born[0], born_to=born[1],
+                unassigned_only=unassigned_var.get(), match_any=match_var.get() == "any")
+            if count is None:
+                return  # the model has shown why
             if count > 0:
                 messagebox.showinfo("Success", f"Nurse '{nurse_name}' assigned to {count} children.")
                 self.refresh_view()  # Refresh the view after batch assignment
@@ -79,6 +141,15 @@ class BatchAssignView:
         save_btn.pack(side=tk.LEFT, padx=5)
         add_tooltip(save_btn, "Assign the specified nurse to all children matching your criteria")
         
+        def auto_assign():
+            report = self.controller.auto_assign_from_roster(self.refresh_view)
+            if report and report["assigned"] > 0:
+                window.destroy()
+
+        auto_btn = tk.Button(button_frame, text="Auto-Assign from Roster...", command=auto_assign)
+        auto_btn.pack(side=tk.LEFT, padx=5)
+        add_tooltip(auto_btn, "Load a roster of nurses with capacities and home ZIPs and spread all unassigned children across them, keeping children close to their nurse")
+
         cancel_btn = tk.Button(button_frame, text="Cancel", command=self.controller.close_batch_assign, width=10)
         cancel_btn.pack(side=tk.LEFT, padx=5)
         add_tooltip(cancel_btn, "Cancel this operation and close the window")
@@ -1,8 +1,8 @@
 import tkinter as tk
-import pandas as pd
 import logging
 from tkinter import ttk, messagebox
 from views.tooltip import add_tooltip
+from models.schema import format_date
 
 class CombinedDataView:
     """
@@ -145,9 +145,8 @@ class CombinedDataView:
             duplicate_button = tk.Button(bottom_frame, text="View Duplicate Data", command=self.controller.view_duplicate_data)
             duplicate_button.pack(side=tk.LEFT, padx=10)
             # Badge
-            duplicate_count = int((len(self.controller.model.duplicate_data))/2)
-            add_tooltip(duplicate_button, f"View {duplicate_count} potentially duplicate records that need review")
-            dup_count_label = tk.Label(duplicate_button, text=str(duplicate_count),
+            add_tooltip(duplicate_button, f"View {self.duplicate_count} groups of potentially duplicate records that need review")
+            dup_count_label = tk.Label(duplicate_button, text=str(self.duplicate_count),
                                     bg="blue", fg="white", font=("Arial", 10, "bold"))
             dup_count_label.place(relx=1.0, rely=0.0, anchor="ne")
         return self.combined_window
@@ -163,7 +162,7 @@ class CombinedDataView:
                 str(row.get('Mother_ID', '')),  # Ensure Mother_ID is string
                 row.get('Child_First_Name', ''),
                 row.get('Child_Last_Name', ''),
-                row.get('Child_Date_of_Birth', ''),
+                format_date(row.get('Child_Date_of_Birth')),
                 row.get('City',''),
                 row.get('ZIP',''),
                 row.get('Phone_#',''),
@@ -192,12 +191,14 @@ class CombinedDataView:
                 mother_id, child_first_name, child_last_name, dob, City, Zip,Phone,Street, nurse = vals
                 
                 # Locate the child's data in the combined DataFrame
-                child_data = self.controller.model.combined_data[
-                    (self.controller.model.combined_data['Mother_ID'].astype(str) == str(mother_id)) &
-                    (self.controller.model.combined_data['Child_First_Name'].str.lower() == child_first_name.lower()) &
-                    (self.controller.model.combined_data['Child_Last_Name'].str.lower() == child_last_name.lower()) &
-                    (self.controller.model.combined_data['Child_Date_of_Birth'] == dob)
-                ]
+                model = self.controller.model
+                idx = model.locate_child({
+                    'Mother_ID': mother_id,
+                    'Child_First_Name': str(child_first_name),
+                    'Child_Last_Name': str(child_last_name),
+                    'Child_Date_of_Birth': dob,
+                })
+                child_data = model.combined_data.loc[idx]
 
                 if not child_data.empty:
                     logging.info("Child data found.")
@@ -217,11 +218,8 @@ class CombinedDataView:
         if not s:
             self.filtered_data = self.combined_data.copy()
         else:
-            self.filtered_data = self.combined_data[
-                self.combined_data.apply(
-                    lambda row: row.astype(str).str.lower().str.contains(s, na=False).any(), axis=1
-                )
-            ]
+            # Matched per distinct column value by the model's query index
+            self.filtered_data = self.controller.model.search(s)
         self.update_treeview(self.filtered_data)
 
     def sort_by_dob(self):
@@ -229,12 +227,9 @@ class CombinedDataView:
         arrow = "▲" if self.sort_ascending else "▼"
         self.sort_button.config(text=f"Sort by DOB {arrow}")
 
-        df = self.filtered_data.copy()
-        df['dob_temp'] = pd.to_datetime(df['Child_Date_of_Birth'], errors='coerce')
-        df.sort_values(by='dob_temp', ascending=self.sort_ascending, inplace=True)
-        df.drop(columns=['dob_temp'], inplace=True)
-
-        self.filtered_data = df
+        # DOB is already a datetime column in the combined data schema
+        self.filtered_data = self.filtered_data.sort_values(
+            by='Child_Date_of_Birth', ascending=self.sort_ascending, kind='stable')
         self.update_treeview(self.filtered_data)
 
     # Add a new method to clear the search
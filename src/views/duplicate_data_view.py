@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
 
+GROUP_COLUMNS = ("Duplicate_Group_ID", "Duplicate_Group_Size")
+
+
 class DuplicateDataView:
     def __init__(self, root, controller, duplicate_data ):
         self.root = root
@@ -14,18 +17,26 @@ class DuplicateDataView:
     def create_widgets(self):
         self.view = tk.Frame(self.root, width=900, height=500)
 
-        columns = list(self.duplicate_data.columns)
+        grouped = all(col in self.duplicate_data.columns for col in GROUP_COLUMNS)
+        columns = [col for col in self.duplicate_data.columns if not grouped or col not in GROUP_COLUMNS]
 
-        self.tree = ttk.Treeview(self.view, columns=columns, show='headings')
+        # Grouped data gets a tree column holding one expandable node per group
+        self.tree = ttk.Treeview(self.view, columns=columns, show='tree headings' if grouped else 'headings')
         self.tree.pack(fill=tk.BOTH, expand=True)
 
+        if grouped:
+            self.tree.heading("#0", text="Group")
+            self.tree.column("#0", width=160, stretch=False)
+
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=150)
 
-        for _, row in self.duplicate_data.iterrows():
-            values = [row[col] for col in columns]
-            self.tree.insert("", "end", values=values)
+        if grouped:
+            self._insert_groups(columns)
+        else:
+            for row in self.duplicate_data[columns].itertuples(index=False):
+                self.tree.insert("", "end", values=list(row))
 
         tk.Button(self.view, text="View in Excel",
                   command=self.controller.display_in_excel).pack(pady=5)
@@ -34,3 +45,10 @@ class DuplicateDataView:
 
         self.view.pack()
         return self.view
+
+    def _insert_groups(self, columns):
+        """Insert one collapsible node per duplicate group with its records underneath."""
+        for group_id, group in self.duplicate_data.groupby("Duplicate_Group_ID", sort=True):
+            parent = self.tree.insert("", "end", text=f"Group {group_id} ({len(group)} records)", open=False)
+            for row in group[columns].itertuples(index=False):
+                self.tree.insert(parent, "end", values=list(row))
@@ -1,25 +1,82 @@
 import tkinter as tk
+from tkinter import ttk
+from views.tooltip import add_tooltip
+from models.caseload import CASELOAD_COLUMNS
+
+COLUMN_HEADINGS = {
+    "Nurse": "Nurse",
+    "Active_Caseload": "Caseload",
+    "Recent_Visits": "Visits (30d)",
+    "Visits_Per_Week": "Visits/Week",
+    "Children_Visited": "Children Visited (30d)",
+    "Median_Age": "Median Age",
+    "Age_Under_1": "Age <1",
+    "Age_1_to_2": "Age 1-2",
+    "Age_2_Plus": "Age 2+",
+    "Towns": "Towns",
+    "ZIPs": "ZIPs",
+    "Top_Town": "Top Town",
+}
+
 
 class NursesStatisticalView:
     def __init__(self, root, controller):
         self.controller = controller
         self.root = root
+        self.caseload = None
+        self.sort_column = "Active_Caseload"
+        self.sort_ascending = False
+
 
+    def create_widgets(self, caseload):
+        self.caseload = caseload
+        stats = tk.Frame(self.root, width=900, height=500)
 
-    def create_widgets(self, assigned):
-        counts = assigned['Assigned_Nurse'].value_counts()
-        stats = tk.Frame(self.root, width=400, height=400)
+        assigned = caseload[caseload['Active_Caseload'] > 0]
+        if not assigned.empty:
+            busiest = assigned.loc[assigned['Active_Caseload'].idxmax()]
+            lightest = assigned.loc[assigned['Active_Caseload'].idxmin()]
+            summary = (f"{len(assigned)} nurses with {int(assigned['Active_Caseload'].sum())} assigned children  ·  "
+                       f"Most: {busiest['Nurse']} ({busiest['Active_Caseload']})  ·  "
+                       f"Least: {lightest['Nurse']} ({lightest['Active_Caseload']})")
+            tk.Label(stats, text=summary, font=("Arial", 12)).pack(pady=5)
 
-        most_assigned = counts.idxmax()
-        least_assigned = counts.idxmin()
-        tk.Label(stats, text=f"Most Assigned Nurse: {most_assigned} ({counts.max()})", font=("Arial",12)).pack(pady=5)
-        tk.Label(stats, text=f"Least Assigned Nurse: {least_assigned} ({counts.min()})", font=("Arial",12)).pack(pady=5)
+        table_frame = tk.Frame(stats)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree = ttk.Treeview(table_frame, columns=CASELOAD_COLUMNS, show="headings", height=15)
+        for col in CASELOAD_COLUMNS:
+            self.tree.heading(col, text=COLUMN_HEADINGS[col], command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, anchor="w" if col in ("Nurse", "Top_Town") else "center",
+                             width=140 if col in ("Nurse", "Top_Town", "Children_Visited") else 80)
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        add_tooltip(self.tree, "Click a column heading to sort nurses by it")
+
+        self._fill()
 
-        tk.Label(stats, text="Assignments by Nurse:", font=("Arial",12,"bold")).pack(pady=5)
-        for nurse, count in counts.items():
-            tk.Label(stats, text=f"{nurse}: {count} assignment(s)", fg="blue").pack(anchor='w', padx=10)
-        
         tk.Button(stats, text="Close", command=self.controller.close_nurse_stats).pack(pady=(5,5))
 
         stats.pack()
-        return stats
\ No newline at end of file
+        return stats
+
+    def sort_by(self, column):
+        """Sort the table by column; clicking the same column again reverses the order."""
+        if column == self.sort_column:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = column
+            self.sort_ascending = column in ("Nurse", "Top_Town")
+        self.caseload = self.caseload.sort_values(
+            column, ascending=self.sort_ascending, kind="stable", na_position="last")
+        self._fill()
+
+    def _fill(self):
+        self.tree.delete(*self.tree.get_children())
+        for col in CASELOAD_COLUMNS:
+            arrow = (" ▲" if self.sort_ascending else " ▼") if col == self.sort_column else ""
+            self.tree.heading(col, text=COLUMN_HEADINGS[col] + arrow)
+        display = self.caseload[CASELOAD_COLUMNS].astype(object).where(self.caseload[CASELOAD_COLUMNS].notna(), "")
+        for values in display.itertuples(index=False, name=None):
+            self.tree.insert("", "end", values=values)
@@ -3,6 +3,8 @@ from tkinter import ttk
 import pandas as pd
 from tkinter import font as tkfont
 from views.tooltip import add_tooltip
+from models.schema import format_date
+from models.child_keys import build_child_keys, match_child
 from PIL import Image, ImageTk
 import os
 import platform
@@ -235,7 +237,7 @@ class ProfileView:
         self.child_info_text = (
             f"First Name: {self.child_data.get('Child_First_Name','')}\n"
             f"Last Name: {self.child_data.get('Child_Last_Name','')}\n"
-            f"Date of Birth: {self.child_data.get('Child_Date_of_Birth','')}\n"
+            f"Date of Birth: {format_date(self.child_data.get('Child_Date_of_Birth'))}\n"
         )
         child_info = tk.Label(
             child_section, 
@@ -533,22 +535,11 @@ class ProfileView:
         return self.nurse_info_text
 
     def update_nurse_log(self):
-        path = "nurse_log.xlsx"
-        if not os.path.exists(path):
-            return
-        df = pd.read_excel(path)
-        mother_id = str(self.child_data.get("Mother_ID", ""))
-        first = self.child_data.get("Child_First_Name", "").lower()
-        last = self.child_data.get("Child_Last_Name", "").lower()
-        filtered = df[
-            (df["Mother_ID"].astype(str) == mother_id) &
-            (df["Child_First_Name"].str.lower() == first) &
-            (df["Child_Last_Name"].str.lower() == last)
-        ]
+        visits = self.controller.get_nurse_log(self.child_data)
         for row in self.visit_tree.get_children():
             self.visit_tree.delete(row)
-        for _, row in filtered.iterrows():
-            self.visit_tree.insert("", "end", values=(row["Nurse_Name"], row["Visit_Time"]))
+        for visit in visits:
+            self.visit_tree.insert("", "end", values=(visit["Nurse_Name"], visit["Visit_Time"]))
 
     def auto_log_nurse(self):
         nurse_name = self.child_data.get("Assigned_Nurse")
@@ -734,9 +725,7 @@ class ProfileView:
             
         df = pd.read_excel(path)
         match_mask = (
-            (df["Mother_ID"].astype(str) == str(self.child_data.get("Mother_ID", ""))) &
-            (df["Child_First_Name"].str.lower() == self.child_data.get("Child_First_Name", "").lower()) &
-            (df["Child_Last_Name"].str.lower() == self.child_data.get("Child_Last_Name", "").lower()) &
+            match_child(build_child_keys(df), self.child_data) &
             (df["Nurse_Name"] == nurse_name) &
             (df["Visit_Time"] == visit_time)
         )
@@ -751,65 +740,20 @@ class ProfileView:
         self.show_custom_dialog("Success", "Visit log deleted successfully.", "info")
 
     def load_notes(self):
-        """Load notes from file if they exist"""
+        """Load the notes saved for this child"""
         try:
-            path = "notes.xlsx"
-            if os.path.exists(path):
-                df = pd.read_excel(path)
-                mother_id = str(self.child_data.get("Mother_ID", ""))
-                first = self.child_data.get("Child_First_Name", "").lower()
-                last = self.child_data.get("Child_Last_Name", "").lower()
-                
-                matching_notes = df[
-                    (df["Mother_ID"].astype(str) == mother_id) &
-                    (df["Child_First_Name"].str.lower() == first) &
-                    (df["Child_Last_Name"].str.lower() == last)
-                ]
-                
-                if not matching_notes.empty:
-                    self.notes_text.delete(1.0, tk.END)
-                    self.notes_text.insert(1.0, matching_notes.iloc[0]["Notes"])
+            notes = self.controller.get_notes(self.child_data)
+            if notes:
+                self.notes_text.delete(1.0, tk.END)
+                self.notes_text.insert(1.0, notes)
         except Exception as e:
             logging.error(f"Error loading notes: {e}")
 
     def save_notes(self):
-        """Save notes to file"""
+        """Save the notes for this child"""
         try:
-            path = "notes.xlsx"
             notes = self.notes_text.get(1.0, tk.END).strip()
-            
-            # Create DataFrame with current notes
-            new_data = pd.DataFrame([{
-                "Mother_ID": self.child_data.get("Mother_ID", ""),
-                "Child_First_Name": self.child_data.get("Child_First_Name", ""),
-                "Child_Last_Name": self.child_data.get("Child_Last_Name", ""),
-                "Notes": notes
-            }])
-            
-            if os.path.exists(path):
-                # Read existing data
-                df = pd.read_excel(path)
-                
-                # Remove any existing notes for this child
-                mother_id = str(self.child_data.get("Mother_ID", ""))
-                first = self.child_data.get("Child_First_Name", "").lower()
-                last = self.child_data.get("Child_Last_Name", "").lower()
-                
-                df = df[
-                    ~(
-                        (df["Mother_ID"].astype(str) == mother_id) &
-                        (df["Child_First_Name"].str.lower() == first) &
-                        (df["Child_Last_Name"].str.lower() == last)
-                    )
-                ]
-                
-                # Append new notes
-                df = pd.concat([df, new_data], ignore_index=True)
-            else:
-                df = new_data
-            
-            # Save to file
-            df.to_excel(path, index=False)
+            self.controller.save_notes(self.child_data, notes)
             self.show_custom_dialog("Success", "Notes saved successfully.", "info")
             
         except Exception as e:
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import pandas as pd
 from views.tooltip import add_tooltip
+from models.schema import format_date
+from models.statistics import compute_statistics
+from views.virtual_table import VirtualTable
 
 
 class StatisticalView:
@@ -9,57 +11,50 @@ class StatisticalView:
         self.controller = controller
         self.root = root
 
-    def create_widgets(self, df):
-        report_win = tk.Frame(self.root, width=600, height=650)
+    def open_child_profile(self, children):
+        """Open the profile of the first of the selected children, if any."""
+        if children.empty:
+            return None
+        return self.controller.show_child_profile(children.iloc[0])
 
-        # Ensure 'Assigned_Nurse' column exists and replace NaN with 'None'
-        df['Assigned_Nurse'] = df['Assigned_Nurse'].fillna("None").astype(str).str.strip()
+    def create_widgets(self, df, stats=None):
+        report_win = tk.Frame(self.root, width=600, height=650)
 
-        # Count Assigned and Unassigned Children Correctly
-        total_children = len(df)
-        assigned_df = df[df['Assigned_Nurse'].str.lower() != "none"]  # Proper filtering
-        assigned_count = len(assigned_df)
-        unassigned_count = total_children - assigned_count
-        assigned_percentage = (assigned_count / total_children * 100) if total_children > 0 else 0
+        # Aggregates come precomputed (and cached) from the model; df is only read for drill-downs
+        if stats is None:
+            stats = compute_statistics(df)
+        assigned_percentage = stats.assigned_percentage
         unassigned_percentage = 100 - assigned_percentage
 
-        total_label = tk.Label(report_win, text=f"📌 Total Children: {total_children}", font=("Arial", 12))
+        total_label = tk.Label(report_win, text=f"📌 Total Children: {stats.total}", font=("Arial", 12))
         total_label.pack(pady=5)
         add_tooltip(total_label, "Total number of children in the database")
 
-        assigned_label = tk.Label(report_win, text=f"👶 Assigned to Nurses: {assigned_count} ({assigned_percentage:.1f}%)", font=("Arial", 12))
+        assigned_label = tk.Label(report_win, text=f"👶 Assigned to Nurses: {stats.assigned} ({assigned_percentage:.1f}%)", font=("Arial", 12))
         assigned_label.pack(pady=5)
         add_tooltip(assigned_label, "Number and percentage of children who have a nurse assigned")
 
-        unassigned_label = tk.Label(report_win, text=f"🚨 Unassigned Children: {unassigned_count} ({unassigned_percentage:.1f}%)", font=("Arial", 12))
+        unassigned_label = tk.Label(report_win, text=f"🚨 Unassigned Children: {stats.unassigned} ({unassigned_percentage:.1f}%)", font=("Arial", 12))
         unassigned_label.pack(pady=5)
         add_tooltip(unassigned_label, "Number and percentage of children who don't have a nurse assigned yet")
 
-        # Handle Date of Birth correctly
-        if 'Child_Date_of_Birth' in df.columns:
-            df['dob_temp'] = pd.to_datetime(df['Child_Date_of_Birth'], errors='coerce')
-            valid_ages = df.dropna(subset=['dob_temp'])
-
-            if not valid_ages.empty:
-                today = pd.Timestamp.today()
-                avg_age_years = (today - valid_ages['dob_temp']).dt.days.mean() / 365
-                avg_age_label = tk.Label(report_win, text=f"🧒 Average Age: {avg_age_years:.1f} years", font=("Arial", 12))
-                avg_age_label.pack(pady=5)
-                add_tooltip(avg_age_label, "Average age of all children in the database")
-
-                youngest = valid_ages.loc[valid_ages['dob_temp'].idxmax()]
-                oldest = valid_ages.loc[valid_ages['dob_temp'].idxmin()]
-                youngest_label = tk.Label(report_win, text=f"👶 Youngest: {youngest['Child_First_Name']} {youngest['Child_Last_Name']} ({youngest['Child_Date_of_Birth']})", font=("Arial", 12))
-                youngest_label.pack(pady=5)
-                add_tooltip(youngest_label, "Details of the youngest child in the database")
-                
-                oldest_label = tk.Label(report_win, text=f"🧓 Oldest: {oldest['Child_First_Name']} {oldest['Child_Last_Name']} ({oldest['Child_Date_of_Birth']})", font=("Arial", 12))
-                oldest_label.pack(pady=5)
-                add_tooltip(oldest_label, "Details of the oldest child in the database")
+        if stats.mean_dob is not None:
+            avg_age_label = tk.Label(report_win, text=f"🧒 Average Age: {stats.average_age():.1f} years", font=("Arial", 12))
+            avg_age_label.pack(pady=5)
+            add_tooltip(avg_age_label, "Average age of all children in the database")
+
+            youngest, oldest = stats.youngest, stats.oldest
+            youngest_label = tk.Label(report_win, text=f"👶 Youngest: {youngest['Child_First_Name']} {youngest['Child_Last_Name']} ({format_date(youngest['Child_Date_of_Birth'])})", font=("Arial", 12))
+            youngest_label.pack(pady=5)
+            add_tooltip(youngest_label, "Details of the youngest child in the database")
+
+            oldest_label = tk.Label(report_win, text=f"🧓 Oldest: {oldest['Child_First_Name']} {oldest['Child_Last_Name']} ({format_date(oldest['Child_Date_of_Birth'])})", font=("Arial", 12))
+            oldest_label.pack(pady=5)
+            add_tooltip(oldest_label, "Details of the oldest child in the database")
 
         # Display Children Per Town (Clickable Towns)
-        if 'City' in df.columns:
-            town_counts = df['City'].value_counts().to_dict()
+        if not stats.town_counts.empty:
+            town_counts = stats.town_counts.to_dict()
 
             town_frame = tk.Frame(report_win)
             town_frame.pack(pady=10, fill=tk.X)
@@ -80,62 +75,43 @@ class StatisticalView:
                 selected_item = tree.selection()
                 if not selected_item:
                     return
-                
-                town_name = tree.item(selected_item[0], 'values')[0]
-                children_df = df[df['City'] == town_name]
-                
-                if children_df.empty:
+
+                town_name = towns_by_item.get(selected_item[0])
+                positions = stats.town_positions.get(town_name)
+                if positions is None or len(positions) == 0:
                     messagebox.showinfo("No Data", f"No children found for {town_name}")
                     return
-                
+                # Slice by the precomputed row positions instead of scanning City
+                children_df = df.iloc[positions]
+
                 town_window = tk.Toplevel(report_win)
                 town_window.title(f"Children in {town_name}")
                 town_window.geometry("400x500")
 
-                town_title = tk.Label(town_window, text=f"Children in {town_name}:", font=("Arial", 12, "bold"))
+                town_title = tk.Label(town_window, text=f"Children in {town_name} ({len(children_df)}):", font=("Arial", 12, "bold"))
                 town_title.pack(pady=5)
                 add_tooltip(town_title, f"List of all children located in {town_name}")
 
-                child_tree = ttk.Treeview(town_window, columns=("Child Name", "Child ID"), show="headings", height=15)
-                child_tree.heading("Child Name", text="Child Name")
-                child_tree.heading("Child ID", text="Child ID")
-                child_tree.column("Child Name", anchor="center", width=250)
-                child_tree.column("Child ID", anchor="center", width=100)
-                child_tree.pack(fill=tk.BOTH, expand=True)
-                add_tooltip(child_tree, "Double-click on a child to view their full profile")
-
-                # Insert child records
-                for _, row in children_df.iterrows():
-                    child_name = f"{row['Child_First_Name']} {row['Child_Last_Name']}"
-                    child_id = row.get("Mother_ID", "N/A")
-                    child_tree.insert("", "end", values=(child_name, child_id))
+                # Only the visible rows are rendered, so large towns open immediately
+                child_table = VirtualTable(
+                    town_window, ("Child Name", "Child ID"),
+                    row_values=lambda rows: list(zip(
+                        rows['Child_First_Name'].astype(str) + " " + rows['Child_Last_Name'].astype(str),
+                        rows['Mother_ID'])),
+                    widths={"Child Name": 250, "Child ID": 100})
+                child_table.pack(fill=tk.BOTH, expand=True)
+                child_table.set_data(children_df)
+                add_tooltip(child_table.tree, "Double-click on a child to view their full profile")
 
                 # Clicking a Child Opens Profile
-                def open_profile(event):
-                    selected_child = child_tree.selection()
-                    if not selected_child:
-                        return
-
-                    child_values = child_tree.item(selected_child[0], 'values')
-                    child_name, child_id = child_values
-
-                    # Locate child data
-                    selected_child_data = df[(df["Mother_ID"].astype(str) == str(child_id)) & (df["Child_First_Name"] + " " + df["Child_Last_Name"] == child_name)]
-                    
-                    if selected_child_data.empty:
-                        messagebox.showerror("Error", "Child data not found.")
-                        return
-
-                    child_row = selected_child_data.iloc[0]
-                    self.main_controller.show_profile(child_row)
-
-                child_tree.bind("<Double-1>", open_profile)
+                child_table.bind("<Double-1>", lambda event: self.open_child_profile(child_table.selected_rows()))
 
             tree.bind("<Double-1>", open_town_window)
 
             # Populate Town List
+            towns_by_item = {}
             for town, count in town_counts.items():
-                tree.insert("", "end", values=(town, count))
+                towns_by_item[tree.insert("", "end", values=(town, count))] = town
 
         export_btn = tk.Button(report_win, text="Export as PDF", command=lambda: self.controller.export_report_to_pdf(df))
         export_btn.pack(pady=10)
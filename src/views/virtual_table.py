@@ -0,0 +1,111 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable:
+    """
+    A Treeview over a DataFrame that only holds the rows currently in view.
+
+    Scrolling re-renders a window of `height` rows sliced by position, so
+    showing a frame with hundreds of thousands of rows costs the same as
+    showing a screenful.
+    """
+
+    def __init__(self, parent, columns, headings=None, row_values=None, height=15, widths=None):
+        """
+        Args:
+            parent: Parent widget
+            columns: Treeview column ids
+            headings: Optional mapping of column id -> heading text
+            row_values: Callable taking a DataFrame slice and returning one tuple of
+                values per row; defaults to the slice's own columns
+            height: Number of rows rendered at a time
+            widths: Optional mapping of column id -> width
+        """
+        self.frame = tk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        for col in columns:
+            self.tree.heading(col, text=(headings or {}).get(col, col))
+            self.tree.column(col, anchor="center", width=(widths or {}).get(col, 150))
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+        self.tree.bind("<Up>", lambda e: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._step_selection(1))
+
+        self.row_values = row_values or (lambda rows: list(rows.itertuples(index=False, name=None)))
+        self.height = height
+        self.data = None
+        self.first = 0
+        self._positions = {}
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def bind(self, sequence, func):
+        self.tree.bind(sequence, func)
+
+    def set_data(self, df):
+        """Show df, starting from the top."""
+        self.data = df
+        self.first = 0
+        self._render()
+
+    def scroll(self, rows):
+        """Scroll by a number of rows (negative scrolls up)."""
+        self._move_to(self.first + rows)
+        return "break"
+
+    def selected_rows(self):
+        """Return the selected rows of the current data as a DataFrame."""
+        positions = [self._positions[item] for item in self.tree.selection() if item in self._positions]
+        return self.data.iloc[positions]
+
+    def _row_count(self):
+        return 0 if self.data is None else len(self.data)
+
+    def _move_to(self, first):
+        first = max(0, min(int(first), max(self._row_count() - self.height, 0)))
+        if first != self.first:
+            self.first = first
+            self._render()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self._move_to(float(amount) * self._row_count())
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self._move_to(self.first + int(amount) * step)
+
+    def _step_selection(self, direction):
+        """Arrow keys past the edge of the window scroll it instead of stopping."""
+        items = self.tree.get_children()
+        selection = self.tree.selection()
+        if not items or not selection:
+            return None
+        edge = items[0] if direction < 0 else items[-1]
+        if selection[0] != edge:
+            return None
+        self.scroll(direction)
+        items = self.tree.get_children()
+        if items:
+            self.tree.selection_set(items[0] if direction < 0 else items[-1])
+        return "break"
+
+    def _render(self):
+        self.tree.delete(*self.tree.get_children())
+        self._positions = {}
+        total = self._row_count()
+        if total:
+            window = self.data.iloc[self.first:self.first + self.height]
+            for offset, values in enumerate(self.row_values(window)):
+                item = self.tree.insert("", "end", values=values)
+                self._positions[item] = self.first + offset
+        if total <= self.height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.first / total, min((self.first + self.height) / total, 1.0))